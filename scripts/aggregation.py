@@ -0,0 +1,280 @@
+"""
+Shared per-day aggregation stage for the WFM.ai synthetic data generator.
+
+Daily contact totals and staffing totals are collected once, either while
+volume and staffing records stream to disk or in one vectorized pass over
+record lists, and kept as NumPy arrays. Per-hour channel volumes and
+per-shift staffing are kept alongside for the queueing model, and daily
+channel and contact type totals for the rollup files. SLA derivation,
+summary statistics and rollups all read from this stage instead of
+regrouping the raw records.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from intervals import CONTACT_TYPE_COLUMNS, VOLUME_COLUMNS, IntervalVolume
+
+# Additive queueing totals that summaries may carry (see
+# WFMDataGenerator._queueing_aggregates)
+QUEUEING_KEYS = ('intervals', 'requiredAgentHours', 'onQueueAgentHours', 'understaffedIntervals')
+
+
+class DailyAggregates:
+    """Per-day totals for one generation window, in date order."""
+
+    # Attributes filled by the volume and staffing stages (see export/restore)
+    VOLUME_STATE = ('dates', 'hours', 'record_count', '_volume', '_hourly_calls',
+                    '_hourly_chats', '_hourly_emails', '_totals')
+    STAFFING_STATE = ('shifts', '_staffing_dates', '_scheduled', '_actual', '_shift_actual',
+                      '_shift_windows')
+
+    def __init__(self):
+        self.dates: List[str] = []
+        self.hours: List[int] = []
+        self.shifts: List[str] = []
+        self.record_count = 0
+        self._volume: List[int] = []
+        self._hourly_calls: List[List[int]] = []
+        self._hourly_chats: List[List[int]] = []
+        self._hourly_emails: List[List[int]] = []
+        self._totals: List[List[int]] = []
+        self._staffing_dates: List[str] = []
+        self._scheduled: List[int] = []
+        self._actual: List[int] = []
+        self._shift_actual: List[List[int]] = []
+        self._shift_windows: List[List[Tuple[int, int]]] = []
+        # Daily SLA actuals, set once SLA has been derived for these days
+        self.sla_actual: List[float] = []
+
+    @classmethod
+    def from_records(cls, volume_data: Sequence[Dict],
+                     staffing_data: Optional[Sequence[Dict]] = None) -> 'DailyAggregates':
+        """Aggregate materialized record lists with one vectorized pass each."""
+        aggregates = cls()
+        aggregates.record_count = len(volume_data)
+
+        dates, day_index = np.unique([r['date'] for r in volume_data], return_inverse=True)
+        hours, hour_index = np.unique([r['hour'] for r in volume_data], return_inverse=True)
+        calls, chats, emails = (np.fromiter((r[key] for r in volume_data), dtype=np.int64,
+                                            count=len(volume_data))
+                                for key in ('calls', 'chats', 'emails'))
+        aggregates.dates = dates.tolist()
+        aggregates.hours = hours.tolist()
+        aggregates._volume = np.bincount(day_index, weights=calls + chats + emails
+                                         ).astype(np.int64).tolist()
+        aggregates._hourly_calls = _pivot(day_index, hour_index, calls, len(hours)).tolist()
+        aggregates._hourly_chats = _pivot(day_index, hour_index, chats, len(hours)).tolist()
+        aggregates._hourly_emails = _pivot(day_index, hour_index, emails, len(hours)).tolist()
+        types = [np.fromiter((r['contactType'][name] for r in volume_data), dtype=np.int64,
+                             count=len(volume_data)) for name in CONTACT_TYPE_COLUMNS]
+        aggregates._totals = np.stack(
+            [np.bincount(day_index, weights=values, minlength=len(dates))
+             for values in (calls, chats, emails, *types)], axis=-1).astype(np.int64).tolist()
+
+        if staffing_data is not None:
+            staffing_dates, day_index = np.unique([r['date'] for r in staffing_data],
+                                                  return_inverse=True)
+            shift_names = list(dict.fromkeys(r['shift'] for r in staffing_data))
+            shift_index = np.array([shift_names.index(r['shift']) for r in staffing_data])
+            scheduled, actual = (np.fromiter((r[key] for r in staffing_data), dtype=np.int64,
+                                             count=len(staffing_data))
+                                 for key in ('scheduled', 'actual'))
+            aggregates.shifts = shift_names
+            aggregates._staffing_dates = staffing_dates.tolist()
+            aggregates._scheduled = np.bincount(day_index, weights=scheduled).astype(np.int64).tolist()
+            aggregates._actual = np.bincount(day_index, weights=actual).astype(np.int64).tolist()
+            aggregates._shift_actual = _pivot(day_index, shift_index, actual,
+                                              len(shift_names)).tolist()
+            # Optimized schedules carry per-day shift hours; -1 marks configured hours
+            starts, ends = (_pivot(day_index, shift_index,
+                                   np.fromiter((r.get(key, -1) + 1 for r in staffing_data),
+                                               dtype=np.int64, count=len(staffing_data)),
+                                   len(shift_names)) - 1
+                            for key in ('start', 'end'))
+            aggregates._shift_windows = np.stack([starts, ends], axis=-1).tolist()
+
+        return aggregates
+
+    def export(self, fields: Sequence[str]) -> Dict[str, np.ndarray]:
+        """One stage's attributes as arrays, e.g. to cache them with np.savez."""
+        return {field: np.asarray(getattr(self, field)) for field in fields}
+
+    def restore(self, arrays: Dict[str, np.ndarray]):
+        """Set attributes saved by export, as the lists the stages build."""
+        for field, values in arrays.items():
+            setattr(self, field, np.asarray(values).tolist())
+
+    def add_volume_day(self, records: Sequence[Dict]):
+        """Record one day's volume records (hourly, or several per hour)."""
+        self.dates.append(records[0]['date'])
+        calls = [r['calls'] for r in records]
+        chats = [r['chats'] for r in records]
+        emails = [r['emails'] for r in records]
+        self._volume.append(sum(calls) + sum(chats) + sum(emails))
+        self._totals.append([sum(calls), sum(chats), sum(emails)]
+                            + [sum(r['contactType'][name] for r in records)
+                               for name in CONTACT_TYPE_COLUMNS])
+        self.hours = self.hours or list(dict.fromkeys(r['hour'] for r in records))
+        if len(records) == len(self.hours):
+            self._hourly_calls.append(calls)
+            self._hourly_chats.append(chats)
+            self._hourly_emails.append(emails)
+        else:
+            by_hour = {key: dict.fromkeys(self.hours, 0) for key in ('calls', 'chats', 'emails')}
+            for r in records:
+                for key, totals in by_hour.items():
+                    totals[r['hour']] += r[key]
+            self._hourly_calls.append(list(by_hour['calls'].values()))
+            self._hourly_chats.append(list(by_hour['chats'].values()))
+            self._hourly_emails.append(list(by_hour['emails'].values()))
+        self.record_count += len(records)
+
+    def add_volume_block(self, block: IntervalVolume):
+        """Record the days of an array-backed volume block, like add_volume_day per day."""
+        columns = np.stack([np.asarray(block.columns[name], dtype=np.int64)
+                            for name in VOLUME_COLUMNS])  # columns x days x intervals
+        totals = columns.sum(axis=2)
+        self.dates.extend(block.dates)
+        self._volume.extend(totals[:3].sum(axis=0).tolist())
+        self._totals.extend(totals.T.tolist())
+        self.hours = self.hours or list(dict.fromkeys(np.asarray(block.hours).tolist()))
+        hours = np.asarray(block.hours)
+        hourly = np.stack([columns[:3, :, hours == hour].sum(axis=2) for hour in self.hours],
+                          axis=-1)  # channels x days x hours
+        self._hourly_calls.extend(hourly[0].tolist())
+        self._hourly_chats.extend(hourly[1].tolist())
+        self._hourly_emails.extend(hourly[2].tolist())
+        self.record_count += len(block)
+
+    def add_staffing_day(self, records: Sequence[Dict]):
+        """Record one day's per-shift staffing records."""
+        self._staffing_dates.append(records[0]['date'])
+        self._scheduled.append(sum(r['scheduled'] for r in records))
+        self._actual.append(sum(r['actual'] for r in records))
+        self.shifts = self.shifts or [r['shift'] for r in records]
+        self._shift_actual.append([r['actual'] for r in records])
+        self._shift_windows.append([(r.get('start', -1), r.get('end', -1)) for r in records])
+
+    @property
+    def volume(self) -> np.ndarray:
+        """Total contacts per day."""
+        return np.array(self._volume, dtype=np.int64)
+
+    @property
+    def hourly_calls(self) -> np.ndarray:
+        """Calls per day and operating hour (days x hours)."""
+        return np.array(self._hourly_calls, dtype=np.int64).reshape(-1, len(self.hours))
+
+    @property
+    def hourly_chats(self) -> np.ndarray:
+        """Chats per day and operating hour (days x hours)."""
+        return np.array(self._hourly_chats, dtype=np.int64).reshape(-1, len(self.hours))
+
+    @property
+    def hourly_volume(self) -> np.ndarray:
+        """All contacts per day and operating hour (days x hours)."""
+        return (self.hourly_calls + self.hourly_chats
+                + np.array(self._hourly_emails, dtype=np.int64).reshape(-1, len(self.hours)))
+
+    @property
+    def totals(self) -> np.ndarray:
+        """Daily totals per channel and contact type (days x VOLUME_COLUMNS)."""
+        return np.array(self._totals, dtype=np.int64).reshape(-1, len(VOLUME_COLUMNS))
+
+    @property
+    def shift_actual(self) -> np.ndarray:
+        """Agents actually working per day and shift (days x shifts)."""
+        self._check_staffing()
+        return np.array(self._shift_actual, dtype=np.int64).reshape(-1, len(self.shifts))
+
+    @property
+    def shift_windows(self) -> np.ndarray:
+        """(start, end) hour of each day's shifts (days x shifts x 2); -1 where
+        the records use the configured shift hours."""
+        self._check_staffing()
+        return np.array(self._shift_windows, dtype=np.int64).reshape(-1, len(self.shifts), 2)
+
+    @property
+    def scheduled(self) -> np.ndarray:
+        """Scheduled agents per day, summed over shifts."""
+        self._check_staffing()
+        return np.array(self._scheduled, dtype=np.int64)
+
+    @property
+    def actual(self) -> np.ndarray:
+        """Agents actually working per day, summed over shifts."""
+        self._check_staffing()
+        return np.array(self._actual, dtype=np.int64)
+
+    @property
+    def staffing_ratio(self) -> np.ndarray:
+        """Actual over scheduled agents per day (1.0 when nobody is scheduled)."""
+        scheduled = self.scheduled
+        ratio = np.ones(len(scheduled))
+        np.divide(self.actual, scheduled, out=ratio, where=scheduled > 0)
+        return ratio
+
+    def _check_staffing(self):
+        if self._staffing_dates != self.dates:
+            raise ValueError("Staffing days do not line up with volume days")
+
+    def summary(self, sla_actuals: Sequence[float]) -> Dict[str, Any]:
+        """Running aggregates behind the summary statistics.
+
+        These are stored in the state file so --append can update the
+        summary without rescanning existing records.
+        """
+        volume = self.volume
+        peak = int(np.argmax(volume))     # First day with the highest volume
+        lowest = int(np.argmin(volume))   # First day with the lowest volume
+        sla_actuals = np.asarray(sla_actuals, dtype=np.float64)
+        return {
+            'days': len(self.dates),
+            'recordCount': self.record_count,
+            'totalContacts': int(volume.sum()),
+            'peakDay': {'date': self.dates[peak], 'volume': int(volume[peak])},
+            'lowestDay': {'date': self.dates[lowest], 'volume': int(volume[lowest])},
+            'slaCount': len(sla_actuals),
+            'slaMean': float(np.mean(sla_actuals)),
+            'slaStd': float(np.std(sla_actuals))
+        }
+
+
+def _pivot(row_index: np.ndarray, column_index: np.ndarray, values: np.ndarray,
+           num_columns: int) -> np.ndarray:
+    """Sum values into a (rows x columns) int64 table."""
+    flat = row_index * num_columns + column_index
+    size = (int(row_index.max()) + 1) * num_columns if len(row_index) else 0
+    return np.bincount(flat, weights=values, minlength=size).astype(np.int64).reshape(-1, num_columns)
+
+
+def merge_summaries(earlier: Dict[str, Any], later: Dict[str, Any]) -> Dict[str, Any]:
+    """Combine the summary aggregates of two consecutive date ranges.
+
+    SLA moments are merged with the pairwise (Chan et al.) update, so the
+    result matches aggregating both ranges at once.
+    """
+    n_a, n_b = earlier['slaCount'], later['slaCount']
+    n = n_a + n_b
+    delta = later['slaMean'] - earlier['slaMean']
+    m2 = (earlier['slaStd'] ** 2 * n_a + later['slaStd'] ** 2 * n_b
+          + delta ** 2 * n_a * n_b / n)
+
+    return {
+        'days': earlier['days'] + later['days'],
+        'recordCount': earlier['recordCount'] + later['recordCount'],
+        'totalContacts': earlier['totalContacts'] + later['totalContacts'],
+        'peakDay': (later['peakDay'] if later['peakDay']['volume'] > earlier['peakDay']['volume']
+                    else earlier['peakDay']),
+        'lowestDay': (later['lowestDay']
+                      if later['lowestDay']['volume'] < earlier['lowestDay']['volume']
+                      else earlier['lowestDay']),
+        'slaCount': n,
+        'slaMean': earlier['slaMean'] + delta * n_b / n,
+        'slaStd': float(np.sqrt(m2 / n)),
+        # Queueing totals (only present for the erlang SLA model)
+        **{key: earlier[key] + later[key] for key in QUEUEING_KEYS
+           if key in earlier and key in later}
+    }
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the WFM.ai synthetic data generator.
+
+Times each ``generate_*`` method and ``save_data_files`` separately over a
+grid of date ranges and engines, and times whole multi-site runs for a
+range of site counts. Every case is run ``--repeat`` times without tracing
+(best and median wall time are reported). It is then run once more under
+tracemalloc to record the peak traced allocation. Results go to a JSON
+file that can be diffed between commits to catch regressions.
+
+Usage:
+    python scripts/bench_generate.py
+    python scripts/bench_generate.py --spans 1m,1y --sites 1,10 --repeat 5
+    python scripts/bench_generate.py --quick --output bench_results.json
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+from generate_synthetic_data import (DEFAULT_START_DATE, ENGINES, WFMDataGenerator,
+                                     generate_sites)
+
+# Date range sizes in days, by label
+SPANS = {
+    '1m': 31,
+    '3m': 91,
+    '1y': 366,
+    '5y': 1827,
+    '10y': 3653,
+}
+
+DEFAULT_SPANS = ('1m', '1y', '10y')
+DEFAULT_SITE_COUNTS = (1, 10, 50)
+DEFAULT_HOURS = (13,)
+
+def _measure(func: Callable[[], Any], repeat: int) -> Tuple[Any, Dict[str, Any]]:
+    """Run func `repeat` times untraced, then once under tracemalloc.
+
+    Returns:
+        The result of the traced run and its timing/memory statistics.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            func()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        with redirect_stdout(io.StringIO()):
+            result = func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return result, {
+        'bestSeconds': min(times),
+        'medianSeconds': statistics.median(times),
+        'peakTracedBytes': peak,
+    }
+
+
+def _make_generator(engine: str, days: int, hours: int, output_dir: Path) -> WFMDataGenerator:
+    """Generator covering `days` days from the default start date."""
+    with redirect_stdout(io.StringIO()):
+        generator = WFMDataGenerator(
+            engine=engine,
+            start_date=DEFAULT_START_DATE,
+            end_date=DEFAULT_START_DATE + timedelta(days=days - 1))
+    first_hour = max(0, min(8, 24 - hours))
+    generator.apply_site_config({'operating_hours': {'start': first_hour,
+                                                     'end': first_hour + hours}})
+    generator.output_dir = output_dir
+    return generator
+
+
+def bench_stages(engine: str, span: str, hours: int, repeat: int,
+                 workdir: Path) -> Dict[str, Any]:
+    """Time every generation stage for one engine, date range and day length."""
+    days = SPANS[span]
+    output_dir = workdir / f"stages-{engine}-{span}-{hours}h"
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    # Each stage gets a fresh generator so it starts from its day streams
+    # (or the legacy sequence) in the same state as a full run
+    def fresh() -> WFMDataGenerator:
+        return _make_generator(engine, days, hours, output_dir)
+
+    results = {}
+    volume, stats = _measure(lambda: fresh().generate_volume_data(), repeat)
+    results['generate_volume_data'] = stats
+    deflection, stats = _measure(lambda: fresh().generate_deflection_history(), repeat)
+    results['generate_deflection_history'] = stats
+    staffing, stats = _measure(lambda: fresh().generate_staffing_schedules(), repeat)
+    results['generate_staffing_schedules'] = stats
+    sla, stats = _measure(lambda: fresh().generate_sla_performance(volume, staffing, deflection),
+                          repeat)
+    results['generate_sla_performance'] = stats
+    cost, stats = _measure(lambda: fresh().generate_cost_data(), repeat)
+    results['generate_cost_data'] = stats
+    summary, stats = _measure(lambda: fresh().generate_summary_stats(volume, deflection, sla),
+                              repeat)
+    results['generate_summary_stats'] = stats
+    _, stats = _measure(lambda: fresh().save_data_files({
+        'historical_volume.json': volume,
+        'deflection_history.json': deflection,
+        'staffing_schedules.json': staffing,
+        'sla_performance.json': sla,
+        'cost_data.json': cost,
+        'summary_stats.json': summary
+    }), repeat)
+    results['save_data_files'] = stats
+
+    return {
+        'kind': 'stages',
+        'engine': engine,
+        'span': span,
+        'days': days,
+        'operatingHours': hours,
+        'volumeRecords': len(volume),
+        'stages': results,
+        'totalBestSeconds': sum(stage['bestSeconds'] for stage in results.values()),
+    }
+
+
+def bench_sites(engine: str, span: str, num_sites: int, workers: int, repeat: int,
+                workdir: Path) -> Dict[str, Any]:
+    """Time a full multi-site run (generate_all_data per site)."""
+    days = SPANS[span]
+    output_dir = workdir / f"sites-{engine}-{span}-{num_sites}"
+    sites = [{'name': f"site-{i:03d}"} for i in range(num_sites)]
+    generator_kwargs = {
+        'engine': engine,
+        'start_date': DEFAULT_START_DATE,
+        'end_date': DEFAULT_START_DATE + timedelta(days=days - 1),
+    }
+
+    _, stats = _measure(lambda: generate_sites(sites, output_dir, 42, workers, generator_kwargs),
+                        repeat)
+    # tracemalloc only sees this process; with workers > 1 the peak covers
+    # scheduling overhead, not the per-site generation itself
+    return {
+        'kind': 'sites',
+        'engine': engine,
+        'span': span,
+        'days': days,
+        'sites': num_sites,
+        'workers': workers,
+        **stats,
+        'secondsPerSite': stats['bestSeconds'] / num_sites,
+    }
+
+
+def _max_rss_bytes() -> int:
+    """Peak resident set size of this process (children excluded)."""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024  # Linux reports KiB
+
+
+def _parse_list(value: str, cast=str) -> List:
+    return [cast(item) for item in value.split(',') if item]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the WFM.ai synthetic data generator')
+    parser.add_argument('--spans', type=_parse_list, default=list(DEFAULT_SPANS),
+                        help=f"Comma-separated date ranges from {', '.join(SPANS)} "
+                             f"(default {','.join(DEFAULT_SPANS)})")
+    parser.add_argument('--sites', type=lambda v: _parse_list(v, int),
+                        default=list(DEFAULT_SITE_COUNTS),
+                        help='Comma-separated site counts for the multi-site benchmark '
+                             '(default 1,10,50; 0 to skip)')
+    parser.add_argument('--sites-span', default='1y', choices=SPANS,
+                        help='Date range used by the multi-site benchmark (default 1y)')
+    parser.add_argument('--hours', type=lambda v: _parse_list(v, int), default=list(DEFAULT_HOURS),
+                        help='Comma-separated operating hours per day (default 13)')
+    parser.add_argument('--engines', type=_parse_list, default=list(ENGINES),
+                        help=f"Comma-separated engines (default {','.join(ENGINES)})")
+    parser.add_argument('--workers', '-j', type=int, default=os.cpu_count(),
+                        help='Worker processes for the multi-site benchmark')
+    parser.add_argument('--repeat', '-r', type=int, default=3,
+                        help='Untraced timing runs per case (default 3)')
+    parser.add_argument('--quick', action='store_true',
+                        help='Smoke run: 1m and 1y spans, 1 and 10 sites, one repeat')
+    parser.add_argument('--output', '-o', type=Path, default=Path('bench_results.json'),
+                        help='Results file (default bench_results.json)')
+    args = parser.parse_args()
+
+    if args.quick:
+        args.spans, args.sites, args.repeat = ['1m', '1y'], [1, 10], 1
+    for span in args.spans:
+        if span not in SPANS:
+            parser.error(f"unknown span '{span}', expected one of {', '.join(SPANS)}")
+    for engine in args.engines:
+        if engine not in ENGINES:
+            parser.error(f"unknown engine '{engine}', expected one of {', '.join(ENGINES)}")
+    if any(not 1 <= hours <= 24 for hours in args.hours):
+        parser.error('--hours values must be between 1 and 24')
+
+    cases = []
+    with tempfile.TemporaryDirectory(prefix='wfm-bench-') as tmp:
+        workdir = Path(tmp)
+
+        print("⏱️  Benchmarking generation stages...")
+        for engine in args.engines:
+            for span in args.spans:
+                for hours in args.hours:
+                    case = bench_stages(engine, span, hours, args.repeat, workdir)
+                    cases.append(case)
+                    print(f"   {engine:<10} {span:>4} {hours:>2}h  "
+                          f"{case['totalBestSeconds']:8.3f}s  "
+                          f"({case['volumeRecords']} volume records)")
+
+        site_counts = [n for n in args.sites if n > 0]
+        if site_counts:
+            print(f"🏢 Benchmarking multi-site runs ({args.sites_span}, {args.workers} workers)...")
+        for engine in args.engines:
+            for num_sites in site_counts:
+                case = bench_sites(engine, args.sites_span, num_sites, args.workers,
+                                   args.repeat, workdir)
+                cases.append(case)
+                print(f"   {engine:<10} {num_sites:>3} sites  {case['bestSeconds']:8.3f}s  "
+                      f"({case['secondsPerSite']:.3f}s/site)")
+
+    results = {
+        'createdAt': datetime.now().isoformat(timespec='seconds'),
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpuCount': os.cpu_count(),
+        },
+        'settings': {
+            'repeat': args.repeat,
+            'workers': args.workers,
+            'spans': {span: SPANS[span] for span in args.spans},
+        },
+        'maxRssBytes': _max_rss_bytes(),
+        'cases': cases,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    print(f"✅ Results written to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
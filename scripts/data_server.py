@@ -0,0 +1,584 @@
+#!/usr/bin/env python3
+"""
+Local HTTP data service for the WFM.ai dashboard.
+
+Serves a generator output directory over HTTP using only the standard
+library's asyncio streams, so it runs anywhere the generator runs:
+
+- ``/data/<file>``: the output files. Text files are compressed once per
+  version into gzip and, when the optional ``brotli`` package is installed,
+  brotli variants, and served by the client's Accept-Encoding. Every
+  representation has a strong ETag, so a reload that sends If-None-Match
+  gets a bodyless 304. Single byte ranges (used by the dashboard's
+  partitioned loader) are answered with 206.
+- ``/volume``, ``/staffing``, ``/sla``: range queries answered from
+  in-memory NumPy arrays of the datasets' per-day (and, for volume, per-hour)
+  values, e.g. ``/volume?start=2024-03-01&end=2024-03-31&granularity=week``.
+  ``granularity`` is day (default), week or month, plus hour for volume.
+  Volume and staffing are summed per period; SLA is averaged.
+
+The indexes are rebuilt whenever generation_state.json changes, so a running
+service picks up a new --append. Without the state file (e.g. a copy of the
+JSON outputs only) the record format is read off the files present.
+Responses allow any origin, so the dashboard dev server can use the service
+directly (VITE_DATA_SERVICE_URL).
+
+Usage:
+    python scripts/data_server.py --data public/data --port 8787
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import sys
+from datetime import datetime
+from email.utils import formatdate
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from data_writers import columnar_filename, read_columnar, records_filename
+from forecasting import columnar_volume_grid, volume_grid
+from intervals import CONTACT_TYPE_COLUMNS, VOLUME_COLUMNS
+from partitions import MANIFEST_FILENAME, iter_records, read_manifest
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always offered
+    brotli = None
+
+DEFAULT_PORT = 8787
+
+STATE_FILENAME = 'generation_state.json'
+
+VOLUME_FILENAME = 'historical_volume.json'
+# (jsonFormat, compression) of record files, tried in order without a state file
+RECORD_FORMATS = (('pretty', 'none'), ('ndjson', 'none'), ('ndjson', 'gzip'))
+
+GRANULARITIES = ('hour', 'day', 'week', 'month')
+
+CONTENT_TYPES = {
+    '.gz': 'application/gzip',
+    '.json': 'application/json',
+    '.ndjson': 'application/x-ndjson',
+    '.npy': 'application/octet-stream',
+    '.npz': 'application/octet-stream',
+    '.parquet': 'application/vnd.apache.parquet',
+    '.prof': 'application/octet-stream',
+}
+COMPRESSIBLE = ('.json', '.ndjson')
+MIN_COMPRESS_BYTES = 1024       # Smaller bodies are sent as they are
+
+MAX_HEADER_LINES = 100
+IDLE_TIMEOUT_SECONDS = 15       # Keep-alive connections idle this long are closed
+
+STAFFING_COLUMNS = ('scheduled', 'actual', 'ptoCount', 'sickCount', 'trainingCount')
+SLA_COLUMNS = ('actual', 'avgWaitTime', 'abandonment')
+
+STATUS_TEXT = {200: 'OK', 204: 'No Content', 206: 'Partial Content', 304: 'Not Modified',
+               400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+               416: 'Range Not Satisfiable', 500: 'Internal Server Error',
+               503: 'Service Unavailable'}
+
+
+class Representation(NamedTuple):
+    """One encoding of a response body."""
+    encoding: Optional[str]     # Content-Encoding, None for identity
+    body: bytes
+    etag: str
+
+
+class StaticFile(NamedTuple):
+    """A served file with its encoded variants, valid while size and mtime hold."""
+    version: Tuple[int, int]
+    content_type: str
+    variants: Dict[Optional[str], Representation]
+
+
+class Response(NamedTuple):
+    status: int
+    headers: Dict[str, str]
+    body: bytes = b''
+
+
+class SeriesIndex(NamedTuple):
+    """Per-day values of one dataset, days in ascending order."""
+    dates: np.ndarray           # datetime64[D]
+    values: np.ndarray          # (days, columns)
+    columns: Tuple[str, ...]
+    mean: bool                  # Average over a period instead of summing
+
+
+class QueryError(ValueError):
+    """Invalid query parameters (answered with 400)."""
+
+
+def encode_variants(body: bytes, compressible: bool = True) -> Dict[Optional[str], Representation]:
+    """Identity, gzip and (if available) brotli encodings of a body, with strong ETags.
+
+    Compressed encodings are only kept when they are smaller. gzip output
+    is written without a timestamp, so the same content always gets the
+    same bytes and ETag.
+    """
+    digest = hashlib.sha256(body).hexdigest()[:20]
+    variants = {None: Representation(None, body, f'"{digest}"')}
+    if not compressible or len(body) < MIN_COMPRESS_BYTES:
+        return variants
+    encoded = {'gzip': gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        encoded['br'] = brotli.compress(body, quality=11)
+    for encoding, data in encoded.items():
+        if len(data) < len(body):
+            variants[encoding] = Representation(encoding, data, f'"{digest}-{encoding}"')
+    return variants
+
+
+def accepted_encodings(header: str) -> List[str]:
+    """Encodings a client accepts, most preferred first (q=0 excluded)."""
+    weighted = []
+    for position, item in enumerate(header.split(',')):
+        name, _, params = item.strip().partition(';')
+        q = 1.0
+        if params.strip().startswith('q='):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if name and q > 0:
+            weighted.append((-q, position, name.strip().lower()))
+    return [name for _, _, name in sorted(weighted)]
+
+
+def choose_variant(variants: Dict[Optional[str], Representation],
+                   accept_encoding: str) -> Representation:
+    """The variant to send: brotli, then gzip, then identity, as accepted."""
+    accepted = accepted_encodings(accept_encoding)
+    for encoding in ('br', 'gzip'):
+        if encoding in variants and (encoding in accepted or '*' in accepted):
+            return variants[encoding]
+    return variants[None]
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 requires for it)."""
+    if if_none_match.strip() == '*':
+        return True
+    strip = etag.removeprefix('W/')
+    return any(tag.strip().removeprefix('W/') == strip for tag in if_none_match.split(','))
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """[start, end) of a single 'bytes=' range; None if it cannot be satisfied.
+
+    Raises:
+        QueryError: For multiple ranges or malformed headers (served in full).
+    """
+    unit, _, spec = header.partition('=')
+    if unit.strip() != 'bytes' or ',' in spec:
+        raise QueryError(f"unsupported range '{header}'")
+    first, _, last = spec.strip().partition('-')
+    # A range ending before it starts is invalid too, so it is ignored (RFC 9110)
+    if (not (first or last) or not all(part.isdigit() for part in (first, last) if part)
+            or (first and last and int(last) < int(first))):
+        raise QueryError(f"malformed range '{header}'")
+    if first:
+        start = int(first)
+        end = min(int(last) + 1, size) if last else size
+    else:
+        start, end = max(size - int(last), 0), size
+    return (start, end) if start < end else None
+
+
+def _weekday(dates: np.ndarray) -> np.ndarray:
+    """Monday = 0 weekday of datetime64[D] dates (1970-01-01 was a Thursday)."""
+    return (dates.astype(np.int64) + 3) % 7
+
+
+def _period_keys(dates: np.ndarray, granularity: str) -> np.ndarray:
+    """Label of each day's period: the day, its week's Monday or its month."""
+    if granularity == 'week':
+        return dates - _weekday(dates).astype('timedelta64[D]')
+    if granularity == 'month':
+        return dates.astype('datetime64[M]')
+    return dates
+
+
+class DataService:
+    """Static files and range queries over one generator output directory.
+
+    Args:
+        directory: Output directory of the generator (e.g. public/data).
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory).resolve()
+        self._files: Dict[Path, StaticFile] = {}
+        self._indexes: Dict[str, Any] = {}
+        self._indexes_version: Optional[Tuple[int, int]] = None
+        self._lock = asyncio.Lock()
+
+    # Static files
+
+    def _resolve(self, relative: str) -> Optional[Path]:
+        """File under the data directory for a URL path; None if outside or hidden."""
+        path = (self.directory / unquote(relative)).resolve()
+        if not path.is_relative_to(self.directory) or not path.is_file():
+            return None
+        if any(part.startswith('.') for part in path.relative_to(self.directory).parts):
+            return None  # e.g. the dataset cache in .cache/
+        return path
+
+    def _load_file(self, path: Path, version: Tuple[int, int]) -> StaticFile:
+        body = path.read_bytes()
+        return StaticFile(version, CONTENT_TYPES.get(path.suffix, 'application/octet-stream'),
+                          encode_variants(body, path.suffix in COMPRESSIBLE))
+
+    async def static_file(self, relative: str) -> Optional[StaticFile]:
+        """A file's encoded variants, compressed once per version of the file."""
+        path = self._resolve(relative)
+        if path is None:
+            return None
+        stat = path.stat()
+        version = (stat.st_size, stat.st_mtime_ns)
+        cached = self._files.get(path)
+        if cached is None or cached.version != version:
+            loop = asyncio.get_running_loop()
+            cached = await loop.run_in_executor(None, self._load_file, path, version)
+            self._files[path] = cached
+        return cached
+
+    # Query indexes
+
+    def _state_path(self) -> Optional[Path]:
+        """File whose changes trigger a rebuild: the state, else the manifest or volume records."""
+        candidates = [self.directory / STATE_FILENAME, self.directory / MANIFEST_FILENAME]
+        candidates += [self.directory / records_filename(VOLUME_FILENAME, json_format, compression)
+                       for json_format, compression in RECORD_FORMATS]
+        return next((path for path in candidates if path.exists()), None)
+
+    def _state_version(self) -> Optional[Tuple[int, int]]:
+        path = self._state_path()
+        if path is None:
+            return None
+        stat = path.stat()
+        return stat.st_size, stat.st_mtime_ns
+
+    def _load_state(self) -> Dict[str, Any]:
+        """Generation settings, or the record format read off the files present."""
+        path = self._state_path()
+        if path.name == STATE_FILENAME:
+            with open(path) as f:
+                return json.load(f)
+        if path.name == MANIFEST_FILENAME:
+            return {'outputFormat': 'json', 'jsonFormat': read_manifest(self.directory)['jsonFormat']}
+        json_format, compression = next(
+            (json_format, compression) for json_format, compression in RECORD_FORMATS
+            if records_filename(VOLUME_FILENAME, json_format, compression) == path.name)
+        return {'outputFormat': 'json', 'jsonFormat': json_format, 'compression': compression}
+
+    def _read_dataset(self, state: Dict[str, Any], filename: str,
+                      columnar: bool) -> Any:
+        """Records of a dataset as written (columns dict for columnar output)."""
+        if columnar and state['outputFormat'] == 'columnar':
+            return read_columnar(self.directory / columnar_filename(filename,
+                                                                    state['columnarBackend']))
+        partitioned = Path(filename).stem in read_manifest(self.directory)['datasets']
+        return list(iter_records(self.directory, filename, state['jsonFormat'], partitioned,
+                                 state.get('compression', 'none')))
+
+    def _build_indexes(self) -> Dict[str, Any]:
+        """Load volume, staffing and SLA into per-day arrays."""
+        state = self._load_state()
+
+        volume = self._read_dataset(state, VOLUME_FILENAME, columnar=True)
+        dates, hours, grid = (columnar_volume_grid(volume) if isinstance(volume, dict)
+                              else volume_grid(volume))
+        day_dates = dates.values.astype('datetime64[D]')
+
+        staffing = pd.DataFrame(self._read_dataset(state, 'staffing_schedules.json', columnar=True))
+        staffing['date'] = pd.to_datetime(staffing['date'])
+        staffing = staffing.groupby('date')[list(STAFFING_COLUMNS)].sum()
+
+        sla = pd.DataFrame(self._read_dataset(state, 'sla_performance.json', columnar=False))
+        sla['date'] = pd.to_datetime(sla['date'])
+        sla = sla.set_index('date').sort_index()
+
+        return {
+            'hours': [int(hour) for hour in hours],
+            'hourly': grid,
+            'volume': SeriesIndex(day_dates, grid.sum(axis=1), VOLUME_COLUMNS, False),
+            'staffing': SeriesIndex(staffing.index.values.astype('datetime64[D]'),
+                                    staffing.values.astype(np.int64), STAFFING_COLUMNS, False),
+            'sla': SeriesIndex(sla.index.values.astype('datetime64[D]'),
+                               sla[list(SLA_COLUMNS)].values.astype(np.float64), SLA_COLUMNS, True),
+        }
+
+    async def indexes(self) -> Dict[str, Any]:
+        """Current indexes, rebuilt when generation_state.json has changed."""
+        async with self._lock:
+            version = self._state_version()
+            if version is None:
+                raise FileNotFoundError(f"neither {STATE_FILENAME} nor {VOLUME_FILENAME} "
+                                        f"found in {self.directory}")
+            if version != self._indexes_version:
+                loop = asyncio.get_running_loop()
+                self._indexes = await loop.run_in_executor(None, self._build_indexes)
+                self._indexes_version = version
+            return self._indexes
+
+    @staticmethod
+    def _window(index: SeriesIndex, params: Dict[str, str]) -> slice:
+        """Rows of an index between the 'start' and 'end' dates (inclusive)."""
+        bounds = []
+        for name, side, default in (('start', 'left', 0), ('end', 'right', len(index.dates))):
+            value = params.get(name)
+            if not value:
+                bounds.append(default)
+                continue
+            try:
+                day = np.datetime64(datetime.strptime(value, '%Y-%m-%d').date(), 'D')
+            except ValueError:
+                raise QueryError(f"invalid {name} '{value}', expected YYYY-MM-DD")
+            bounds.append(int(np.searchsorted(index.dates, day, side=side)))
+        return slice(bounds[0], max(bounds))
+
+    @staticmethod
+    def _aggregate(index: SeriesIndex, rows: slice, granularity: str
+                   ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Period labels, values and day counts for the rows, one pass with reduceat."""
+        dates, values = index.dates[rows], index.values[rows]
+        if not len(dates):
+            return dates, values, np.zeros(0, dtype=np.int64)
+        keys = _period_keys(dates, granularity)
+        starts = np.concatenate([[0], np.flatnonzero(keys[1:] != keys[:-1]) + 1])
+        counts = np.diff(np.append(starts, len(keys)))
+        totals = np.add.reduceat(values, starts, axis=0)
+        if index.mean:
+            totals = totals / counts[:, None]
+        return keys[starts], totals, counts
+
+    def _period_records(self, index: SeriesIndex, rows: slice, granularity: str,
+                        to_record: Callable[[Dict[str, Any]], Dict[str, Any]]) -> List[Dict]:
+        labels, totals, counts = self._aggregate(index, rows, granularity)
+        key_name = {'day': 'date', 'week': 'weekStart', 'month': 'month'}[granularity]
+        records = []
+        for label, row, days in zip(labels.astype(str).tolist(), totals.tolist(), counts.tolist()):
+            record = {key_name: label, **to_record(dict(zip(index.columns, row)))}
+            if granularity != 'day':
+                record['days'] = days
+            records.append(record)
+        return records
+
+    async def query(self, dataset: str, params: Dict[str, str]) -> Dict[str, Any]:
+        """Answer a /volume, /staffing or /sla query."""
+        granularity = params.get('granularity', 'day')
+        allowed = GRANULARITIES if dataset == 'volume' else GRANULARITIES[1:]
+        if granularity not in allowed:
+            raise QueryError(f"granularity must be one of {', '.join(allowed)}")
+        indexes = await self.indexes()
+        index = indexes[dataset]
+        rows = self._window(index, params)
+
+        if dataset == 'volume' and granularity == 'hour':
+            records = []
+            for date_str, day in zip(index.dates[rows].astype(str).tolist(), indexes['hourly'][rows].tolist()):
+                for hour, row in zip(indexes['hours'], day):
+                    records.append({
+                        'date': date_str,
+                        'hour': hour,
+                        'calls': row[0],
+                        'chats': row[1],
+                        'emails': row[2],
+                        'contactType': dict(zip(CONTACT_TYPE_COLUMNS, row[3:]))
+                    })
+        elif dataset == 'volume':
+            records = self._period_records(index, rows, granularity, lambda v: {
+                'totalVolume': int(v['calls'] + v['chats'] + v['emails']),
+                'calls': int(v['calls']),
+                'chats': int(v['chats']),
+                'emails': int(v['emails']),
+                'byType': {name: int(v[name]) for name in CONTACT_TYPE_COLUMNS}
+            })
+        elif dataset == 'staffing':
+            records = self._period_records(index, rows, granularity,
+                                           lambda v: {k: int(x) for k, x in v.items()})
+        else:
+            records = self._period_records(index, rows, granularity, lambda v: {
+                'actual': round(v['actual'], 3),
+                'avgWaitTime': int(round(v['avgWaitTime'])),
+                'abandonment': round(v['abandonment'], 3)
+            })
+
+        dates = index.dates[rows]
+        return {
+            'dataset': dataset,
+            'granularity': granularity,
+            'start': str(dates[0]) if len(dates) else None,
+            'end': str(dates[-1]) if len(dates) else None,
+            'records': records
+        }
+
+    # HTTP
+
+    @staticmethod
+    def _base_headers() -> Dict[str, str]:
+        return {
+            'Date': formatdate(usegmt=True),
+            'Access-Control-Allow-Origin': '*',
+            'Access-Control-Expose-Headers': 'ETag, Content-Range, Content-Encoding, Content-Length',
+            'Vary': 'Accept-Encoding',
+            'Cache-Control': 'no-cache',  # Always revalidate; unchanged data costs a 304
+        }
+
+    def _encoded(self, variants: Dict[Optional[str], Representation], content_type: str,
+                 headers: Dict[str, str], accept_ranges: bool = False) -> Response:
+        """200 or 304 response for the client's preferred variant."""
+        representation = choose_variant(variants, headers.get('accept-encoding', ''))
+        response_headers = {**self._base_headers(), 'Content-Type': content_type,
+                            'ETag': representation.etag}
+        if accept_ranges:
+            response_headers['Accept-Ranges'] = 'bytes'
+        if 'if-none-match' in headers and etag_matches(headers['if-none-match'], representation.etag):
+            return Response(304, response_headers)
+        if representation.encoding:
+            response_headers['Content-Encoding'] = representation.encoding
+        return Response(200, response_headers, representation.body)
+
+    def _error(self, status: int, message: str) -> Response:
+        body = json.dumps({'error': message}).encode()
+        return Response(status, {**self._base_headers(), 'Content-Type': 'application/json'}, body)
+
+    async def handle(self, method: str, target: str, headers: Dict[str, str]) -> Response:
+        """Response to one request (headers keyed in lower case)."""
+        if method == 'OPTIONS':
+            return Response(204, {**self._base_headers(),
+                                  'Access-Control-Allow-Methods': 'GET, HEAD, OPTIONS',
+                                  'Access-Control-Allow-Headers': 'Range, If-None-Match',
+                                  'Access-Control-Max-Age': '86400'})
+        if method not in ('GET', 'HEAD'):
+            return self._error(405, f"method {method} not allowed")
+
+        url = urlsplit(target)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            if url.path.startswith('/data/'):
+                return await self._serve_file(url.path[len('/data/'):], headers)
+            if url.path.strip('/') in ('volume', 'staffing', 'sla'):
+                document = await self.query(url.path.strip('/'), params)
+                body = json.dumps(document, separators=(',', ':')).encode()
+                return self._encoded(encode_variants(body), 'application/json', headers)
+        except QueryError as error:
+            return self._error(400, str(error))
+        except FileNotFoundError as error:
+            return self._error(503, str(error))
+        return self._error(404, f"no such resource {url.path}")
+
+    async def _serve_file(self, relative: str, headers: Dict[str, str]) -> Response:
+        static = await self.static_file(relative)
+        if static is None:
+            return self._error(404, f"no such file {relative}")
+        if 'range' not in headers or 'if-none-match' in headers:
+            return self._encoded(static.variants, static.content_type, headers, accept_ranges=True)
+
+        identity = static.variants[None]
+        response_headers = {**self._base_headers(), 'Content-Type': static.content_type,
+                            'ETag': identity.etag, 'Accept-Ranges': 'bytes'}
+        try:
+            span = parse_range(headers['range'], len(identity.body))
+        except QueryError:
+            return self._encoded(static.variants, static.content_type, headers, accept_ranges=True)
+        if span is None:
+            response_headers['Content-Range'] = f"bytes */{len(identity.body)}"
+            return Response(416, response_headers)
+        start, end = span
+        response_headers['Content-Range'] = f"bytes {start}-{end - 1}/{len(identity.body)}"
+        return Response(206, response_headers, identity.body[start:end])
+
+    async def connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests on one connection until it closes or idles out."""
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), IDLE_TIMEOUT_SECONDS)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line.strip():
+                    break
+                parts = request_line.decode('latin-1').split()
+                if len(parts) != 3:
+                    break
+                method, target, version = parts
+
+                headers: Dict[str, str] = {}
+                for _ in range(MAX_HEADER_LINES):
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    response = await self.handle(method.upper(), target, headers)
+                except Exception as error:  # Keep serving other requests
+                    response = self._error(500, f"{type(error).__name__}: {error}")
+
+                connection = headers.get('connection', '').lower()
+                keep_alive = (connection != 'close' if version == 'HTTP/1.1'
+                              else connection == 'keep-alive')
+                response.headers['Content-Length'] = str(len(response.body))
+                response.headers['Connection'] = 'keep-alive' if keep_alive else 'close'
+                head = [f"HTTP/1.1 {response.status} {STATUS_TEXT.get(response.status, '')}"]
+                head += [f"{name}: {value}" for name, value in response.headers.items()]
+                writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1'))
+                if method.upper() != 'HEAD' and response.status not in (204, 304):
+                    writer.write(response.body)
+                await writer.drain()
+                # Access log goes to stderr so it never mixes with generator output
+                print(f"   {method} {target} {response.status} "
+                      f"{response.headers.get('Content-Encoding', 'identity')} {len(response.body)}B",
+                      file=sys.stderr)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(directory: Path, host: str = '127.0.0.1', port: int = DEFAULT_PORT):
+    """Run the data service until interrupted."""
+    service = DataService(directory)
+    server = await asyncio.start_server(service.connection, host, port)
+    encodings = 'br, gzip' if brotli is not None else 'gzip (install brotli for br)'
+    print(f"🌐 Serving {service.directory} on http://{host}:{port}/data/ ({encodings})")
+    print("   Queries: /volume, /staffing, /sla ?start=&end=&granularity=")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve generated WFM data over local HTTP')
+    parser.add_argument('--data', '-d', type=Path, default=Path('public/data'),
+                        help='Generator output directory to serve (default public/data)')
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='Interface to listen on (default 127.0.0.1, local only)')
+    parser.add_argument('--port', '-p', type=int, default=DEFAULT_PORT,
+                        help=f'Port to listen on (default {DEFAULT_PORT})')
+    args = parser.parse_args()
+    if not args.data.is_dir():
+        parser.error(f"{args.data} is not a directory")
+
+    try:
+        asyncio.run(serve(args.data, args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n👋 Data service stopped")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
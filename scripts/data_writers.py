@@ -0,0 +1,460 @@
+"""
+Streaming writers for WFM.ai synthetic data files.
+
+Records are written as the generators yield them, so peak memory stays flat
+and write time scales linearly with the number of records. Three JSON
+styles are supported:
+
+- pretty:  JSON array indented by 2 spaces (byte-identical to json.dump(indent=2))
+- compact: JSON array without whitespace
+- ndjson:  one JSON record per line (.ndjson), readable incrementally
+
+NDJSON written by the block pipeline (see pipeline.py) may also be gzip
+compressed (.ndjson.gz, one gzip member per block).
+
+Record datasets can also be written as typed columns, either as a Parquet
+file (when pyarrow is installed) or as a directory bundle of memory-mappable
+.npy files, one per column.
+"""
+
+import gzip
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional; fall back to .npy bundles
+    pa = None
+    pq = None
+
+JSON_FORMATS = ('pretty', 'compact', 'ndjson')
+
+COMPRESSIONS = ('none', 'gzip')
+
+COMPACT_SEPARATORS = (',', ':')
+
+COLUMNAR_BACKENDS = ('auto', 'parquet', 'npy')
+
+# Column types used in columnar schemas, mapped to NumPy and Arrow types
+NUMPY_TYPES = {
+    'date32': 'datetime64[D]',
+    'int16': np.int16,
+    'int32': np.int32,
+    'float32': np.float32,
+    'string': np.str_,
+}
+
+# A columnar schema is a list of (column name, column type, record key path)
+ColumnSpec = Tuple[str, str, Tuple[str, ...]]
+
+DEFAULT_CHUNK_ROWS = 65536
+
+
+def records_filename(filename: str, json_format: str, compression: str = 'none') -> str:
+    """Return the on-disk name of a record dataset for a JSON format."""
+    if json_format == 'ndjson':
+        filename = str(Path(filename).with_suffix('.ndjson'))
+    return filename + '.gz' if compression == 'gzip' else filename
+
+
+def open_records(filepath: Path):
+    """Open a record file for reading text, decompressing .gz files."""
+    if Path(filepath).suffix == '.gz':
+        return gzip.open(filepath, 'rt')
+    return open(filepath)
+
+
+def _encode_record(record: Dict, json_format: str) -> str:
+    """Serialize one record; pretty records are indented to sit inside an array."""
+    if json_format == 'pretty':
+        return json.dumps(record, indent=2, default=str).replace('\n', '\n  ')
+    return json.dumps(record, separators=COMPACT_SEPARATORS, default=str)
+
+
+def encode_record_block(records: Sequence[Dict], json_format: str, first: bool) -> str:
+    """Serialize consecutive records as they appear inside a records file.
+
+    Args:
+        records: Records to encode.
+        json_format: One of JSON_FORMATS.
+        first: The block starts right after the opening bracket of a JSON
+            array (no separator before its first record).
+
+    Returns:
+        The text between the previous record and the next one, so blocks
+        written in order after an opening '[' (and closed with the
+        array_closing text) make the same file as write_json_records.
+    """
+    if json_format == 'ndjson':
+        return ''.join(_encode_record(record, json_format) + '\n' for record in records)
+    separator = ',\n  ' if json_format == 'pretty' else ','
+    opening = '\n  ' if json_format == 'pretty' else ''
+    return ''.join((opening if first and i == 0 else separator) + _encode_record(record, json_format)
+                   for i, record in enumerate(records))
+
+
+def record_template(shape: Dict, json_format: str) -> str:
+    """%-format template that encodes records exactly like _encode_record.
+
+    Args:
+        shape: A record whose values are '%s' (a string field) or '%d' (an
+            integer field), nested like the records to encode.
+        json_format: One of JSON_FORMATS.
+    """
+    return _encode_record(shape, json_format).replace('"%d"', '%d')
+
+
+def encode_template_block(template: str, rows: Iterable[Tuple], json_format: str,
+                          first: bool) -> str:
+    """encode_record_block for records given as value tuples filling a record_template.
+
+    Formats rows straight into text, without building a dict per record,
+    and returns the same text as encode_record_block for those records.
+    """
+    if json_format == 'ndjson':
+        return ''.join(map((template + '\n').__mod__, rows))
+    separator = ',\n  ' if json_format == 'pretty' else ','
+    text = separator.join(map(template.__mod__, rows))
+    if not text:
+        return ''
+    opening = '\n  ' if json_format == 'pretty' else ''
+    return (opening if first else separator) + text
+
+
+def array_closing(json_format: str, empty: bool) -> str:
+    """Text closing a JSON array after its opening '[' and records."""
+    return '\n]' if json_format == 'pretty' and not empty else ']'
+
+
+def write_json_records(filepath: Path, records: Iterable[Dict], json_format: str = 'pretty',
+                       spans: Optional[List[Tuple[int, int]]] = None) -> int:
+    """Stream records to a JSON array or NDJSON file.
+
+    Args:
+        filepath: Destination file.
+        records: Records to write, typically a generator.
+        json_format: One of JSON_FORMATS.
+        spans: When given, the (start, end) byte offsets of each record's
+            JSON text are appended to it, for building range-read indexes.
+
+    Returns:
+        Number of records written.
+    """
+    if json_format not in JSON_FORMATS:
+        raise ValueError(f"Unknown JSON format '{json_format}', expected one of {JSON_FORMATS}")
+
+    count = 0
+    position = 0  # Encoded records are ASCII (json.dumps escapes the rest), so chars == bytes
+    with open(filepath, 'w') as f:
+        if json_format == 'ndjson':
+            for record in records:
+                text = _encode_record(record, json_format)
+                f.write(text)
+                f.write('\n')
+                if spans is not None:
+                    spans.append((position, position + len(text)))
+                position += len(text) + 1
+                count += 1
+        elif json_format == 'compact':
+            f.write('[')
+            position = 1
+            for record in records:
+                if count:
+                    f.write(',')
+                    position += 1
+                text = _encode_record(record, json_format)
+                f.write(text)
+                if spans is not None:
+                    spans.append((position, position + len(text)))
+                position += len(text)
+                count += 1
+            f.write(']')
+        else:
+            for record in records:
+                f.write('[\n  ' if count == 0 else ',\n  ')
+                text = _encode_record(record, json_format)
+                f.write(text)
+                position += 4
+                if spans is not None:
+                    spans.append((position, position + len(text)))
+                position += len(text)
+                count += 1
+            f.write('\n]' if count else '[]')
+    return count
+
+
+def append_json_records(filepath: Path, records: Iterable[Dict], json_format: str = 'pretty',
+                        spans: Optional[List[Tuple[int, int]]] = None) -> int:
+    """Append records to a file written by write_json_records, in place.
+
+    NDJSON files are simply extended. For JSON arrays only the closing
+    bracket is rewritten, so the cost is proportional to the new records,
+    not the file size. Existing records keep their byte offsets; spans
+    (see write_json_records) receives those of the appended records.
+
+    Returns:
+        Number of records appended.
+    """
+    count = 0
+    if json_format == 'ndjson':
+        with open(filepath, 'a') as f:
+            position = f.tell()
+            for record in records:
+                text = _encode_record(record, json_format)
+                f.write(text)
+                f.write('\n')
+                if spans is not None:
+                    spans.append((position, position + len(text)))
+                position += len(text) + 1
+                count += 1
+        return count
+
+    pretty = json_format == 'pretty'
+    with open(filepath, 'r+b') as f:
+        empty = reopen_json_array(f, json_format)
+        position = f.tell()
+        for record in records:
+            if empty and count == 0:
+                prefix = '\n  ' if pretty else ''
+            else:
+                prefix = ',\n  ' if pretty else ','
+            text = _encode_record(record, json_format)
+            f.write((prefix + text).encode())
+            position += len(prefix)
+            if spans is not None:
+                spans.append((position, position + len(text)))
+            position += len(text)
+            count += 1
+        f.write(array_closing(json_format, empty and count == 0).encode())
+    return count
+
+
+def reopen_json_array(f, json_format: str) -> bool:
+    """Truncate the closing bracket of a JSON array file opened 'r+b'.
+
+    The file is left positioned where the next record's separator goes.
+
+    Returns:
+        Whether the array was empty (only its '[' is left).
+
+    Raises:
+        ValueError: If the file does not end like a JSON array in this style.
+    """
+    closing = array_closing(json_format, empty=False).encode()
+    f.seek(0, os.SEEK_END)
+    size = f.tell()
+    f.seek(max(size - len(closing), 0))
+    tail = f.read()
+    f.seek(max(size - 2, 0))
+    empty = f.read() == b'[]'
+
+    if empty:
+        f.seek(size - 1)  # Keep the opening bracket
+    elif tail == closing:
+        f.seek(size - len(closing))
+    else:
+        raise ValueError(f"{f.name} does not end like a {json_format} JSON array")
+    f.truncate()
+    return empty
+
+
+def last_record_date(filepath: Path) -> Optional[str]:
+    """Return the 'date' of the last record in a JSON, NDJSON or columnar dataset."""
+    filepath = Path(filepath)
+    if filepath.is_dir() or filepath.suffix == '.parquet':
+        dates = read_columnar(filepath).get('date')
+        return str(dates[-1]) if dates is not None and len(dates) else None
+
+    if filepath.suffix == '.gz':
+        # Members cannot be read from the end; keep the tail while streaming
+        tail = ''
+        with gzip.open(filepath, 'rt') as f:
+            for chunk in iter(lambda: f.read(1 << 20), ''):
+                tail = (tail + chunk)[-4096:]
+    else:
+        with open(filepath, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(f.tell() - 4096, 0))
+            tail = f.read().decode(errors='ignore')
+    dates = re.findall(r'"date":\s*"(\d{4}-\d{2}-\d{2})"', tail)
+    return dates[-1] if dates else None
+
+
+def write_json_document(filepath: Path, data: Any, json_format: str = 'pretty') -> None:
+    """Write a single JSON document (e.g. summary stats) in the given style."""
+    with open(filepath, 'w') as f:
+        if json_format == 'pretty':
+            json.dump(data, f, indent=2, default=str)
+        else:
+            json.dump(data, f, separators=COMPACT_SEPARATORS, default=str)
+
+
+def _arrow_type(column_type: str):
+    """Arrow type for a schema column type."""
+    return {
+        'date32': pa.date32(),
+        'int16': pa.int16(),
+        'int32': pa.int32(),
+        'float32': pa.float32(),
+        'string': pa.string(),
+    }[column_type]
+
+
+def resolve_columnar_backend(backend: str = 'auto') -> str:
+    """Pick the columnar backend, preferring Parquet when pyarrow is available."""
+    if backend not in COLUMNAR_BACKENDS:
+        raise ValueError(f"Unknown columnar backend '{backend}', expected one of {COLUMNAR_BACKENDS}")
+    if backend == 'auto':
+        return 'parquet' if pq is not None else 'npy'
+    if backend == 'parquet' and pq is None:
+        raise ImportError("pyarrow is required for Parquet output (pip install pyarrow)")
+    return backend
+
+
+def columnar_filename(filename: str, backend: str) -> str:
+    """Return the on-disk name of a columnar dataset.
+
+    Parquet datasets are single ``.parquet`` files; npy datasets are
+    directories holding one ``<column>.npy`` file per column.
+    """
+    stem = Path(filename).stem
+    return f"{stem}.parquet" if backend == 'parquet' else stem
+
+
+def _column_chunk(rows: Sequence[Dict], schema: Sequence[ColumnSpec]) -> Dict[str, np.ndarray]:
+    """Convert a chunk of records into one typed array per column."""
+    chunk = {}
+    for name, column_type, key_path in schema:
+        values = []
+        for row in rows:
+            value = row
+            for key in key_path:
+                value = value[key]
+            values.append(value)
+        chunk[name] = np.array(values, dtype=NUMPY_TYPES[column_type])
+    return chunk
+
+
+def _iter_chunks(records: Iterable[Dict], chunk_rows: int) -> Iterable[List[Dict]]:
+    """Group a record stream into lists of at most chunk_rows records."""
+    rows = []
+    for record in records:
+        rows.append(record)
+        if len(rows) >= chunk_rows:
+            yield rows
+            rows = []
+    if rows:
+        yield rows
+
+
+def write_columnar_records(filepath: Path, records: Iterable[Dict],
+                           schema: Sequence[ColumnSpec], backend: str = 'parquet',
+                           chunk_rows: int = DEFAULT_CHUNK_ROWS) -> int:
+    """Write a record stream as typed columns.
+
+    Parquet output is written one row group per chunk, so only a single
+    chunk of records is held at a time. The npy backend keeps the compact
+    typed column arrays (not the records) until the end and then saves each
+    column as its own ``.npy`` file.
+
+    Args:
+        filepath: ``.parquet`` file or npy bundle directory (see columnar_filename).
+        records: Records to write, typically a generator.
+        schema: (column name, column type, record key path) for each column.
+        backend: 'parquet' or 'npy'.
+        chunk_rows: Records converted to columns at a time.
+
+    Returns:
+        Number of records written.
+    """
+    count = 0
+
+    if backend == 'parquet':
+        arrow_schema = pa.schema([(name, _arrow_type(column_type))
+                                  for name, column_type, _ in schema])
+        with pq.ParquetWriter(filepath, arrow_schema) as writer:
+            for rows in _iter_chunks(records, chunk_rows):
+                chunk = _column_chunk(rows, schema)
+                writer.write_table(pa.table(
+                    [pa.array(chunk[name], type=arrow_schema.field(name).type)
+                     for name, _, _ in schema],
+                    schema=arrow_schema))
+                count += len(rows)
+        return count
+
+    columns = {name: [] for name, _, _ in schema}
+    for rows in _iter_chunks(records, chunk_rows):
+        for name, values in _column_chunk(rows, schema).items():
+            columns[name].append(values)
+        count += len(rows)
+
+    filepath.mkdir(parents=True, exist_ok=True)
+    for name, column_type, _ in schema:
+        values = (np.concatenate(columns[name]) if columns[name]
+                  else np.array([], dtype=NUMPY_TYPES[column_type]))
+        np.save(filepath / f"{name}.npy", values)
+    return count
+
+
+def append_columnar_records(filepath: Path, records: Iterable[Dict],
+                            schema: Sequence[ColumnSpec], backend: str = 'parquet',
+                            chunk_rows: int = DEFAULT_CHUNK_ROWS) -> int:
+    """Append records to a dataset written by write_columnar_records.
+
+    npy columns are rewritten as the existing column followed by the new
+    values. Parquet files are immutable, so the existing
+    row groups are copied into a new file followed by the new rows.
+
+    Returns:
+        Number of records appended.
+    """
+    count = 0
+
+    if backend == 'parquet':
+        existing = pq.read_table(filepath)
+        tmp_path = filepath.with_name(filepath.name + '.tmp')
+        with pq.ParquetWriter(tmp_path, existing.schema) as writer:
+            writer.write_table(existing)
+            for rows in _iter_chunks(records, chunk_rows):
+                chunk = _column_chunk(rows, schema)
+                writer.write_table(pa.table(
+                    [pa.array(chunk[name], type=existing.schema.field(name).type)
+                     for name, _, _ in schema],
+                    schema=existing.schema))
+                count += len(rows)
+        os.replace(tmp_path, filepath)
+        return count
+
+    new_columns = {name: [] for name, _, _ in schema}
+    for rows in _iter_chunks(records, chunk_rows):
+        for name, values in _column_chunk(rows, schema).items():
+            new_columns[name].append(values)
+        count += len(rows)
+
+    if count:
+        for name, _, _ in schema:
+            column_path = filepath / f"{name}.npy"
+            combined = np.concatenate([np.load(column_path)] + new_columns[name])
+            np.save(column_path, combined)
+    return count
+
+
+def read_columnar(filepath: Path) -> Dict[str, np.ndarray]:
+    """Load a columnar dataset as a dict of column arrays.
+
+    npy bundles are memory-mapped, so columns are paged in lazily rather
+    than parsed.
+    """
+    filepath = Path(filepath)
+    if filepath.suffix == '.parquet':
+        if pq is None:
+            raise ImportError("pyarrow is required to read Parquet files (pip install pyarrow)")
+        table = pq.read_table(filepath)
+        return {name: table.column(name).to_numpy() for name in table.column_names}
+    return {path.stem: np.load(path, mmap_mode='r') for path in sorted(filepath.glob('*.npy'))}
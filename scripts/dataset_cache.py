@@ -0,0 +1,130 @@
+"""
+Content-hash cache of generated datasets for the WFM.ai synthetic data generator.
+
+Each dataset is a node in a small dependency graph (DATASET_DEPENDENCIES).
+Its cache key is a hash of its own generation inputs (seed, window, the
+parameters and tables it reads, output style) and of the keys of the
+datasets it depends on, so a change anywhere upstream reaches every
+dataset below it.
+
+A run with ``--cache`` computes each key before generating a dataset. If
+the previous run stored the same key and the dataset's files on disk are
+untouched since (same size and modification time), the files are kept and
+the per-day aggregates the later stages need are loaded from
+``.cache/<dataset>.npz`` instead of being regenerated.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+CACHE_DIRNAME = '.cache'
+CACHE_MANIFEST = 'datasets.json'
+
+# Bump when generation logic changes the output for the same inputs
+CACHE_VERSION = 1
+
+# Datasets each dataset is derived from. Staffing only reads volume and
+# deflection when a scheduler plans the shifts (see
+# WFMDataGenerator._dataset_upstream).
+DATASET_DEPENDENCIES = {
+    'volume': (),
+    'deflection': (),
+    'cost': (),
+    'staffing': ('volume', 'deflection'),
+    'sla': ('volume', 'deflection', 'staffing'),
+    'rollups': ('volume', 'deflection', 'staffing', 'sla'),
+}
+
+
+def content_hash(inputs: Dict[str, Any]) -> str:
+    """Stable short hash of JSON-serializable inputs."""
+    payload = json.dumps({'version': CACHE_VERSION, **inputs}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def _fingerprint(path: Path) -> Optional[Tuple[int, int]]:
+    """(size, latest mtime in ns) of a file or directory tree; None if missing."""
+    if not path.exists():
+        return None
+    files = [p for p in path.rglob('*') if p.is_file()] if path.is_dir() else [path]
+    stats = [p.stat() for p in files]
+    return sum(s.st_size for s in stats), max((s.st_mtime_ns for s in stats), default=0)
+
+
+class DatasetCache:
+    """Cache keys and stored aggregates of the datasets in one output directory.
+
+    Args:
+        output_dir: Directory holding the generated datasets.
+    """
+
+    def __init__(self, output_dir: Path):
+        self.output_dir = Path(output_dir)
+        self.directory = self.output_dir / CACHE_DIRNAME
+        manifest = self.directory / CACHE_MANIFEST
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        if manifest.exists():
+            with open(manifest) as f:
+                self._entries = json.load(f)
+        self.keys: Dict[str, str] = {}
+        self.reused: List[str] = []
+
+    def key(self, name: str, inputs: Dict[str, Any], upstream: Sequence[str]) -> str:
+        """Compute and remember a dataset's key; upstream keys must exist already."""
+        self.keys[name] = content_hash({
+            'dataset': name,
+            'inputs': inputs,
+            'upstream': {dependency: self.keys[dependency] for dependency in upstream}
+        })
+        return self.keys[name]
+
+    def lookup(self, name: str) -> Optional[Dict[str, Any]]:
+        """Stored metadata of a dataset whose key and files are unchanged, else None."""
+        entry = self._entries.get(name)
+        if entry is None or entry['key'] != self.keys.get(name):
+            return None
+        for filename, fingerprint in entry['files'].items():
+            current = _fingerprint(self.output_dir / filename)
+            if current is None or list(current) != fingerprint:
+                return None
+        self.reused.append(name)
+        return entry['meta']
+
+    def arrays(self, name: str) -> Dict[str, np.ndarray]:
+        """Arrays stored with a dataset."""
+        with np.load(self.directory / f"{name}.npz") as bundle:
+            return {key: bundle[key] for key in bundle.files}
+
+    def store(self, name: str, files: Sequence[str], arrays: Optional[Dict[str, Any]] = None,
+              meta: Optional[Dict[str, Any]] = None):
+        """Record a freshly generated dataset under its current key.
+
+        Args:
+            name: Dataset name in DATASET_DEPENDENCIES.
+            files: Its files or directories, relative to the output directory.
+                They are fingerprinted in save(), after every output is written.
+            arrays: Arrays later stages need, saved to .cache/<name>.npz.
+            meta: Small JSON-serializable values returned by lookup().
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if arrays is not None:
+            np.savez(self.directory / f"{name}.npz",
+                     **{key: np.asarray(values) for key, values in arrays.items()})
+        self._entries[name] = {'key': self.keys[name], 'files': list(files), 'meta': meta or {}}
+
+    def save(self):
+        """Fingerprint the datasets' files and write the cache manifest.
+
+        Reused datasets are fingerprinted again too, since small outputs
+        such as cost_data.json are rewritten with the same content.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for entry in self._entries.values():
+            entry['files'] = {filename: _fingerprint(self.output_dir / filename)
+                              for filename in entry['files']}
+        with open(self.directory / CACHE_MANIFEST, 'w') as f:
+            json.dump(self._entries, f, indent=2)
@@ -0,0 +1,94 @@
+"""
+Monte Carlo scenario ensembles for the WFM.ai synthetic data generator.
+
+An ensemble is N independent realizations of volume, absences and SLA for
+the same window. The generator computes members in batches as stacked
+arrays, e.g. hourly volume shaped (members, days, hours). This module
+reduces them to per-day quantile bands and optionally keeps every member in
+an npy bundle (one memory-mappable array per quantity) that
+``data_writers.read_columnar`` can load.
+"""
+
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+ENSEMBLE_QUANTILES = (0.10, 0.50, 0.90)
+ENSEMBLE_BATCH = 32  # Members computed together; bounds peak memory on long windows
+
+ENSEMBLE_FILENAME = 'ensemble_quantiles.json'
+ENSEMBLE_DIRNAME = 'ensemble'
+
+
+def quantile_label(quantile: float) -> str:
+    """Band key for a quantile, e.g. 0.9 -> 'p90'."""
+    return f"p{round(quantile * 100)}"
+
+
+def quantile_bands(values: np.ndarray, quantiles: Sequence[float] = ENSEMBLE_QUANTILES
+                   ) -> Dict[str, np.ndarray]:
+    """Quantiles over the member axis (axis 0) of an ensemble array."""
+    bands = np.quantile(values, quantiles, axis=0)
+    return {quantile_label(q): band for q, band in zip(quantiles, bands)}
+
+
+def band_records(dates: Sequence[str], metrics: Dict[str, np.ndarray],
+                 decimals: Dict[str, int], quantiles: Sequence[float] = ENSEMBLE_QUANTILES
+                 ) -> Iterator[Dict]:
+    """Yield one record per day with each metric's quantile band.
+
+    Args:
+        dates: Day of each column, as 'YYYY-MM-DD' strings.
+        metrics: Per-member daily values (members x days) by metric name.
+        decimals: Rounding per metric; metrics rounded to 0 decimals are
+            written as integers.
+    """
+    bands = {name: {label: band.tolist() for label, band in quantile_bands(values, quantiles).items()}
+             for name, values in metrics.items()}
+    for day, date_str in enumerate(dates):
+        record = {'date': date_str}
+        for name, metric_bands in bands.items():
+            places = decimals.get(name, 0)
+            record[name] = {label: (round(band[day], places) if places else int(round(band[day])))
+                            for label, band in metric_bands.items()}
+        yield record
+
+
+class EnsembleWriter:
+    """Writes every ensemble member to an npy bundle, one batch at a time.
+
+    Each array is preallocated on disk with ``open_memmap`` and filled as
+    batches complete, so the full ensemble never has to fit in memory.
+
+    Args:
+        directory: Bundle directory (created if missing).
+        arrays: Name -> (shape, dtype) of each per-member array; the first
+            axis is the member axis.
+        labels: Small index arrays (dates, hours, shifts) saved as-is.
+    """
+
+    def __init__(self, directory: Path, arrays: Dict[str, Tuple[Tuple[int, ...], str]],
+                 labels: Dict[str, np.ndarray]):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for path in self.directory.glob('*.npy'):
+            path.unlink()
+        for name, values in labels.items():
+            np.save(self.directory / f"{name}.npy", values)
+        self._arrays = {name: np.lib.format.open_memmap(self.directory / f"{name}.npy", mode='w+',
+                                                        dtype=dtype, shape=shape)
+                        for name, (shape, dtype) in arrays.items()}
+
+    def write(self, first_member: int, batch: Dict[str, np.ndarray]):
+        """Store one batch of members starting at index first_member."""
+        for name, values in batch.items():
+            self._arrays[name][first_member:first_member + len(values)] = values
+
+    def close(self) -> List[str]:
+        """Flush all arrays; returns the bundle's array names."""
+        for array in self._arrays.values():
+            array.flush()
+        names = sorted(path.stem for path in self.directory.glob('*.npy'))
+        self._arrays = {}
+        return names
@@ -0,0 +1,362 @@
+"""
+Batched Erlang C / Erlang A queueing math for the WFM.ai data generator.
+
+Every function takes NumPy arrays (or scalars) of per-interval inputs and
+evaluates all intervals at once, so a year of hourly intervals is solved in
+one call. The Erlang B recursion
+
+    B(0) = 1,   B(n) = A * B(n-1) / (n + A * B(n-1))
+
+is carried in log space, which stays finite for the large agent counts and
+traffic intensities where the textbook A^N / N! form overflows. The loop
+runs over agent counts, never over intervals.
+
+Units: traffic intensity A is in Erlangs (arrivals x AHT / interval length);
+times (AHT, answer threshold, patience) are in seconds.
+"""
+
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Tuple, Union
+
+import numpy as np
+
+ArrayLike = Union[float, int, np.ndarray]
+
+# Intervals per block in erlang_a (bounds the intervals x states table)
+ERLANG_A_BLOCK = 2048
+
+
+class ErlangAResult(NamedTuple):
+    """Per-interval M/M/N+M metrics."""
+    wait_probability: np.ndarray  # Share of arrivals that have to queue
+    abandonment: np.ndarray       # Share of arrivals that hang up before an answer
+    mean_wait: np.ndarray         # Mean time in queue over all arrivals, seconds
+
+
+def traffic_intensity(volume: ArrayLike, aht: ArrayLike,
+                      interval_seconds: float = 3600) -> np.ndarray:
+    """Offered load in Erlangs for `volume` contacts per interval."""
+    return np.asarray(volume, dtype=np.float64) * aht / interval_seconds
+
+
+def _log_erlang_b_steps(traffic: np.ndarray, max_agents: int):
+    """Yield (n, log B(n, A)) for n = 1..max_agents, vectorized over A."""
+    with np.errstate(divide='ignore'):
+        log_traffic = np.log(traffic)
+    log_b = np.zeros_like(traffic)  # log B(0) = 0
+    for n in range(1, max_agents + 1):
+        log_b = log_traffic + log_b - np.log(n + traffic * np.exp(log_b))
+        yield n, log_b
+
+
+def erlang_b(agents: ArrayLike, traffic: ArrayLike) -> np.ndarray:
+    """Blocking probability B(N, A) for each interval."""
+    agents, traffic = np.broadcast_arrays(np.asarray(agents, dtype=np.int64),
+                                          np.asarray(traffic, dtype=np.float64))
+    log_b = np.zeros(traffic.shape)
+    for n, step in _log_erlang_b_steps(traffic, int(agents.max(initial=0))):
+        log_b = np.where(agents == n, step, log_b)
+    return np.exp(log_b)
+
+
+def erlang_c(agents: ArrayLike, traffic: ArrayLike) -> np.ndarray:
+    """Probability that an arrival waits, C(N, A); 1 when N <= A (unstable queue)."""
+    agents = np.asarray(agents, dtype=np.int64)
+    traffic = np.asarray(traffic, dtype=np.float64)
+    blocking = erlang_b(agents, traffic)
+    stable = agents > traffic
+    with np.errstate(divide='ignore', invalid='ignore'):
+        waiting = agents * blocking / (agents - traffic * (1 - blocking))
+    return np.where(stable, waiting, 1.0)
+
+
+def service_level(agents: ArrayLike, traffic: ArrayLike, aht: ArrayLike,
+                  threshold: ArrayLike) -> np.ndarray:
+    """Share of contacts answered within `threshold` seconds (Erlang C).
+
+    Intervals with no traffic are fully served; unstable intervals
+    (agents <= traffic) have a service level of 0.
+    """
+    agents = np.asarray(agents, dtype=np.int64)
+    traffic = np.asarray(traffic, dtype=np.float64)
+    waiting = erlang_c(agents, traffic)
+    with np.errstate(over='ignore'):
+        level = 1 - waiting * np.exp(-(agents - traffic) * threshold / aht)
+    level = np.where(agents > traffic, level, 0.0)
+    return np.where(traffic > 0, level, 1.0)
+
+
+def average_speed_of_answer(agents: ArrayLike, traffic: ArrayLike,
+                            aht: ArrayLike) -> np.ndarray:
+    """Mean queue wait in seconds (Erlang C); inf when agents <= traffic."""
+    agents = np.asarray(agents, dtype=np.int64)
+    traffic = np.asarray(traffic, dtype=np.float64)
+    waiting = erlang_c(agents, traffic)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        asa = waiting * aht / (agents - traffic)
+    asa = np.where(agents > traffic, asa, np.inf)
+    return np.where(traffic > 0, asa, 0.0)
+
+
+def required_agents(volume: ArrayLike, aht: ArrayLike, target_sla: ArrayLike,
+                    threshold: ArrayLike, interval_seconds: float = 3600,
+                    max_occupancy: float = 1.0) -> np.ndarray:
+    """Fewest agents meeting the service level target, for every interval at once.
+
+    Args:
+        volume: Contacts offered per interval.
+        aht: Average handle time, seconds.
+        target_sla: Required share answered within `threshold` (e.g. 0.80).
+        threshold: Answer time threshold, seconds (e.g. 20).
+        interval_seconds: Interval length, seconds.
+        max_occupancy: Upper bound on traffic / agents (1.0 = no cap).
+
+    Returns:
+        int64 array of required agents (0 for intervals without traffic).
+    """
+    traffic = traffic_intensity(volume, aht, interval_seconds)
+    traffic, aht, target_sla, threshold = np.broadcast_arrays(
+        traffic, np.asarray(aht, dtype=np.float64),
+        np.asarray(target_sla, dtype=np.float64), np.asarray(threshold, dtype=np.float64))
+
+    required = np.zeros(traffic.shape, dtype=np.int64)
+    unsolved = traffic > 0
+    if not unsolved.any():
+        return required
+
+    # Traffic above A + 10 sqrt(A) + 10 agents leaves queues practically empty,
+    # so this bound is never reached for service level targets below 1
+    max_agents = int(np.ceil(traffic.max() + 10 * np.sqrt(traffic.max()) + 10))
+    occupancy_floor = traffic / max_occupancy
+
+    for n, log_b in _log_erlang_b_steps(traffic, max_agents):
+        candidates = unsolved & (n > traffic) & (n >= occupancy_floor)
+        if not candidates.any():
+            continue
+        blocking = np.exp(log_b)
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            waiting = n * blocking / (n - traffic * (1 - blocking))
+            level = 1 - waiting * np.exp(-(n - traffic) * threshold / aht)
+        met = candidates & (level >= target_sla)
+        required[met] = n
+        unsolved &= ~met
+        if not unsolved.any():
+            break
+
+    required[unsolved] = max_agents
+    return required
+
+
+def erlang_a(agents: ArrayLike, volume: ArrayLike, aht: ArrayLike, patience: ArrayLike,
+             interval_seconds: float = 3600) -> ErlangAResult:
+    """Queue metrics with abandonment (M/M/N+M, Erlang A) for every interval.
+
+    Unlike Erlang C, the model stays stable when agents <= traffic, because
+    callers with exponential patience leave the queue. The stationary
+    distribution of the birth-death chain is evaluated in log space and
+    truncated once the queue is long enough that the remaining states
+    carry negligible probability.
+
+    Args:
+        agents: Agents on the queue per interval.
+        volume: Contacts offered per interval.
+        aht: Average handle time, seconds.
+        patience: Mean time a caller waits before abandoning, seconds.
+        interval_seconds: Interval length, seconds.
+    """
+    agents, volume, aht, patience = np.broadcast_arrays(
+        np.asarray(agents, dtype=np.int64), np.asarray(volume, dtype=np.float64),
+        np.asarray(aht, dtype=np.float64), np.asarray(patience, dtype=np.float64))
+    shape = agents.shape
+    flat = [a.ravel() for a in (agents, volume / interval_seconds, aht, patience)]
+
+    # The state table is intervals x states, so solve in blocks of intervals
+    blocks = [_erlang_a_block(*(a[start:start + ERLANG_A_BLOCK] for a in flat))
+              for start in range(0, flat[0].size, ERLANG_A_BLOCK)]
+    if not blocks:
+        empty = np.zeros(shape)
+        return ErlangAResult(empty, empty, empty)
+    return ErlangAResult(*(np.concatenate(column).reshape(shape) for column in zip(*blocks)))
+
+
+def _erlang_a_block(agents: np.ndarray, arrival_rate: np.ndarray, aht: np.ndarray,
+                    patience: np.ndarray):
+    """Erlang A metrics for one block of intervals (arrival_rate per second)."""
+    service_rate = 1 / aht
+    abandon_rate = 1 / patience
+    traffic = arrival_rate / service_rate
+
+    # States 0..N (agents busy) then N+1..N+Q (callers queued). The queue
+    # length is roughly Poisson(arrival_rate / abandon_rate) when agents are
+    # swamped, so 10 standard deviations past its mean covers the tail
+    queue_load = arrival_rate / abandon_rate
+    max_queue = int(np.ceil((queue_load + 10 * np.sqrt(queue_load)).max(initial=0))) + 10
+    states = np.arange(int(agents.max(initial=0)) + max_queue + 1)
+
+    # log pi_k (unnormalized): k log A - log k! while k <= N, then each
+    # queued caller j multiplies by lambda / (N mu + j theta)
+    log_factorial = np.concatenate([[0.0], np.cumsum(np.log(states[1:]))])
+    k = states[None, :]
+    n = agents[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_traffic = np.log(traffic)[:, None]
+        busy = k * log_traffic - log_factorial[np.minimum(k, n)]
+        log_top = n * log_traffic - log_factorial[n]  # log pi_N
+        step = (np.log(arrival_rate)[:, None]
+                - np.log(n * service_rate[:, None] + k * abandon_rate[:, None]))
+    step[:, 0] = 0.0
+    queued = np.clip(k - n, 0, None)
+    queue_part = np.take_along_axis(np.cumsum(step, axis=1), queued, axis=1)
+    log_pi = np.where(k <= n, busy, log_top + queue_part)
+    # Without traffic the system is always empty
+    log_pi = np.where(traffic[:, None] > 0, log_pi, np.where(k == 0, 0.0, -np.inf))
+
+    log_pi -= log_pi.max(axis=1, keepdims=True)
+    pi = np.exp(log_pi)
+    pi /= pi.sum(axis=1, keepdims=True)
+
+    # PASTA: arrivals see the stationary distribution
+    wait_probability = (pi * (k >= n)).sum(axis=1)
+    mean_queue = (pi * queued).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        abandonment = np.where(arrival_rate > 0, abandon_rate * mean_queue / arrival_rate, 0.0)
+        mean_wait = np.where(arrival_rate > 0, mean_queue / arrival_rate, 0.0)  # Little's law
+
+    return wait_probability, abandonment, mean_wait
+
+
+def _unique_rows(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """np.unique(keys, axis=0, return_inverse=True) for rows of int64 keys.
+
+    When the keys are non-negative and their ranges fit, each row is packed
+    into one int64 first; sorting those is far faster than sorting rows.
+    """
+    span = keys.max(axis=0) + 1
+    if keys.min() < 0 or np.prod(span.astype(np.float64)) >= 2 ** 62:
+        return np.unique(keys, axis=0, return_inverse=True)
+    packed = (keys[:, 0] * span[1] + keys[:, 1]) * span[2] + keys[:, 2]
+    _, index, inverse = np.unique(packed, return_index=True, return_inverse=True)
+    return keys[index], inverse
+
+
+class StaffingTable:
+    """Memoized required-agent solves keyed on quantized inputs, with LRU eviction.
+
+    Required agents depend only on the traffic intensity A, the ratio of
+    answer threshold to handle time, and the service level target. Each is
+    quantized in the conservative direction: traffic and target are rounded
+    up and the threshold ratio down. A cached answer therefore never
+    understaffs an interval, and overstaffs it by at most one agent at the
+    edge of a quantization step. Intervals sharing a key are solved once.
+    Misses in a batch are solved together in a single required_agents call.
+
+    Args:
+        max_entries: Maximum number of cached solves; least recently used
+            entries are evicted first.
+        traffic_step: Traffic quantum, Erlangs.
+        ratio_step: Quantum of threshold / AHT.
+        target_step: Service level target quantum.
+    """
+
+    def __init__(self, max_entries: int = 65536, traffic_step: float = 0.01,
+                 ratio_step: float = 0.001, target_step: float = 0.0001):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.steps = (traffic_step, ratio_step, target_step)
+        self._table: 'OrderedDict[Tuple[int, int, int], int]' = OrderedDict()
+        self.lookups = 0
+        self.hits = 0
+        self.evictions = 0
+
+    def _keys(self, traffic: np.ndarray, ratio: np.ndarray, target: np.ndarray) -> np.ndarray:
+        """Quantized (traffic, ratio, target) keys, one row per interval."""
+        traffic_step, ratio_step, target_step = self.steps
+        # Tiny tolerances keep values already on a step from moving to the next one
+        return np.stack([np.ceil(traffic / traffic_step - 1e-9),
+                         np.floor(ratio / ratio_step + 1e-9),
+                         np.ceil(target / target_step - 1e-9)], axis=-1).astype(np.int64)
+
+    def required_agents(self, volume: ArrayLike, aht: ArrayLike, target_sla: ArrayLike,
+                        threshold: ArrayLike, interval_seconds: float = 3600) -> np.ndarray:
+        """Cached equivalent of erlang.required_agents (same arguments)."""
+        traffic = traffic_intensity(volume, aht, interval_seconds)
+        traffic, aht, target_sla, threshold = np.broadcast_arrays(
+            traffic, np.asarray(aht, dtype=np.float64),
+            np.asarray(target_sla, dtype=np.float64), np.asarray(threshold, dtype=np.float64))
+        keys = self._keys(traffic, threshold / aht, target_sla).reshape(-1, 3)
+        if not len(keys):
+            return np.zeros(traffic.shape, dtype=np.int64)
+
+        unique_keys, inverse = _unique_rows(keys)
+        agents = np.empty(len(unique_keys), dtype=np.int64)
+        missing = []
+        for i, key in enumerate(map(tuple, unique_keys.tolist())):
+            cached = self._table.get(key)
+            if cached is None:
+                missing.append(i)
+            else:
+                self._table.move_to_end(key)
+                agents[i] = cached
+
+        if missing:
+            # Solve the quantized representatives of every miss in one batch
+            traffic_step, ratio_step, target_step = self.steps
+            solve = unique_keys[missing]
+            agents[missing] = required_agents(solve[:, 0] * traffic_step, 1.0,
+                                              solve[:, 2] * target_step,
+                                              solve[:, 1] * ratio_step, interval_seconds=1.0)
+            for i in missing:
+                self._insert(tuple(unique_keys[i].tolist()), int(agents[i]))
+
+        self.lookups += len(keys)
+        self.hits += len(keys) - len(missing)
+        return agents[inverse.ravel()].reshape(traffic.shape)
+
+    def precompute(self, max_traffic: float, aht: float, target_sla: float, threshold: float):
+        """Solve every traffic step from 0 to max_traffic Erlangs up front."""
+        traffic = np.arange(0, max_traffic + self.steps[0], self.steps[0])
+        lookups, hits = self.lookups, self.hits
+        self.required_agents(traffic, aht, target_sla, threshold, interval_seconds=aht)
+        self.lookups, self.hits = lookups, hits  # Warming is not a lookup
+
+    def _insert(self, key: Tuple[int, int, int], agents: int):
+        self._table[key] = agents
+        self._table.move_to_end(key)
+        while len(self._table) > self.max_entries:
+            self._table.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters; misses are the distinct keys that had to be solved."""
+        return {
+            'entries': len(self._table),
+            'lookups': self.lookups,
+            'hits': self.hits,
+            'misses': self.lookups - self.hits,
+            'hitRate': self.hits / self.lookups if self.lookups else 0.0,
+            'evictions': self.evictions
+        }
+
+    def save(self, path: Path):
+        """Persist the table (in LRU order) to an .npz file."""
+        keys = np.array(list(self._table.keys()), dtype=np.int64).reshape(-1, 3)
+        agents = np.array(list(self._table.values()), dtype=np.int64)
+        # Write to a temporary file first so concurrent runs (e.g. parallel
+        # sites sharing a cache) never leave a partially written table
+        path = Path(path)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:  # File handle keeps np.savez from appending .npz
+            np.savez_compressed(f, keys=keys, agents=agents, steps=np.array(self.steps))
+        os.replace(tmp_path, path)
+
+    def load(self, path: Path):
+        """Merge a table saved by save(); raises ValueError if its steps differ."""
+        with np.load(path) as data:
+            if not np.allclose(data['steps'], self.steps):
+                raise ValueError(f"{path} was saved with quantization steps "
+                                 f"{tuple(data['steps'].tolist())}, expected {self.steps}")
+            for key, agents in zip(map(tuple, data['keys'].tolist()), data['agents'].tolist()):
+                self._insert(key, agents)
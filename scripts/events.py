@@ -0,0 +1,273 @@
+"""
+Declarative anomaly event catalog for the WFM.ai synthetic data generator.
+
+A catalog is a list of events, either the generator's built-in
+CALENDAR_EVENTS or a JSON/YAML file passed with ``--events``:
+
+    {"events": [
+      {"type": "outage", "description": "...", "impact": "high",
+       "month": 3, "day": 15,
+       "volume": {"offset": 1, "days": 1, "multiplier": 2.0},
+       "sla": {"actual": 0.45, "avgWaitTime": 180, "abandonment": 0.25}},
+      {"type": "outage", "date": "2024-11-05", "impact": "medium",
+       "volume": {"multiplier": 1.8, "hours": [10, 14]}}
+    ]}
+
+An event is anchored on a month/day that recurs every year (``years``
+restricts it), or on a single ``date``. Its effects are keyed by dataset:
+
+- volume:     multiplier for ``days`` days starting ``offset`` days after
+              the anchor, optionally only in the hours [start, end)
+- sla:        fixed daily SLA metrics for the same kind of day window
+- deflection: multiplier on the overall deflection rate of the anchor month
+
+event_masks turns the whole catalog into per-dataset arrays for a run of
+days in one pass; earlier catalog entries win where events overlap. The
+anomaly index (anomaly_index.json) lists every occurrence with its effect
+windows, plus lookups by date and by type, so consumers never have to
+scan the records to find anomalies.
+"""
+
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+ANOMALY_INDEX_FILENAME = 'anomaly_index.json'
+
+EVENT_TYPES = ('outage', 'viral', 'campaign', 'bot_failure')
+IMPACTS = ('high', 'medium', 'low')
+EFFECTS = ('volume', 'sla', 'deflection')
+SLA_METRICS = ('actual', 'avgWaitTime', 'abandonment')
+
+# Effects that cover a window of days (deflection covers the anchor month)
+DAY_EFFECTS = ('volume', 'sla')
+
+
+def load_event_catalog(path: Path) -> List[Dict[str, Any]]:
+    """Load and validate an event catalog from a JSON or YAML file.
+
+    The file holds ``{"events": [...]}``. YAML requires PyYAML.
+    """
+    path = Path(path)
+    with open(path) as f:
+        if path.suffix in ('.yaml', '.yml'):
+            import yaml
+            config = yaml.safe_load(f)
+        else:
+            config = json.load(f)
+
+    try:
+        return validate_events((config or {}).get('events', []))
+    except ValueError as error:
+        raise ValueError(f"{path}: {error}")
+
+
+def _check(condition: bool, index: int, message: str):
+    if not condition:
+        raise ValueError(f"event {index}: {message}")
+
+
+def validate_events(events: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Check a catalog and normalize single-date events to month/day/years.
+
+    Raises:
+        ValueError: For an unknown type, impact or effect, a missing
+            anchor, or out-of-range effect values.
+    """
+    catalog = []
+    for i, raw in enumerate(events):
+        event = dict(raw)
+        _check(event.get('type') in EVENT_TYPES, i, f"type must be one of {EVENT_TYPES}")
+        _check(event.get('impact') in IMPACTS, i, f"impact must be one of {IMPACTS}")
+        event.setdefault('label', event['type'].replace('_', ' '))
+        event.setdefault('description', event['label'])
+
+        if 'date' in event:
+            try:
+                date = datetime.strptime(str(event.pop('date')), '%Y-%m-%d')
+            except ValueError:
+                raise ValueError(f"event {i}: date must be YYYY-MM-DD")
+            event.update(month=date.month, day=date.day, years=[date.year])
+        _check(isinstance(event.get('month'), int) and isinstance(event.get('day'), int),
+               i, "needs a 'date' or a 'month' and 'day'")
+        event.setdefault('years', None)
+
+        _check(any(effect in event for effect in EFFECTS), i,
+               f"needs at least one effect of {EFFECTS}")
+        for effect in DAY_EFFECTS:
+            spec = event.get(effect)
+            if spec is None:
+                continue
+            _check(int(spec.get('days', 1)) >= 1, i, f"{effect} days must be at least 1")
+        if 'volume' in event:
+            spec = event['volume']
+            _check(spec.get('multiplier', 0) > 0, i, "volume multiplier must be positive")
+            hours = spec.get('hours')
+            _check(hours is None or (len(hours) == 2 and 0 <= hours[0] < hours[1] <= 24), i,
+                   "volume hours must be [start, end) within 0-24")
+        if 'sla' in event:
+            _check(all(metric in event['sla'] for metric in SLA_METRICS), i,
+                   f"sla needs {', '.join(SLA_METRICS)}")
+        if 'deflection' in event:
+            _check(event['deflection'].get('multiplier', -1) >= 0, i,
+                   "deflection multiplier must not be negative")
+        catalog.append(event)
+    return catalog
+
+
+def event_anchor(event: Dict, year: int) -> Optional[datetime]:
+    """Anchor date of an event in a given year, or None if it does not occur."""
+    if event.get('years') and year not in event['years']:
+        return None
+    try:
+        return datetime(year, event['month'], event['day'])
+    except ValueError:  # e.g. Feb 29 in a non-leap year
+        return None
+
+
+def effect_window(event: Dict, effect: str, anchor: datetime) -> Tuple[datetime, datetime]:
+    """(first, last) day of a day effect for one occurrence."""
+    spec = event[effect]
+    first = anchor + timedelta(days=spec.get('offset', 0))
+    return first, first + timedelta(days=spec.get('days', 1) - 1)
+
+
+def effect_windows(event: Dict, effect: str, start_date: datetime,
+                   end_date: datetime) -> Iterator[Tuple[datetime, datetime]]:
+    """Yield the (first, last) days of an event's effect overlapping [start_date, end_date]."""
+    if event.get(effect) is None:
+        return
+    for year in range(start_date.year - 1, end_date.year + 1):
+        anchor = event_anchor(event, year)
+        if anchor is None:
+            continue
+        first, last = effect_window(event, effect, anchor)
+        if last >= start_date and first <= end_date:
+            yield first, last
+
+
+def active_event(events: Sequence[Dict], date: datetime, effect: str,
+                 hour: Optional[int] = None) -> Optional[Dict]:
+    """The first catalog event whose effect covers a day (and hour, if given)."""
+    day = datetime(date.year, date.month, date.day)
+    for event in events:
+        spec = event.get(effect)
+        if spec is None:
+            continue
+        hours = spec.get('hours')
+        if hour is not None and hours is not None and not hours[0] <= hour < hours[1]:
+            continue
+        for year in (date.year - 1, date.year):
+            anchor = event_anchor(event, year)
+            if anchor is None:
+                continue
+            first, last = effect_window(event, effect, anchor)
+            if first <= day <= last:
+                return event
+    return None
+
+
+def event_occurrences(events: Sequence[Dict], start_date: datetime,
+                      end_date: datetime) -> List[Tuple[datetime, Dict]]:
+    """All (anchor date, event) pairs anchored within [start_date, end_date], in date order."""
+    occurrences = []
+    for event in events:
+        for year in range(start_date.year, end_date.year + 1):
+            anchor = event_anchor(event, year)
+            if anchor is not None and start_date <= anchor <= end_date:
+                occurrences.append((anchor, event))
+    return sorted(occurrences, key=lambda item: item[0])
+
+
+def event_masks(events: Sequence[Dict], dates: pd.DatetimeIndex,
+                hours: Sequence[int]) -> Dict[str, Any]:
+    """Every day effect of the catalog over a run of days, as arrays.
+
+    Returns:
+        'volume': (days, hours) volume multipliers (1 outside events);
+        'sla': one (days,) array per SLA_METRICS entry, NaN where no
+        event overrides the metric.
+    """
+    hours = np.asarray(hours)
+    volume = np.ones((len(dates), len(hours)))
+    sla = {metric: np.full(len(dates), np.nan) for metric in SLA_METRICS}
+    if not len(dates):
+        return {'volume': volume, 'sla': sla}
+
+    start, end = dates[0].to_pydatetime(), dates[-1].to_pydatetime()
+    for event in reversed(events):  # Earlier entries are applied last and win
+        for first, last in effect_windows(event, 'volume', start, end):
+            days = (dates >= first) & (dates <= last)
+            window = event['volume'].get('hours')
+            if window is None:
+                volume[days] = event['volume']['multiplier']
+            else:
+                in_hours = (hours >= window[0]) & (hours < window[1])
+                volume[np.ix_(days, in_hours)] = event['volume']['multiplier']
+        for first, last in effect_windows(event, 'sla', start, end):
+            days = (dates >= first) & (dates <= last)
+            for metric in SLA_METRICS:
+                sla[metric][days] = event['sla'][metric]
+    return {'volume': volume, 'sla': sla}
+
+
+def _occurrence_entry(anchor: datetime, event: Dict
+                      ) -> Tuple[Dict[str, Any], Dict[str, Tuple[datetime, datetime]]]:
+    """Index entry of one occurrence and the (first, last) days of its day effects."""
+    windows = {effect: effect_window(event, effect, anchor)
+               for effect in DAY_EFFECTS if effect in event}
+    first = min((w[0] for w in windows.values()), default=anchor)
+    last = max((w[1] for w in windows.values()), default=anchor)
+    return {
+        'date': anchor.strftime('%Y-%m-%d'),
+        'type': event['type'],
+        'label': event['label'],
+        'description': event['description'],
+        'impact': event['impact'],
+        'effects': [effect for effect in EFFECTS if effect in event],
+        'firstDay': first.strftime('%Y-%m-%d'),
+        'lastDay': last.strftime('%Y-%m-%d'),
+    }, windows
+
+
+def anomaly_index(events: Sequence[Dict], start_date: datetime,
+                  end_date: datetime) -> Dict[str, Any]:
+    """The anomaly_index.json document for a history.
+
+    Each event entry adds the window of each effect (volume windows with
+    their multiplier and hours, SLA windows with the metrics, the
+    deflection month with its multiplier). 'byDate' maps every affected
+    day inside the history to the positions of its events in 'events',
+    and 'byType' does the same per event type.
+    """
+    entries, by_date, by_type = [], {}, {}
+    for position, (anchor, event) in enumerate(event_occurrences(events, start_date, end_date)):
+        entry, windows = _occurrence_entry(anchor, event)
+        entry['windows'] = {}
+        for effect, (first, last) in windows.items():
+            spec = {key: value for key, value in event[effect].items()
+                    if key not in ('offset', 'days')}
+            entry['windows'][effect] = {'firstDay': first.strftime('%Y-%m-%d'),
+                                        'lastDay': last.strftime('%Y-%m-%d'), **spec}
+        if 'deflection' in event:
+            entry['windows']['deflection'] = {'month': anchor.strftime('%Y-%m'),
+                                              **event['deflection']}
+        entries.append(entry)
+
+        days = pd.date_range(max(datetime.strptime(entry['firstDay'], '%Y-%m-%d'), start_date),
+                             min(datetime.strptime(entry['lastDay'], '%Y-%m-%d'), end_date))
+        for day in days.strftime('%Y-%m-%d'):
+            by_date.setdefault(day, []).append(position)
+        by_type.setdefault(event['type'], []).append(position)
+
+    return {
+        'startDate': start_date.strftime('%Y-%m-%d'),
+        'endDate': end_date.strftime('%Y-%m-%d'),
+        'events': entries,
+        'byDate': dict(sorted(by_date.items())),
+        'byType': by_type,
+    }
@@ -0,0 +1,188 @@
+"""
+Statistical volume forecasting for the WFM.ai synthetic data generator.
+
+Every volume series (calls, chats, emails and the four contact types, for
+each site) is modelled as a log-linear regression on the same calendar
+features the generator uses to shape volume:
+
+    log(1 + volume) = intercept + trend + weekday + month + hour + calendar events
+
+The features depend only on the date and hour, so all series share one
+design matrix and are fitted together by a single least-squares solve with
+one right-hand side per series; there is no loop over series. Forecasts
+carry prediction intervals from each series' residual spread and the
+leverage of the forecast rows, transformed back from the log scale.
+"""
+
+from statistics import NormalDist
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from intervals import CONTACT_TYPE_COLUMNS, VOLUME_COLUMNS
+
+FORECAST_FILENAME = 'volume_forecast.json'
+FORECAST_MODEL_FILENAME = 'forecast_model.json'
+
+FORECAST_CONFIDENCE = 0.80  # Central coverage of the lower/upper bands
+HOLDOUT_FRACTION = 0.2      # Largest share of the history held out for the backtest
+
+
+class RegressionFit(NamedTuple):
+    """Least-squares fit of many series on one design matrix."""
+    coef: np.ndarray     # (features, series)
+    sigma: np.ndarray    # Residual standard deviation per series, log scale
+    xtx_inv: np.ndarray  # Pseudo-inverse of X'X, for forecast leverage
+    rank: int
+
+
+def volume_grid(records: Iterable[Dict]) -> Tuple[pd.DatetimeIndex, np.ndarray, np.ndarray]:
+    """Pivot volume records into a (days x hours x VOLUME_COLUMNS) array.
+
+    Sub-hourly records are summed into their hour.
+
+    Returns:
+        The dates, the operating hours and the volume array.
+    """
+    dates, hours, values = [], [], []
+    for record in records:
+        dates.append(record['date'])
+        hours.append(record['hour'])
+        values.append([record['calls'], record['chats'], record['emails']]
+                      + [record['contactType'][name] for name in CONTACT_TYPE_COLUMNS])
+    return _pivot_grid(np.array(dates), np.array(hours), np.array(values, dtype=np.int64))
+
+
+def columnar_volume_grid(columns: Dict[str, np.ndarray]
+                         ) -> Tuple[pd.DatetimeIndex, np.ndarray, np.ndarray]:
+    """volume_grid for a columnar volume dataset (see data_writers.read_columnar)."""
+    values = np.stack([np.asarray(columns[name], dtype=np.int64) for name in VOLUME_COLUMNS],
+                      axis=-1)
+    return _pivot_grid(np.asarray(columns['date']).astype('datetime64[D]').astype(str),
+                       np.asarray(columns['hour']), values)
+
+
+def _pivot_grid(dates: np.ndarray, hours: np.ndarray, values: np.ndarray
+                ) -> Tuple[pd.DatetimeIndex, np.ndarray, np.ndarray]:
+    day_labels, day_index = np.unique(dates, return_inverse=True)
+    hour_labels, hour_index = np.unique(hours, return_inverse=True)
+    grid = np.zeros((len(day_labels), len(hour_labels), values.shape[-1]), dtype=np.int64)
+    np.add.at(grid, (day_index, hour_index), values)
+    return pd.DatetimeIndex(day_labels), hour_labels, grid
+
+
+def design_matrix(dates: pd.DatetimeIndex, hours: Sequence[int], origin: pd.Timestamp,
+                  flags: Optional[Dict[str, np.ndarray]] = None) -> Tuple[np.ndarray, List[str]]:
+    """Regression features for every (day, hour) pair, days major.
+
+    Args:
+        dates: Days to describe.
+        hours: Operating hours of each day.
+        origin: Date where the linear trend is zero (the trend is in years).
+        flags: Per-day boolean indicators of calendar events.
+
+    Returns:
+        The (days * hours, features) matrix and the feature names.
+    """
+    flags = flags or {}
+    day_features = [
+        np.ones(len(dates)),
+        ((dates - origin).days.values / 365)[:, None],
+        np.eye(7)[dates.weekday.values][:, 1:],
+        np.eye(12)[dates.month.values - 1][:, 1:],
+        *(np.asarray(mask, dtype=float)[:, None] for mask in flags.values()),
+    ]
+    day_matrix = np.column_stack(day_features)
+    hour_matrix = np.eye(len(hours))[:, 1:]
+
+    matrix = np.hstack([np.repeat(day_matrix, len(hours), axis=0),
+                        np.tile(hour_matrix, (len(dates), 1))])
+    names = (['intercept', 'trend']
+             + [f"weekday{d}" for d in range(1, 7)]
+             + [f"month{m}" for m in range(2, 13)]
+             + list(flags)
+             + [f"hour{h}" for h in list(hours)[1:]])
+    return matrix, names
+
+
+def fit_regression(matrix: np.ndarray, volume: np.ndarray) -> RegressionFit:
+    """Fit log(1 + volume) for all series at once.
+
+    Args:
+        matrix: Design matrix (observations x features).
+        volume: Observed counts (observations x series).
+    """
+    target = np.log1p(volume)
+    coef, _, rank, _ = np.linalg.lstsq(matrix, target, rcond=None)
+    residuals = target - matrix @ coef
+    dof = max(len(matrix) - rank, 1)
+    sigma = np.sqrt((residuals ** 2).sum(axis=0) / dof)
+    return RegressionFit(coef, sigma, np.linalg.pinv(matrix.T @ matrix), int(rank))
+
+
+def predict(fit: RegressionFit, matrix: np.ndarray, confidence: float = FORECAST_CONFIDENCE
+            ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Expected volume and lower/upper prediction bounds for new rows.
+
+    The prediction variance adds each row's leverage under the fitted
+    coefficients to the residual variance. The expected value includes the
+    lognormal mean correction, so daily sums of it are unbiased.
+
+    Returns:
+        Mean, lower and upper volumes (rows x series), all non-negative.
+    """
+    if not 0 < confidence < 1:
+        raise ValueError(f"confidence must be between 0 and 1, got {confidence}")
+    mu = matrix @ fit.coef
+    leverage = np.einsum('ij,jk,ik->i', matrix, fit.xtx_inv, matrix)
+    spread = fit.sigma[None, :] * np.sqrt(1 + leverage)[:, None]
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    mean = np.expm1(mu + spread ** 2 / 2)
+    lower = np.expm1(mu - z * spread)
+    upper = np.expm1(mu + z * spread)
+    return np.maximum(mean, 0), np.maximum(lower, 0), np.maximum(upper, 0)
+
+
+def holdout_wape(matrix: np.ndarray, volume: np.ndarray, holdout_rows: int) -> np.ndarray:
+    """Backtest: refit without the last holdout_rows rows and score them.
+
+    Returns:
+        Weighted absolute percentage error of the held-out rows per series
+        (sum of absolute errors over sum of actuals).
+    """
+    fit = fit_regression(matrix[:-holdout_rows], volume[:-holdout_rows])
+    mean, _, _ = predict(fit, matrix[-holdout_rows:])
+    actual = volume[-holdout_rows:]
+    return np.abs(mean - actual).sum(axis=0) / np.maximum(actual.sum(axis=0), 1)
+
+
+def forecast_records(dates: pd.DatetimeIndex, hours: Sequence[int], mean: np.ndarray,
+                     lower: np.ndarray, upper: np.ndarray) -> Iterator[Dict]:
+    """Forecast records in the historical volume schema, with bands.
+
+    Each array is (days * hours, VOLUME_COLUMNS). The record's counts are
+    the expected volumes; 'lower' and 'upper' hold the band in the same
+    shape as the counts.
+    """
+    def counts(row: List[int]) -> Dict:
+        return {
+            'calls': row[0],
+            'chats': row[1],
+            'emails': row[2],
+            'contactType': dict(zip(CONTACT_TYPE_COLUMNS, row[3:]))
+        }
+
+    mean, lower, upper = (np.rint(values).astype(np.int64).tolist()
+                          for values in (mean, lower, upper))
+    hour_list = [int(hour) for hour in hours]
+    for d, date_str in enumerate(dates.strftime('%Y-%m-%d')):
+        for h, hour in enumerate(hour_list):
+            row = d * len(hour_list) + h
+            yield {
+                'date': date_str,
+                'hour': hour,
+                **counts(mean[row]),
+                'lower': counts(lower[row]),
+                'upper': counts(upper[row])
+            }
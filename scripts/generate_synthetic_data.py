@@ -2,7 +2,8 @@
 """
 WFM.ai Synthetic Contact Center Data Generator
 
-Generates 12 months of realistic contact center data including:
+Generates 12 months (or any configured date range) of realistic contact
+center data including:
 - Hourly contact volumes with realistic patterns
 - AI deflection improvements over time
 - Staffing schedules with PTO/sick time
@@ -14,27 +15,405 @@ Author: Shubbankar Singh
 Date: December 2024
 """
 
+import io
 import json
+import os
+import shutil
 import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 from datetime import datetime, timedelta
 from pathlib import Path
-import random
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Callable, Iterable, Iterator, Optional
 import argparse
 
-# Set random seed for reproducibility
+from aggregation import DailyAggregates, merge_summaries
+from intervals import (INTERVAL_MINUTES, VOLUME_COLUMNS, IntervalVolume, interval_records,
+                       intra_hour_shares, split_counts)
+from ensemble import (ENSEMBLE_BATCH, ENSEMBLE_DIRNAME, ENSEMBLE_FILENAME, ENSEMBLE_QUANTILES,
+                      EnsembleWriter, band_records, quantile_bands)
+from dataset_cache import CACHE_DIRNAME, DATASET_DEPENDENCIES, DatasetCache
+from events import (ANOMALY_INDEX_FILENAME, SLA_METRICS, active_event, anomaly_index,
+                    event_masks, event_occurrences, load_event_catalog,
+                    validate_events)
+from erlang import StaffingTable, erlang_a, service_level, traffic_intensity
+from forecasting import (FORECAST_CONFIDENCE, FORECAST_FILENAME, FORECAST_MODEL_FILENAME,
+                         HOLDOUT_FRACTION, columnar_volume_grid, design_matrix, fit_regression,
+                         forecast_records, holdout_wape, predict, volume_grid)
+from pipeline import DEFAULT_CHUNK_DAYS, DEFAULT_WRITER_THREADS, BlockWriter, batched
+from partitions import (MANIFEST_FILENAME, PARTITION_MODES, iter_records, manifest_last_date,
+                        read_manifest, write_partitioned_records)
+from profiling import PROFILE_REPORT_FILENAME, STAGES as PROFILE_STAGES, StageProfiler
+from random_streams import LegacyRandom, RandomStreams
+from roster import (ROSTER_DIRNAME, STAFFING_MODELS, TRAINING_SHIFT, TRAINING_WEEKDAYS,
+                    AgentRoster, shift_counts)
+from rollups import (ROLLUP_DIRNAME, ROLLUP_FILES, daily_records, hourly_profile,
+                     period_records, read_rollup, write_rollups)
+from scheduling import SCHEDULERS, schedule_shifts
+from sweep import (SAVINGS_SCENARIOS, SWEEP_AXES, SWEEP_FILENAME, SWEEP_WINDOW_DAYS,
+                   HOURS_PER_FTE, parse_axis, savings_scenarios, sweep_table, validate_grid)
+from simulation import INTERVAL_STATS, draw_contacts, simulate_days
+from data_writers import (COLUMNAR_BACKENDS, COMPRESSIONS, DEFAULT_CHUNK_ROWS, JSON_FORMATS,
+                          append_columnar_records,
+                          append_json_records, columnar_filename, last_record_date,
+                          read_columnar, records_filename, resolve_columnar_backend,
+                          write_columnar_records, write_json_document, write_json_records)
+
+# Default random seed for reproducibility
 RANDOM_SEED = 42
-np.random.seed(RANDOM_SEED)
-random.seed(RANDOM_SEED)
+
+# Day of week volume multipliers (0=Monday)
+DOW_MULTIPLIERS = [1.2, 1.2, 1.0, 1.0, 0.9, 0.4, 0.4]  # Mon-Sun
+
+# Monthly volume multipliers
+MONTHLY_MULTIPLIERS = {
+    1: 1.15,  # January high (post-holiday)
+    2: 0.9,   # February dip
+    3: 1.0,   # March normal
+    4: 1.0,   # April steady
+    5: 1.0,   # May steady
+    6: 1.0,   # June steady
+    7: 0.85,  # July summer dip
+    8: 0.85,  # August summer dip
+    9: 1.1,   # September back-to-school spike
+    10: 1.05, # October build
+    11: 1.3,  # November peak
+    12: 1.1   # December mixed
+}
+
+# Hourly volume multipliers with peaks at 10-11am and 2-3pm
+HOURLY_MULTIPLIERS = {
+    8: 0.6,   # 8am - low start
+    9: 0.8,   # 9am - building
+    10: 1.3,  # 10am - morning peak
+    11: 1.2,  # 11am - peak continues
+    12: 1.0,  # 12pm - lunch normal
+    13: 0.9,  # 1pm - lunch dip
+    14: 1.3,  # 2pm - afternoon peak
+    15: 1.2,  # 3pm - peak continues
+    16: 1.0,  # 4pm - normal
+    17: 0.8,  # 5pm - wind down
+    18: 0.7,  # 6pm - evening low
+    19: 0.6,  # 7pm - low
+    20: 0.5   # 8pm - very low
+}
+
+# Volume generation engines
+ENGINES = ('loop', 'vectorized')
+
+# Output formats: JSON files only, or typed columns for the large record datasets
+OUTPUT_FORMATS = ('json', 'columnar')
+
+# How daily SLA is derived: queueing math over hourly load and shift
+# staffing, a discrete-event replay of the generated contacts, or the
+# original linear heuristic (needed to reproduce the original output with
+# --seed-compat)
+SLA_MODELS = ('erlang', 'simulation', 'heuristic')
+
+# Interval-level results of --sla-model simulation
+SLA_INTERVALS_FILENAME = 'sla_intervals.json'
+
+# Date-keyed record datasets split into monthly files by --partition month
+PARTITIONED_DATASETS = ('historical_volume.json', 'staffing_schedules.json',
+                        'sla_performance.json', SLA_INTERVALS_FILENAME)
+
+# Queueing assumptions of the erlang SLA model
+SLA_TARGET = 0.80
+ANSWER_THRESHOLD_SECONDS = 20   # 80/20 service level
+AVG_HANDLE_SECONDS = 360        # 6.0 minutes, as in cost_data handleTime.ourCenter
+CHAT_CONCURRENCY = 2            # Chats an agent handles at once
+ON_QUEUE_SHARE = 0.70           # Working agents on the queue (30% shrinkage, as in calculateStaffingNeeds)
+PATIENCE_SECONDS = 180          # Mean time before a waiting contact abandons
+
+# Column added to volume records in sub-hourly mode (--interval-minutes 15/30)
+INTERVAL_COLUMNS = [
+    ('minute', 'int16', ('minute',)),
+]
+
+# Shift start/end columns added to staffing records when --scheduler plans
+# the shift windows (static schedules keep the configured hours)
+PLANNED_SHIFT_COLUMNS = [
+    ('start', 'int16', ('start',)),
+    ('end', 'int16', ('end',)),
+]
+# Shift planning buffers (--scheduler greedy/milp). The plan sees the nominal
+# handle time and the calendar's expected PTO and sick rates, but the day's
+# handle time varies by up to 5% and absences and training are drawn at
+# random, so demand is grossed up for both.
+PLANNING_AHT_FACTOR = 1.10      # Handle time planned for: two standard deviations of the daily variation
+PLANNING_ABSENCE_MARGIN = 0.05  # Share of scheduled agents kept for random absences
+PLANNING_TRAINING_SEATS = 5     # Most agents training takes off the training shift
+
+# Agent and bot costs (cost_data.json); also the prices of the what-if sweep
+AGENT_AVG_SALARY = 52000
+BENEFITS_LOAD = 0.32            # 32% benefits load
+AI_COST_PER_CONTACT = 0.12
+
+# Agent salaries and headcount by tenure (cost_data byTenure); also the
+# tenure mix of the agent roster in --staffing-model agent
+AGENT_TENURE = [
+    {'years': '0-1', 'avgSalary': 45000, 'count': 28},
+    {'years': '1-3', 'avgSalary': 50000, 'count': 35},
+    {'years': '3-5', 'avgSalary': 56000, 'count': 20},
+    {'years': '5+', 'avgSalary': 62000, 'count': 11}
+]
+
+# Typed column layouts for --format columnar: (column, type, record key path)
+COLUMNAR_SCHEMAS = {
+    'historical_volume.json': [
+        ('date', 'date32', ('date',)),
+        ('hour', 'int16', ('hour',)),
+        ('calls', 'int32', ('calls',)),
+        ('chats', 'int32', ('chats',)),
+        ('emails', 'int32', ('emails',)),
+        ('billing', 'int32', ('contactType', 'billing')),
+        ('technical', 'int32', ('contactType', 'technical')),
+        ('general', 'int32', ('contactType', 'general')),
+        ('sales', 'int32', ('contactType', 'sales')),
+    ],
+    'staffing_schedules.json': [
+        ('date', 'date32', ('date',)),
+        ('shift', 'string', ('shift',)),
+        ('scheduled', 'int32', ('scheduled',)),
+        ('actual', 'int32', ('actual',)),
+        ('ptoCount', 'int32', ('ptoCount',)),
+        ('sickCount', 'int32', ('sickCount',)),
+        ('trainingCount', 'int32', ('trainingCount',)),
+    ],
+}
+
+# Sidecar file recording settings and running aggregates for --append
+STATE_FILENAME = 'generation_state.json'
+
+# Generator attributes a site config entry may override
+SITE_CONFIG_KEYS = ('name', 'base_weekly_volume', 'total_ftes', 'contact_types',
+                    'shifts', 'operating_hours')
+
+# Default generation window (calendar 2024)
+DEFAULT_START_DATE = datetime(2024, 1, 1)
+DEFAULT_END_DATE = datetime(2024, 12, 31)
+
+# Built-in anomaly event catalog (replace it with --events; see events.py for
+# the schema). Each event is anchored on a month/day and recurs every year in
+# the generation window unless 'years' restricts it. Effects are keyed by dataset:
+#   volume     - multiplier applied for 'days' days starting 'offset' days after the anchor
+#   sla        - fixed SLA metrics on the anchor day
+#   deflection - multiplier on the overall deflection rate for the anchor month
+CALENDAR_EVENTS = [
+    {
+        'type': 'outage',
+        'label': 'outage',
+        'description': 'System outage caused 2x volume next day',
+        'impact': 'high',
+        'month': 3, 'day': 15,
+        'years': None,
+        'volume': {'offset': 1, 'days': 1, 'multiplier': 2.0},  # 2x volume the next day
+        'sla': {'actual': 0.45, 'avgWaitTime': 180, 'abandonment': 0.25}
+    },
+    {
+        'type': 'viral',
+        'label': 'viral incident',
+        'description': 'Social media viral incident (3x volume)',
+        'impact': 'high',
+        'month': 6, 'day': 3,
+        'years': None,
+        'volume': {'offset': 0, 'days': 2, 'multiplier': 3.0}
+    },
+    {
+        'type': 'campaign',
+        'label': 'campaign',
+        'description': 'Product launch campaign (+40% volume)',
+        'impact': 'medium',
+        'month': 9, 'day': 1,
+        'years': None,
+        'volume': {'offset': 0, 'days': 7, 'multiplier': 1.4}
+    },
+    {
+        'type': 'bot_failure',
+        'label': 'bot failure',
+        'description': 'Bot failure (deflection dropped to 5%)',
+        'impact': 'medium',
+        'month': 10, 'day': 10,
+        'years': None,
+        'sla': {'actual': 0.60, 'avgWaitTime': 90, 'abandonment': 0.15},
+        'deflection': {'multiplier': 0.3}  # Dramatic drop for the month's average
+    }
+]
+
+# Bot releases, keyed by months since the start of the generation window
+BOT_MILESTONES = {
+    2: "Billing Bot v2 launched - improved invoice queries",
+    7: "FAQ expansion - 200+ new self-service topics"
+}
+
 
 class WFMDataGenerator:
     """Generates realistic contact center data with industry patterns."""
 
-    def __init__(self):
-        """Initialize the data generator with base parameters."""
-        self.start_date = datetime(2024, 1, 1)
-        self.end_date = datetime(2024, 12, 31)
+    def __init__(self, engine: str = 'loop', seed: int = RANDOM_SEED,
+                 seed_compat: bool = False,
+                 start_date: Optional[datetime] = None,
+                 end_date: Optional[datetime] = None,
+                 json_format: str = 'pretty',
+                 output_format: str = 'json',
+                 columnar_backend: str = 'auto',
+                 trend_start: Optional[datetime] = None,
+                 profile: bool = False,
+                 cprofile_stages: Iterable[str] = (),
+                 sla_model: str = 'erlang',
+                 erlang_cache: Optional[Path] = None,
+                 scheduler: str = 'static',
+                 staffing_model: str = 'shift',
+                 sim_workers: int = 1,
+                 interval_minutes: int = 60,
+                 partition: str = 'none',
+                 cache: bool = False,
+                 pipeline: bool = False,
+                 chunk_days: int = DEFAULT_CHUNK_DAYS,
+                 writer_threads: int = DEFAULT_WRITER_THREADS,
+                 compression: str = 'none',
+                 events: Optional[List[Dict[str, Any]]] = None):
+        """Initialize the data generator with base parameters.
+
+        Args:
+            engine: Volume generation engine, 'loop' (per-hour Python loop) or
+                'vectorized' (whole date x hour grid as NumPy arrays).
+            seed: Root seed. Each dataset draws from its own PCG64 substream
+                per day (per month for deflection), derived from this seed.
+            seed_compat: When True every dataset draws from the global
+                ``np.random`` state in one shared sequence. With the
+                heuristic SLA model this reproduces the output of the
+                original generator exactly (both engines).
+            start_date: First day to generate (defaults to 2024-01-01).
+            end_date: Last day to generate, inclusive (defaults to 2024-12-31).
+            json_format: Output style, 'pretty' (indented JSON arrays),
+                'compact' (JSON arrays without whitespace) or 'ndjson'
+                (one record per line in .ndjson files).
+            output_format: 'json', or 'columnar' to write historical volume
+                and staffing as typed columns instead of JSON records.
+            columnar_backend: 'parquet', 'npy', or 'auto' (Parquet when
+                pyarrow is installed, otherwise an .npy bundle).
+            trend_start: Origin of the long-run trends (channel mix shift,
+                deflection ramp, bot milestones); defaults to start_date. Set
+                it to a full run's start date to regenerate any slice of that
+                run bit for bit.
+            profile: Record wall time, CPU time, record counts and allocated
+                bytes per stage and write them to profile_report.json.
+            cprofile_stages: Stages to run under cProfile (implies profile);
+                each is dumped to profile_<stage>.prof in the output directory.
+            sla_model: 'erlang' derives daily SLA, wait and abandonment from
+                Erlang C / Erlang A over hourly load and shift staffing;
+                'simulation' replays the generated calls and chats through a
+                discrete-event queue (see simulation.py) and also writes
+                hourly results to sla_intervals.json; 'heuristic' uses the
+                original linear formula.
+            erlang_cache: .npz file of memoized required-agent solves. It is
+                loaded when present and saved after each run, so repeated runs
+                reuse earlier solves.
+            scheduler: 'static' keeps each shift's configured hours and
+                headcount; 'greedy' or 'milp' re-plans every shift's window
+                and headcount per day to fit hourly Erlang demand within
+                total_ftes (see scheduling.py).
+            staffing_model: 'shift' draws each shift's PTO, sick and
+                training counts directly; 'agent' simulates every agent
+                (tenure, PTO balances, multi-day sick spells), saves the
+                agent x day absence bitmaps to agent_roster/ and derives the
+                shift records from them (see roster.py).
+            sim_workers: Worker processes for the simulation SLA model; days
+                are simulated independently, so results do not depend on it.
+            interval_minutes: Length of volume intervals, 60 (hourly records)
+                or 15/30 (each hour split along an intra-hour arrival shape;
+                records gain a 'minute' field).
+            partition: 'none' writes each record dataset to one file;
+                'month' writes volume, staffing and SLA records to one file
+                per month plus a partitions.json manifest indexing each
+                day's byte span (JSON output only; see partitions.py).
+            cache: Keep a content-hash cache of each dataset's inputs in
+                .cache/ and, on the next cached run, reuse every dataset
+                whose inputs and upstream datasets are unchanged instead of
+                regenerating it (see dataset_cache.py).
+            pipeline: Produce record datasets in blocks of chunk_days days
+                (volume always from the vectorized kernel) and write them
+                through a bounded queue to writer threads, reporting rows/sec
+                (see pipeline.py). Output is identical to a regular run.
+            chunk_days: Days per block of the vectorized volume kernel and
+                the pipeline.
+            writer_threads: Threads encoding and flushing pipeline blocks.
+            compression: 'gzip' writes record datasets as .ndjson.gz
+                (pipeline and NDJSON only); 'none' leaves them uncompressed.
+            events: Anomaly event catalog replacing CALENDAR_EVENTS, e.g.
+                from load_event_catalog (see events.py).
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine '{engine}', expected one of {ENGINES}")
+        self.engine = engine
+        self.seed = seed
+        self.seed_compat = seed_compat
+        self.random = LegacyRandom(seed) if seed_compat else RandomStreams(seed)
+        if json_format not in JSON_FORMATS:
+            raise ValueError(f"Unknown JSON format '{json_format}', expected one of {JSON_FORMATS}")
+        self.json_format = json_format
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format '{output_format}', expected one of {OUTPUT_FORMATS}")
+        self.output_format = output_format
+        if sla_model not in SLA_MODELS:
+            raise ValueError(f"Unknown SLA model '{sla_model}', expected one of {SLA_MODELS}")
+        self.sla_model = sla_model
+        self.staffing_table = StaffingTable()
+        self.erlang_cache = Path(erlang_cache) if erlang_cache else None
+        if self.erlang_cache is not None and self.erlang_cache.exists():
+            self.staffing_table.load(self.erlang_cache)
+        if scheduler not in SCHEDULERS:
+            raise ValueError(f"Unknown scheduler '{scheduler}', expected one of {SCHEDULERS}")
+        self.scheduler = scheduler
+        if staffing_model not in STAFFING_MODELS:
+            raise ValueError(f"Unknown staffing model '{staffing_model}', expected one of {STAFFING_MODELS}")
+        self.staffing_model = staffing_model
+        self.sim_workers = sim_workers
+        if interval_minutes not in INTERVAL_MINUTES:
+            raise ValueError(f"Unknown interval of {interval_minutes} minutes, "
+                             f"expected one of {INTERVAL_MINUTES}")
+        self.interval_minutes = interval_minutes
+        if partition not in PARTITION_MODES:
+            raise ValueError(f"Unknown partition mode '{partition}', expected one of {PARTITION_MODES}")
+        if partition != 'none' and output_format == 'columnar':
+            raise ValueError("Partitioned output requires JSON output, not --format columnar")
+        self.partition = partition
+        self._manifest: Dict[str, Any] = {'datasets': {}}
+        if cache and seed_compat:
+            raise ValueError("The dataset cache requires per-day random streams; "
+                             "--seed-compat draws every dataset from one shared sequence")
+        self.use_cache = cache
+        self.cache: Optional[DatasetCache] = None
+        if chunk_days < 1 or writer_threads < 1:
+            raise ValueError("chunk_days and writer_threads must be at least 1")
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression '{compression}', expected one of {COMPRESSIONS}")
+        if compression != 'none' and not (pipeline and json_format == 'ndjson'):
+            raise ValueError("Compressed output is written by the block pipeline as NDJSON; "
+                             "use --pipeline --json-format ndjson")
+        if pipeline and (partition != 'none' or output_format == 'columnar'):
+            raise ValueError("The block pipeline writes JSON record files; it cannot be "
+                             "combined with --partition or --format columnar")
+        self.pipeline = pipeline
+        self.chunk_days = chunk_days
+        self.writer_threads = writer_threads
+        self.compression = compression
+        # Throughput summaries of the pipeline writes, and the site they belong to
+        self.throughput: List[str] = []
+        self.site_name: Optional[str] = None
+        if pipeline:
+            self.engine = 'vectorized'  # Blocks come from the vectorized kernel
+        self.columnar_backend = (resolve_columnar_backend(columnar_backend)
+                                 if output_format == 'columnar' else None)
+
+        self.start_date = start_date or DEFAULT_START_DATE
+        self.end_date = end_date or DEFAULT_END_DATE
+        if self.end_date < self.start_date:
+            raise ValueError("end_date must not be before start_date")
+        self.trend_start = trend_start or self.start_date
+        self.events = validate_events(CALENDAR_EVENTS if events is None else events)
         self.base_weekly_volume = 15000
         self.total_ftes = 94
 
@@ -60,41 +439,521 @@ class WFMDataGenerator:
         self.output_dir = Path("public/data")
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
+        # Daily totals from the last generate_sla_performance call, reused by
+        # generate_summary_stats for the same volume records
+        self._daily: Optional[DailyAggregates] = None
+        self._daily_source: Optional[List[Dict]] = None
+        self._queueing: Dict[str, int] = {}
+
+        # Per-day shift windows and headcounts chosen by plan_shifts
+        self.shift_plan: Optional[Dict[str, List[Tuple[str, int, int, int]]]] = None
+
+        self.profiler = StageProfiler(profile, cprofile_stages)
+
+    def apply_site_config(self, site: Dict[str, Any]):
+        """Override center parameters from one site config entry.
+
+        Args:
+            site: Mapping with any of SITE_CONFIG_KEYS. ``operating_hours`` is
+                given as ``{"start": 8, "end": 21}`` (end exclusive), and
+                ``contact_types`` must cover billing/technical/general/sales.
+        """
+        unknown = set(site) - set(SITE_CONFIG_KEYS)
+        if unknown:
+            raise ValueError(f"Unknown site config keys: {sorted(unknown)}")
+
+        if 'base_weekly_volume' in site:
+            self.base_weekly_volume = site['base_weekly_volume']
+        if 'total_ftes' in site:
+            self.total_ftes = site['total_ftes']
+        if 'contact_types' in site:
+            if set(site['contact_types']) != set(self.contact_types):
+                raise ValueError(f"contact_types must define exactly {sorted(self.contact_types)}")
+            self.contact_types = dict(site['contact_types'])
+        if 'shifts' in site:
+            self.shifts = {name: dict(shift) for name, shift in site['shifts'].items()}
+        if 'operating_hours' in site:
+            hours = site['operating_hours']
+            self.operating_hours = list(range(hours['start'], hours['end']))
+
     def generate_all_data(self):
-        """Generate all data files for the WFM.ai prototype."""
-        print("🚀 Starting WFM.ai synthetic data generation...")
+        """Generate all data files for the WFM.ai prototype.
 
-        # Generate core datasets
-        volume_data = self.generate_volume_data()
-        deflection_data = self.generate_deflection_history()
-        staffing_data = self.generate_staffing_schedules()
-        sla_data = self.generate_sla_performance(volume_data, staffing_data, deflection_data)
-        cost_data = self.generate_cost_data()
+        Volume, staffing and SLA records are streamed to disk day by day, so
+        only a handful of per-day aggregates are held in memory no matter how
+        many years are generated.
+        """
+        print("🚀 Starting WFM.ai synthetic data generation...")
+        self.profiler.prof_dir = self.output_dir
+        self._manifest = {'datasets': {}}
+        self.cache = DatasetCache(self.output_dir) if self.use_cache else None
+
+        deflection_data, aggregates, daily = self._stream_datasets(append=False)
+        with self.profiler.stage('cost'):
+            if self._cached('cost') is not None:
+                with open(self.output_dir / 'cost_data.json') as f:
+                    cost_data = json.load(f)
+            else:
+                cost_data = self.generate_cost_data()
+                self._cache_store('cost', ['cost_data.json'])
 
         # Generate summary statistics
-        summary_stats = self.generate_summary_stats(volume_data, deflection_data, sla_data)
-
-        # Save all data files
-        self.save_data_files({
-            'historical_volume.json': volume_data,
-            'deflection_history.json': deflection_data,
-            'staffing_schedules.json': staffing_data,
-            'sla_performance.json': sla_data,
-            'cost_data.json': cost_data,
-            'summary_stats.json': summary_stats
-        })
+        with self.profiler.stage('summary'):
+            print("📋 Generating summary statistics...")
+            summary_stats = self._build_summary_stats(aggregates, deflection_data, self.start_date)
+
+        # Save the small in-memory datasets
+        with self.profiler.stage('save'):
+            self.save_data_files({
+                'deflection_history.json': deflection_data,
+                'cost_data.json': cost_data,
+                'summary_stats.json': summary_stats
+            })
+            self._save_state(aggregates, self.start_date)
+            self._save_anomaly_index(self.start_date)
+            self._save_manifest()
+            if self._cached('rollups') is None:
+                self._write_rollups(daily, deflection_data)
+                self._cache_store('rollups', [ROLLUP_DIRNAME])
+            if self.cache is not None:
+                self.cache.save()
+                print(f"♻️  Reused {len(self.cache.reused)} of {len(DATASET_DEPENDENCIES)} "
+                      f"datasets from {CACHE_DIRNAME}/: {', '.join(self.cache.reused) or 'none'}")
+        self._save_erlang_cache()
+        self._save_profile()
+
+        print(f"✅ Data generation complete! Files saved to {self.output_dir}/")
+        return True
 
-        print("✅ Data generation complete! Files saved to public/data/")
+    def append_all_data(self):
+        """Extend existing outputs with only the days after their last date.
+
+        Seed, trend origin, output format and center parameters are restored
+        from the state file written by the previous run, so the appended days
+        are exactly what a full run would have produced. Record files are
+        appended in place and summary statistics are updated from the stored
+        running aggregates instead of rescanning existing records.
+        """
+        print("➕ Appending WFM.ai synthetic data...")
+        self.profiler.prof_dir = self.output_dir
+
+        state_path = self.output_dir / STATE_FILENAME
+        if not state_path.exists():
+            raise FileNotFoundError(f"{state_path} not found; run a full generation first")
+        with open(state_path) as f:
+            state = json.load(f)
+        if state['seedCompat']:
+            raise ValueError("--append requires per-day random streams; "
+                             "the existing data was generated with --seed-compat")
+
+        # Restore the settings of the run being extended
+        self.seed = state['seed']
+        self.random = RandomStreams(self.seed)
+        self.trend_start = datetime.strptime(state['trendStart'], '%Y-%m-%d')
+        self.json_format = state['jsonFormat']
+        self.output_format = state['outputFormat']
+        self.columnar_backend = state['columnarBackend']
+        self.sla_model = state.get('slaModel', 'heuristic')
+        self.scheduler = state.get('scheduler', 'static')
+        self.staffing_model = state.get('staffingModel', 'shift')
+        self.interval_minutes = state.get('intervalMinutes', 60)
+        self.partition = state.get('partition', 'none')
+        self.compression = state.get('compression', 'none')
+        self.events = validate_events(state.get('events', CALENDAR_EVENTS))
+        if self.compression != 'none':
+            self.pipeline = True
+        if self.pipeline and (self.partition != 'none' or self.output_format == 'columnar'):
+            raise ValueError("The existing data is partitioned or columnar; "
+                             "the block pipeline only writes JSON record files")
+        self.apply_site_config(state['site'])
+
+        history_start = datetime.strptime(state['startDate'], '%Y-%m-%d')
+        last_date = datetime.strptime(state['endDate'], '%Y-%m-%d')
+        volume_path = self.output_dir / self._records_path('historical_volume.json')
+        if self.partition != 'none':
+            self._manifest = read_manifest(self.output_dir)
+            volume_end = manifest_last_date(self._manifest, 'historical_volume')
+        else:
+            volume_end = last_record_date(volume_path)
+        if volume_end != state['endDate']:
+            raise ValueError(f"{volume_path} does not end on {state['endDate']} as recorded "
+                             f"in {STATE_FILENAME}; regenerate the full history")
+
+        if self.end_date <= last_date:
+            print(f"   Already up to date through {state['endDate']}")
+            return True
+
+        self.start_date = last_date + timedelta(days=1)
+        print(f"   Generating {self.start_date.strftime('%Y-%m-%d')} to "
+              f"{self.end_date.strftime('%Y-%m-%d')}")
+
+        rollups_present = (self.output_dir / ROLLUP_DIRNAME / ROLLUP_FILES['daily']).exists()
+        previous_deflection = self._read_records('deflection_history.json')
+        deflection_data, aggregates, daily = self._stream_datasets(
+            append=True, previous_deflection=previous_deflection)
+        with self.profiler.stage('summary'):
+            aggregates = merge_summaries(state['aggregates'], aggregates)
+
+            print("📋 Updating summary statistics...")
+            summary_stats = self._build_summary_stats(aggregates, deflection_data, history_start)
+
+        with self.profiler.stage('save'):
+            self.save_data_files({
+                'deflection_history.json': deflection_data,
+                'summary_stats.json': summary_stats
+            })
+            self._save_state(aggregates, history_start)
+            self._save_anomaly_index(history_start)
+            self._save_manifest()
+            if rollups_present:
+                self._write_rollups(daily, deflection_data, append=True)
+            else:
+                print(f"   ⚠️  No {ROLLUP_DIRNAME}/ to extend; regenerate the full history to create it")
+        self._save_erlang_cache()
+        self._save_profile()
+
+        print(f"✅ Append complete! Files updated in {self.output_dir}/")
         return True
 
-    def generate_volume_data(self) -> List[Dict]:
-        """Generate hourly contact volumes with realistic patterns."""
+    def _stream_datasets(self, append: bool,
+                         previous_deflection: Optional[List[Dict]] = None
+                         ) -> Tuple[List[Dict], Dict[str, Any], DailyAggregates]:
+        """Stream volume, staffing and SLA for the window to disk.
+
+        Returns:
+            The deflection history (prefixed by previous_deflection when
+            appending), the running aggregates of the streamed days and
+            their per-day totals.
+        """
+        # Stream hourly volumes, keeping only daily totals
+        daily = DailyAggregates()
+        with self.profiler.stage('volume'):
+            if self._cached('volume') is not None:
+                daily.restore(self.cache.arrays('volume'))
+            else:
+                print("📊 Generating contact volume data...")
+                if self.pipeline:
+                    record_count = self._write_blocks(
+                        'historical_volume.json',
+                        self.profiler.track(self._volume_blocks(daily.add_volume_block)), append)
+                else:
+                    record_count = self._write_records(
+                        'historical_volume.json',
+                        self.profiler.track(self._tally_days(self.iter_volume_days(),
+                                                             daily.add_volume_day)), append)
+                self.profiler.count(record_count)
+                print(f"   Generated {record_count} {self._interval_label()} records")
+                self._cache_store('volume', [self._records_path('historical_volume.json')],
+                                  daily.export(DailyAggregates.VOLUME_STATE))
+
+        with self.profiler.stage('deflection'):
+            if self._cached('deflection') is not None:
+                deflection_data = self._read_records('deflection_history.json')
+            else:
+                deflection_data = self.generate_deflection_history()
+                self._cache_store('deflection', [self._records_path('deflection_history.json')])
+            if previous_deflection:
+                known_months = {d['month'] for d in previous_deflection}
+                deflection_data = previous_deflection + [d for d in deflection_data
+                                                         if d['month'] not in known_months]
+            self.profiler.count(len(deflection_data))
+
+        # Stream staffing, keeping only daily scheduled/actual totals
+        with self.profiler.stage('staffing'):
+            if self._cached('staffing') is not None:
+                daily.restore(self.cache.arrays('staffing'))
+            else:
+                if self.scheduler != 'static':
+                    with self.profiler.generating():
+                        self.plan_shifts(daily, deflection_data)
+                if self.staffing_model == 'shift' and (self.output_dir / ROSTER_DIRNAME).exists():
+                    shutil.rmtree(self.output_dir / ROSTER_DIRNAME)  # Stale agent-model roster
+                print("👥 Generating staffing schedules...")
+                if self.pipeline:
+                    staffing_count = self._write_blocks(
+                        'staffing_schedules.json',
+                        self.profiler.track(self._day_blocks(self.iter_staffing_days(append),
+                                                             daily.add_staffing_day)), append)
+                else:
+                    staffing_count = self._write_records(
+                        'staffing_schedules.json',
+                        self.profiler.track(self._tally_days(self.iter_staffing_days(append),
+                                                             daily.add_staffing_day)), append)
+                self.profiler.count(staffing_count)
+                print(f"   Generated {staffing_count} staffing records")
+                staffing_files = [self._records_path('staffing_schedules.json')]
+                if self.staffing_model == 'agent':
+                    staffing_files.append(ROSTER_DIRNAME)
+                self._cache_store('staffing', staffing_files,
+                                  daily.export(DailyAggregates.STAFFING_STATE))
+
+        # SLA is derived from the daily totals in one vectorized pass
+        with self.profiler.stage('sla'):
+            cached = self._cached('sla')
+            if cached is not None:
+                daily.sla_actual = self.cache.arrays('sla')['slaActual'].tolist()
+                queueing = cached['queueing']
+            else:
+                print("📈 Generating SLA performance data...")
+                with self.profiler.generating():
+                    columns = self._sla_columns(daily, deflection_data)
+                    sla_data = list(self._sla_records(daily.dates, columns))
+                sla_count = self._write_records('sla_performance.json', sla_data, append)
+                self.profiler.count(sla_count)
+                print(f"   Generated {sla_count} daily SLA records")
+                sla_files = [self._records_path('sla_performance.json')]
+                if 'intervalStats' in columns:
+                    interval_count = self._write_records(
+                        SLA_INTERVALS_FILENAME,
+                        self._sla_interval_records(daily.dates, daily.hours,
+                                                   columns['intervalStats']),
+                        append)
+                    print(f"   Generated {interval_count} hourly SLA records")
+                    sla_files.append(self._records_path(SLA_INTERVALS_FILENAME))
+                daily.sla_actual = [r['actual'] for r in sla_data]
+                queueing = self._queueing_aggregates(columns)
+                self._cache_store('sla', sla_files, {'slaActual': daily.sla_actual},
+                                  {'queueing': queueing})
+
+        aggregates = daily.summary(daily.sla_actual)
+        aggregates.update(queueing)
+        return deflection_data, aggregates, daily
+
+    def _dataset_inputs(self, name: str) -> Dict[str, Any]:
+        """Everything besides upstream datasets that a dataset's output depends on.
+
+        The volume engine and simulation worker count are left out: they
+        do not change the output.
+        """
+        window = {
+            'seed': self.seed,
+            'start': self.start_date.strftime('%Y-%m-%d'),
+            'end': self.end_date.strftime('%Y-%m-%d'),
+            'trendStart': self.trend_start.strftime('%Y-%m-%d'),
+        }
+        output = {
+            'jsonFormat': self.json_format,
+            'outputFormat': self.output_format,
+            'columnarBackend': self.columnar_backend,
+            'partition': self.partition,
+            'compression': self.compression,
+        }
+        queueing = {
+            'slaTarget': SLA_TARGET,
+            'answerThreshold': ANSWER_THRESHOLD_SECONDS,
+            'handleSeconds': AVG_HANDLE_SECONDS,
+            'chatConcurrency': CHAT_CONCURRENCY,
+            'onQueueShare': ON_QUEUE_SHARE,
+            'patienceSeconds': PATIENCE_SECONDS,
+            'planningAhtFactor': PLANNING_AHT_FACTOR,
+            'planningAbsenceMargin': PLANNING_ABSENCE_MARGIN,
+            'planningTrainingSeats': PLANNING_TRAINING_SEATS,
+        }
+        if name == 'volume':
+            return {**window, **output,
+                    'baseWeeklyVolume': self.base_weekly_volume,
+                    'operatingHours': self.operating_hours,
+                    'contactTypes': self.contact_types,
+                    'intervalMinutes': self.interval_minutes,
+                    'multipliers': [DOW_MULTIPLIERS, MONTHLY_MULTIPLIERS, HOURLY_MULTIPLIERS],
+                    'events': self.events}
+        if name == 'deflection':
+            return {**window, 'jsonFormat': self.json_format, 'compression': self.compression,
+                    'milestones': BOT_MILESTONES, 'events': self.events}
+        if name == 'cost':
+            return {'jsonFormat': self.json_format}
+        if name == 'rollups':
+            return {'jsonFormat': self.json_format, 'slaTarget': SLA_TARGET}
+        if name == 'staffing':
+            return {**window, **output,
+                    'shifts': self.shifts,
+                    'totalFtes': self.total_ftes,
+                    'scheduler': self.scheduler,
+                    'staffingModel': self.staffing_model,
+                    **({'tenure': AGENT_TENURE} if self.staffing_model == 'agent' else {}),
+                    **(queueing if self.scheduler != 'static' else {})}
+        if name == 'sla':
+            return {**window, **output, **queueing,
+                    'slaModel': self.sla_model,
+                    'operatingHours': self.operating_hours,
+                    'shifts': self.shifts,
+                    'events': self.events}
+        raise ValueError(f"Unknown dataset '{name}', expected one of {tuple(DATASET_DEPENDENCIES)}")
+
+    def _dataset_upstream(self, name: str) -> Tuple[str, ...]:
+        """Datasets a dataset is derived from in this configuration."""
+        if name == 'staffing' and self.scheduler == 'static':
+            return ()  # Configured shifts do not look at demand
+        return DATASET_DEPENDENCIES[name]
+
+    def _cached(self, name: str) -> Optional[Dict[str, Any]]:
+        """Key a dataset and return its cache metadata if it can be reused.
+
+        Partition manifest entries of a reused dataset are restored from the
+        cache, so partitions.json stays complete.
+        """
+        if self.cache is None:
+            return None
+        self.cache.key(name, self._dataset_inputs(name), self._dataset_upstream(name))
+        meta = self.cache.lookup(name)
+        if meta is not None:
+            self._manifest['datasets'].update(meta.get('partitions', {}))
+            print(f"♻️  {name}: inputs unchanged, reusing the cached output")
+        return meta
+
+    def _cache_store(self, name: str, paths: List[str],
+                     arrays: Optional[Dict[str, Any]] = None, meta: Optional[Dict[str, Any]] = None):
+        """Record a freshly generated dataset in the cache (when enabled).
+
+        Args:
+            paths: The dataset's files or directories, relative to the output
+                directory.
+        """
+        if self.cache is None:
+            return
+        partitions = {path: self._manifest['datasets'][path] for path in paths
+                      if path in self._manifest['datasets']}
+        self.cache.store(name, paths, arrays, {**(meta or {}), 'partitions': partitions})
+
+    @staticmethod
+    def _tally_days(days: Iterable[List[Dict]], add_day: Callable[[List[Dict]], None]) -> Iterator[Dict]:
+        """Pass records through while handing each day's records to add_day."""
+        for records in days:
+            add_day(records)
+            yield from records
+
+    def _day_blocks(self, days: Iterable[List[Dict]],
+                    add_day: Callable[[List[Dict]], None]) -> Iterator[List[Dict]]:
+        """Group days of records into pipeline blocks of chunk_days days, tallying each day."""
+        for block in batched(days, self.chunk_days):
+            for records in block:
+                add_day(records)
+            yield [record for records in block for record in records]
+
+    def _volume_blocks(self, add_block: Callable[[IntervalVolume], None]) -> Iterator[IntervalVolume]:
+        """Volume of each pipeline block of chunk_days days as arrays, tallying each block.
+
+        Blocks hold the same records as iter_volume_days, but stay as count
+        arrays all the way to the writer threads, which format them directly.
+        """
+        if self.interval_minutes == 60:
+            for dates, hours, columns in self._volume_grid_blocks():
+                block = IntervalVolume(dates.strftime('%Y-%m-%d').tolist(), hours, None,
+                                       {name: columns[name].astype(np.int64)
+                                        for name in VOLUME_COLUMNS})
+                add_block(block)
+                yield block
+            return
+
+        for days in batched(self._iter_interval_days(), self.chunk_days):
+            _, hours, minutes, _ = days[0]
+            block = IntervalVolume([date_str for date_str, _, _, _ in days], hours, minutes,
+                                   {name: np.stack([columns[name] for _, _, _, columns in days])
+                                    for name in VOLUME_COLUMNS})
+            add_block(block)
+            yield block
+
+    def generate_volume_data(self, interval_minutes: Optional[int] = None) -> List[Dict]:
+        """Generate hourly contact volumes with realistic patterns.
+
+        Args:
+            interval_minutes: Overrides the generator's interval length. For
+                15 or 30 minutes the result is an IntervalVolume, a compact
+                array-backed sequence of interval records.
+        """
+        if interval_minutes is not None and interval_minutes != self.interval_minutes:
+            previous, self.interval_minutes = self.interval_minutes, interval_minutes
+            try:
+                return self.generate_volume_data()
+            finally:
+                self.interval_minutes = previous
+
         print("📊 Generating contact volume data...")
 
-        volume_data = []
+        if self.interval_minutes == 60:
+            volume_data = [record for day in self.iter_volume_days() for record in day]
+        else:
+            volume_data = self._interval_volume()
+
+        print(f"   Generated {len(volume_data)} {self._interval_label()} records")
+        return volume_data
+
+    def _interval_label(self) -> str:
+        return 'hourly' if self.interval_minutes == 60 else f"{self.interval_minutes}-minute"
+
+    def iter_volume_days(self) -> Iterator[List[Dict]]:
+        """Yield each day's volume records in date order.
+
+        Records are hourly, or per 15/30-minute interval (with a 'minute'
+        field) when interval_minutes is below 60.
+        """
+        if self.interval_minutes != 60:
+            for date_str, hours, minutes, columns in self._iter_interval_days():
+                yield interval_records(date_str, hours, minutes, columns)
+            return
+        yield from self._iter_hourly_days()
+
+    def _interval_volume(self) -> IntervalVolume:
+        """Sub-hourly volume for the whole window as int32 arrays."""
+        dates, rows = [], {name: [] for name in VOLUME_COLUMNS}
+        hours = minutes = np.zeros(0, dtype=np.int64)
+        for date_str, hours, minutes, columns in self._iter_interval_days():
+            dates.append(date_str)
+            for name in VOLUME_COLUMNS:
+                rows[name].append(columns[name].astype(np.int32))
+        return IntervalVolume(dates, hours, minutes, {
+            name: (np.stack(rows[name]) if rows[name]
+                   else np.zeros((0, len(hours)), dtype=np.int32))
+            for name in VOLUME_COLUMNS})
+
+    def _iter_interval_days(self) -> Iterator[Tuple[str, np.ndarray, np.ndarray,
+                                                   Dict[str, np.ndarray]]]:
+        """Yield each day's sub-hourly counts as arrays.
+
+        Hourly counts come from the configured engine. Each hour is split
+        along the intra-hour shape with draws from the day's 'interval'
+        stream, so interval counts add up to the hourly records.
+
+        Yields:
+            Date string, hour and minute of each interval, and one count
+            array per VOLUME_COLUMNS entry.
+        """
+        shares = intra_hour_shares(self.interval_minutes)
+        per_hour = len(shares)
+        hours = np.repeat(self.operating_hours, per_hour)
+        minutes = np.tile(np.arange(per_hour) * self.interval_minutes, len(self.operating_hours))
+
+        for date_str, hourly in self._iter_hourly_columns():
+            rng = self.random.day('interval', datetime.strptime(date_str, '%Y-%m-%d'))
+            counts = np.stack([hourly[name] for name in VOLUME_COLUMNS])
+            split = split_counts(rng, counts, shares).reshape(len(VOLUME_COLUMNS), -1)
+            yield date_str, hours, minutes, dict(zip(VOLUME_COLUMNS, split))
+
+    def _iter_hourly_columns(self) -> Iterator[Tuple[str, Dict[str, np.ndarray]]]:
+        """Yield each day's hourly counts as one array per VOLUME_COLUMNS entry."""
+        if self.engine == 'vectorized':
+            for dates, _, columns in self._volume_grid_blocks():
+                columns = {name: columns[name].astype(np.int64) for name in VOLUME_COLUMNS}
+                for d, date_str in enumerate(dates.strftime('%Y-%m-%d')):
+                    yield date_str, {name: column[d] for name, column in columns.items()}
+            return
+
+        for records in self._iter_hourly_days():
+            yield records[0]['date'], {
+                name: np.array([r[name] if name in r else r['contactType'][name]
+                                for r in records], dtype=np.int64)
+                for name in VOLUME_COLUMNS}
+
+    def _iter_hourly_days(self) -> Iterator[List[Dict]]:
+        """Yield each day's hourly volume records in date order."""
+        if self.engine == 'vectorized':
+            yield from self._iter_volume_days_vectorized()
+            return
 
         for date in pd.date_range(self.start_date, self.end_date):
             daily_multiplier = self._get_daily_multiplier(date)
+            rng = self.random.day('volume', date)
+            day_records = []
 
             for hour in self.operating_hours:
                 hourly_multiplier = self._get_hourly_multiplier(hour)
@@ -104,7 +963,7 @@ class WFMDataGenerator:
                 volume = base_hourly * daily_multiplier * hourly_multiplier
 
                 # Add realistic noise (±15%)
-                noise_factor = np.random.normal(1.0, 0.15)
+                noise_factor = rng.normal(1.0, 0.15)
                 volume = max(int(volume * noise_factor), 1)
 
                 # Apply anomalies
@@ -114,7 +973,7 @@ class WFMDataGenerator:
                 contacts = self._split_by_contact_type(volume, date)
                 type_contacts = self._distribute_contact_types(contacts, date)
 
-                volume_data.append({
+                day_records.append({
                     'date': date.strftime('%Y-%m-%d'),
                     'hour': hour,
                     'calls': contacts['calls'],
@@ -123,32 +982,148 @@ class WFMDataGenerator:
                     'contactType': type_contacts
                 })
 
-        print(f"   Generated {len(volume_data)} hourly records")
-        return volume_data
+            yield day_records
+
+    def _iter_volume_days_vectorized(self) -> Iterator[List[Dict]]:
+        """Yield each day's records from the vectorized volume grid.
+
+        The grid is computed in blocks of chunk_days days as a few compact
+        arrays; dict records are only materialized one day at a time.
+        """
+        for dates, hours, columns in self._volume_grid_blocks():
+            columns = {k: v.astype(np.int64).tolist() for k, v in columns.items()}
+            yield from self._grid_day_records(dates, hours.tolist(), columns)
+
+    @staticmethod
+    def _grid_day_records(dates: pd.DatetimeIndex, hour_list: List[int],
+                          columns: Dict[str, List[List[int]]]) -> Iterator[List[Dict]]:
+        """Dict records of each day of a volume grid block."""
+        for d, date_str in enumerate(dates.strftime('%Y-%m-%d')):
+            yield [
+                {
+                    'date': date_str,
+                    'hour': hour,
+                    'calls': columns['calls'][d][h],
+                    'chats': columns['chats'][d][h],
+                    'emails': columns['emails'][d][h],
+                    'contactType': {
+                        'billing': columns['billing'][d][h],
+                        'technical': columns['technical'][d][h],
+                        'general': columns['general'][d][h],
+                        'sales': columns['sales'][d][h]
+                    }
+                }
+                for h, hour in enumerate(hour_list)
+            ]
+
+    def _volume_grid_blocks(self) -> Iterator[Tuple[pd.DatetimeIndex, np.ndarray, Dict[str, np.ndarray]]]:
+        """Run the vectorized volume kernel over the window in blocks of chunk_days days.
+
+        Every day draws from its own stream (or, with --seed-compat, the next
+        numbers of the shared sequence, in date order), so the blocks join up
+        to exactly the whole-window grid.
+        """
+        first = self.start_date
+        while first <= self.end_date:
+            last = min(first + timedelta(days=self.chunk_days - 1), self.end_date)
+            yield self._volume_grid(window=(first, last))
+            first = last + timedelta(days=1)
+
+    def _volume_grid(self, noise: Optional[np.ndarray] = None,
+                     window: Optional[Tuple[datetime, datetime]] = None
+                     ) -> Tuple[pd.DatetimeIndex, np.ndarray, Dict[str, np.ndarray]]:
+        """Generate hourly volumes for the whole date x hour grid at once.
+
+        Mirrors the loop engine step for step with array operations: the
+        multipliers come from lookup tables indexed by weekday, month and
+        hour, noise is drawn in a single batch, and anomalies and both splits
+        are applied as masks. Every float operation is performed in the same
+        order as the scalar code and the noise comes from the same streams,
+        so the result is bit-identical to the loop engine.
+
+        Args:
+            noise: Noise factors to use instead of the day streams, shaped
+                (..., days, hours). Leading axes (e.g. ensemble members) carry
+                through to every returned column.
+            window: (first, last) days to generate instead of the whole
+                generation window.
+        """
+        window = window or (self.start_date, self.end_date)
+        dates = pd.date_range(*window)
+        weekday = dates.weekday.values
+        month = dates.month.values
+        day = dates.day.values
+        hours = np.array(self.operating_hours)
+
+        # Lookup tables indexed by weekday, month and hour
+        dow_table = np.array(DOW_MULTIPLIERS)
+        month_table = np.array([1.0] + [MONTHLY_MULTIPLIERS[m] for m in range(1, 13)])
+        hour_table = np.array([HOURLY_MULTIPLIERS.get(h, 1.0) for h in range(24)])
+
+        # Daily multiplier with Black Friday week and Christmas week events
+        month_mult = month_table[month]
+        month_mult = np.where((month == 11) & (day >= 22) & (day <= 29), month_mult * 1.4, month_mult)
+        month_mult = np.where((month == 12) & (day >= 23) & (day <= 26), month_mult * 0.3, month_mult)
+        daily_mult = dow_table[weekday] * month_mult
+
+        base_hourly = (self.base_weekly_volume / 7 / len(self.operating_hours))
+        volume = base_hourly * daily_mult[:, None] * hour_table[hours][None, :]
+
+        # Batched noise (±15%): one draw for the whole grid from the shared
+        # legacy sequence, or one row per day from that day's substream
+        if noise is None:
+            noise = self.random.daily_normal('volume', dates, 1.0, 0.15, size=len(hours))
+        volume = np.maximum(np.trunc(volume * noise), 1)
+
+        # Anomalies as a day x hour multiplier mask (earlier catalog entries win on overlap)
+        volume = np.trunc(volume * event_masks(self.events, dates, hours)['volume'])
+
+        # Channel split (chats growing over the year)
+        progress = ((dates - self.trend_start).days.values / 365)[:, None]
+        calls = np.trunc(volume * (0.60 - (progress * 0.05)))
+        chats = np.trunc(volume * (0.30 + (progress * 0.05)))
+        emails = volume - calls - chats
+        total = calls + chats + emails
+
+        # Contact type split with seasonal and end-of-month adjustments
+        billing_pct = np.full(len(dates), self.contact_types['billing'])
+        technical_pct = np.full(len(dates), self.contact_types['technical'])
+        general_pct = np.full(len(dates), self.contact_types['general'])
+        sales_pct = np.full(len(dates), self.contact_types['sales'])
+
+        january = month == 1
+        summer = (month == 7) | (month == 8)
+        q4 = (month == 11) | (month == 12)
+        billing_pct[january] += 0.05
+        general_pct[january] -= 0.05
+        general_pct[summer] -= 0.03
+        technical_pct[summer] += 0.03
+        sales_pct[q4] += 0.05
+        general_pct[q4] -= 0.05
+
+        month_end = day >= 25
+        billing_pct[month_end] += 0.08
+        general_pct[month_end] -= 0.08
+
+        columns = {
+            'calls': calls,
+            'chats': chats,
+            'emails': emails,
+            'billing': np.trunc(total * billing_pct[:, None]),
+            'technical': np.trunc(total * technical_pct[:, None]),
+            'general': np.trunc(total * general_pct[:, None]),
+            'sales': np.trunc(total * sales_pct[:, None]),
+        }
+        return dates, hours, columns
 
     def _get_daily_multiplier(self, date: datetime) -> float:
         """Calculate daily volume multiplier based on day of week and month."""
         # Day of week patterns (0=Monday)
-        dow_multipliers = [1.2, 1.2, 1.0, 1.0, 0.9, 0.4, 0.4]  # Mon-Sun
-        dow_mult = dow_multipliers[date.weekday()]
+        dow_mult = DOW_MULTIPLIERS[date.weekday()]
 
         # Monthly patterns
         month = date.month
-        monthly_multipliers = {
-            1: 1.15,  # January high (post-holiday)
-            2: 0.9,   # February dip
-            3: 1.0,   # March normal
-            4: 1.0,   # April steady
-            5: 1.0,   # May steady
-            6: 1.0,   # June steady
-            7: 0.85,  # July summer dip
-            8: 0.85,  # August summer dip
-            9: 1.1,   # September back-to-school spike
-            10: 1.05, # October build
-            11: 1.3,  # November peak
-            12: 1.1   # December mixed
-        }
-        month_mult = monthly_multipliers[month]
+        month_mult = MONTHLY_MULTIPLIERS[month]
 
         # Black Friday week boost (last week of November)
         if month == 11 and date.day >= 22 and date.day <= 29:
@@ -162,39 +1137,15 @@ class WFMDataGenerator:
 
     def _get_hourly_multiplier(self, hour: int) -> float:
         """Get hourly volume multiplier with peak at 10-11am and 2-3pm."""
-        # Define hourly patterns
-        hourly_patterns = {
-            8: 0.6,   # 8am - low start
-            9: 0.8,   # 9am - building
-            10: 1.3,  # 10am - morning peak
-            11: 1.2,  # 11am - peak continues
-            12: 1.0,  # 12pm - lunch normal
-            13: 0.9,  # 1pm - lunch dip
-            14: 1.3,  # 2pm - afternoon peak
-            15: 1.2,  # 3pm - peak continues
-            16: 1.0,  # 4pm - normal
-            17: 0.8,  # 5pm - wind down
-            18: 0.7,  # 6pm - evening low
-            19: 0.6,  # 7pm - low
-            20: 0.5   # 8pm - very low
-        }
-        return hourly_patterns.get(hour, 1.0)
+        return HOURLY_MULTIPLIERS.get(hour, 1.0)
 
     def _apply_anomalies(self, date: datetime, hour: int, volume: int) -> int:
         """Apply realistic anomalies to make data interesting."""
-        # Major system outage - March 15, 2x volume on March 16
-        if date.month == 3 and date.day == 16:
-            return int(volume * 2.0)
-
-        # Viral social media moment - June 3-4, 3x volume
-        if date.month == 6 and (date.day == 3 or date.day == 4):
-            return int(volume * 3.0)
+        event = active_event(self.events, date, 'volume', hour)
+        if event is not None:
+            return int(volume * event['volume']['multiplier'])
 
-        # Product launch campaign - September 1-7, +40% volume
-        if date.month == 9 and 1 <= date.day <= 7:
-            return int(volume * 1.4)
-
-        # Bot failure - October 10, normal volume (deflection will be low)
+        # Bot failure - normal volume (deflection will be low)
         # No volume change here, handled in deflection data
 
         return volume
@@ -203,7 +1154,7 @@ class WFMDataGenerator:
         """Split volume into calls, chats, emails."""
         # Base distribution: 60% calls, 30% chats, 10% emails
         # Chats increasing over time, emails steady
-        progress = (date - self.start_date).days / 365
+        progress = (date - self.trend_start).days / 365
 
         calls_pct = 0.60 - (progress * 0.05)  # Slightly decreasing
         chats_pct = 0.30 + (progress * 0.05)  # Slightly increasing
@@ -223,10 +1174,10 @@ class WFMDataGenerator:
         month = date.month
 
         # Base distributions
-        billing_pct = 0.35
-        technical_pct = 0.30
-        general_pct = 0.25
-        sales_pct = 0.10
+        billing_pct = self.contact_types['billing']
+        technical_pct = self.contact_types['technical']
+        general_pct = self.contact_types['general']
+        sales_pct = self.contact_types['sales']
 
         # Seasonal adjustments
         if month == 1:  # January - high billing (post-holiday)
@@ -257,16 +1208,27 @@ class WFMDataGenerator:
 
         deflection_data = []
 
-        # Track monthly deflection rates
-        for month in range(1, 13):
-            date_str = f"2024-{month:02d}"
+        # Bot failures depress the average of the month they occur in
+        incidents = {anchor.strftime('%Y-%m'): (anchor, event)
+                     for anchor, event in event_occurrences(self.events, self.start_date,
+                                                            self.end_date)
+                     if 'deflection' in event}
 
-            # Overall deflection improvement: 18% -> 27% over year
-            progress = (month - 1) / 11  # 0 to 1 over the year
+        # Track monthly deflection rates
+        months = pd.period_range(self.start_date, self.end_date, freq='M')
+        for period in months:
+            date_str = period.strftime('%Y-%m')
+            month_index = ((period.year - self.trend_start.year) * 12
+                           + period.month - self.trend_start.month)
+
+            # Overall deflection improvement: 18% -> 27% over the first year,
+            # then held at the caps below
+            progress = month_index / 11  # 0 to 1 over the first year
             base_rate = 0.18 + (0.09 * progress)
 
             # Add some realistic month-to-month variation
-            monthly_variation = np.random.normal(0, 0.01)
+            rng = self.random.month('deflection', period.year, period.month)
+            monthly_variation = rng.normal(0, 0.01)
             overall_rate = max(0.15, min(0.30, base_rate + monthly_variation))
 
             # By contact type deflection at year end:
@@ -280,15 +1242,12 @@ class WFMDataGenerator:
             }
 
             # Bot updates/launches
-            bot_updates = None
-            if month == 3:
-                bot_updates = "Billing Bot v2 launched - improved invoice queries"
-            elif month == 8:
-                bot_updates = "FAQ expansion - 200+ new self-service topics"
-            elif month == 10:
-                # Bot failure day (October 10th)
-                overall_rate *= 0.3  # Dramatic drop for this month's average
-                bot_updates = "System incident on Oct 10 - bot performance restored"
+            bot_updates = BOT_MILESTONES.get(month_index)
+            if date_str in incidents:
+                anchor, event = incidents[date_str]
+                overall_rate *= event['deflection']['multiplier']
+                bot_updates = (f"System incident on {anchor.strftime('%b')} {anchor.day}"
+                               " - bot performance restored")
 
             deflection_data.append({
                 'month': date_str,
@@ -297,40 +1256,185 @@ class WFMDataGenerator:
                 'botUpdates': bot_updates
             })
 
-        print(f"   Generated 12 months of deflection history")
+        print(f"   Generated {len(deflection_data)} months of deflection history")
         return deflection_data
 
-    def generate_staffing_schedules(self) -> List[Dict]:
-        """Generate realistic staffing schedules with PTO, sick time, training."""
+    def generate_staffing_schedules(self, volume_data: Optional[List[Dict]] = None,
+                                    deflection_data: Optional[List[Dict]] = None) -> List[Dict]:
+        """Generate realistic staffing schedules with PTO, sick time, training.
+
+        Args:
+            volume_data: Hourly volume records; needed to plan shifts when a
+                scheduler other than 'static' is configured.
+            deflection_data: Monthly deflection history, likewise.
+        """
+        if self.scheduler != 'static' and self.shift_plan is None:
+            if volume_data is None or deflection_data is None:
+                raise ValueError(f"The '{self.scheduler}' scheduler needs volume_data and "
+                                 "deflection_data to plan shifts")
+            self.plan_shifts(DailyAggregates.from_records(volume_data), deflection_data)
+
         print("👥 Generating staffing schedules...")
 
-        staffing_data = []
+        staffing_data = [record for day in self.iter_staffing_days() for record in day]
+
+        print(f"   Generated {len(staffing_data)} staffing records")
+        return staffing_data
 
+    def plan_shifts(self, daily: DailyAggregates, deflection_data: List[Dict]):
+        """Choose each day's shift windows and headcounts from hourly demand.
+
+        Demand is the Erlang C agent requirement for the hour's offered load
+        at the planning handle time, grossed up for time off the queue, the
+        day's expected PTO and sick rates and the planning absence margin.
+        The milp scheduler solves patterns once per weekday. On training
+        days the training shift gets extra seats for its trainees, within
+        the headcount cap. The plan is stored in ``shift_plan`` and used by
+        iter_staffing_days.
+        """
+        dates = pd.to_datetime(daily.dates)
+        offered = self._offered_load(daily, self._deflection_rates(dates, deflection_data))
+        required = self.staffing_table.required_agents(
+            offered, AVG_HANDLE_SECONDS * PLANNING_AHT_FACTOR, SLA_TARGET, ANSWER_THRESHOLD_SECONDS)
+        available = 1 - self._expected_absence_rates(dates) - PLANNING_ABSENCE_MARGIN
+        demand = required / (ON_QUEUE_SHARE * available)[:, None]
+
+        print(f"🗓️  Planning shifts ({self.scheduler})...")
+        plan = schedule_shifts(demand, self.shifts, daily.hours, self.total_ftes, self.scheduler,
+                               day_types=dates.weekday.values)
+
+        for date, shifts in zip(dates, plan):
+            if date.weekday() not in TRAINING_WEEKDAYS:
+                continue
+            spare = self.total_ftes - sum(count for *_, count in shifts)
+            for index, (name, start, end, count) in enumerate(shifts):
+                if name == TRAINING_SHIFT and count:
+                    shifts[index] = (name, start, end, count + min(PLANNING_TRAINING_SEATS, spare))
+        self.shift_plan = dict(zip(daily.dates, plan))
+
+    def iter_staffing_days(self, append: bool = False) -> Iterator[List[Dict]]:
+        """Yield each day's per-shift staffing records in date order.
+
+        With a shift plan, each record carries the planned headcount and the
+        shift's 'start' and 'end' hours for that day.
+
+        Args:
+            append: With the agent staffing model, continue the saved roster
+                in agent_roster/ instead of hiring a new one.
+        """
+        if self.staffing_model == 'agent':
+            yield from self._iter_roster_days(append)
+            return
         for date in pd.date_range(self.start_date, self.end_date):
-            for shift_name, shift_info in self.shifts.items():
-                scheduled = shift_info['agents']
+            rng = self.random.day('staffing', date)
+            date_str = date.strftime('%Y-%m-%d')
+            planned = self.shift_plan[date_str] if self.shift_plan is not None else None
+            shifts = planned or self._static_shifts()
+            day_records = []
+            for shift_name, start, end, scheduled in shifts:
 
                 # Calculate absences
-                pto_count = self._calculate_pto(date, scheduled)
-                sick_count = self._calculate_sick_leave(date, scheduled)
-                training_count = self._calculate_training(date, shift_name)
+                pto_count = self._calculate_pto(date, scheduled, rng)
+                sick_count = self._calculate_sick_leave(date, scheduled, rng)
+                training_count = self._calculate_training(date, shift_name, rng)
 
                 actual = scheduled - pto_count - sick_count - training_count
 
-                staffing_data.append({
-                    'date': date.strftime('%Y-%m-%d'),
+                record = {
+                    'date': date_str,
                     'shift': shift_name,
                     'scheduled': scheduled,
                     'actual': max(actual, 0),  # Can't go negative
                     'ptoCount': pto_count,
                     'sickCount': sick_count,
                     'trainingCount': training_count
-                })
-
-        print(f"   Generated {len(staffing_data)} staffing records")
-        return staffing_data
-
-    def _calculate_pto(self, date: datetime, scheduled: int) -> int:
+                }
+                if planned:
+                    record['start'] = start
+                    record['end'] = end
+                day_records.append(record)
+
+            yield day_records
+
+    def _static_shifts(self) -> List[Tuple[str, int, int, int]]:
+        """(name, start, end, agents) of each configured shift."""
+        return [(name, info['start'], info['end'], info['agents'])
+                for name, info in self.shifts.items()]
+
+    def _iter_roster_days(self, append: bool) -> Iterator[List[Dict]]:
+        """Staffing records reduced from a simulated agent roster.
+
+        The roster is hired at trend_start and simulated from there, so a
+        slice regenerated with the full run's trend_start matches it. Each
+        day's shifts take consecutive slices of the roster.
+        """
+        dates = pd.date_range(self.start_date, self.end_date)
+        date_strs = list(dates.strftime('%Y-%m-%d'))
+        days = [self.shift_plan[d] if self.shift_plan is not None else self._static_shifts()
+                for d in date_strs]
+        shift_names = [shift[0] for shift in days[0]]
+        headcount = np.array([[shift[3] for shift in day] for day in days], dtype=np.int64)
+        bounds = np.zeros((len(days), len(shift_names) + 1), dtype=np.int64)
+        np.cumsum(headcount, axis=1, out=bounds[:, 1:])
+
+        def day_rng(date):
+            return self.random.day('roster', date)
+
+        directory = self.output_dir / ROSTER_DIRNAME
+        if append:
+            roster = AgentRoster.load(directory)
+            if roster.last_date != self.start_date - timedelta(days=1):
+                raise ValueError(f"{directory} does not end the day before "
+                                 f"{date_strs[0]}; regenerate the full history")
+        else:
+            home_counts = [info['agents'] for info in self.shifts.values()]
+            roster = AgentRoster.hire(home_counts, max(self.total_ftes, sum(home_counts)),
+                                      AGENT_TENURE, self.trend_start,
+                                      self.random.initial('roster', self.trend_start))
+            roster.advance(pd.date_range(self.trend_start, self.start_date - timedelta(days=1)),
+                           day_rng)
+        agents = len(roster.agents)
+        if bounds[:, -1].max() > agents:
+            raise ValueError(f"Shifts schedule up to {bounds[:, -1].max()} agents but the "
+                             f"roster has {agents}")
+
+        roster.run(dates, bounds, shift_names, day_rng)
+        roster.save(directory, shift_names, append)
+        bitmaps = roster.bitmaps()
+        pto, sick, training = (shift_counts(bitmaps[name], bounds, agents)
+                               for name in ('pto', 'sick', 'training'))
+        print(f"   Simulated {agents} agents; saved absence bitmaps to {ROSTER_DIRNAME}/")
+
+        for d, date_str in enumerate(date_strs):
+            day_records = []
+            for s, (shift_name, start, end, scheduled) in enumerate(days[d]):
+                record = {
+                    'date': date_str,
+                    'shift': shift_name,
+                    'scheduled': scheduled,
+                    'actual': int(scheduled - pto[d, s] - sick[d, s] - training[d, s]),
+                    'ptoCount': int(pto[d, s]),
+                    'sickCount': int(sick[d, s]),
+                    'trainingCount': int(training[d, s])
+                }
+                if self.shift_plan is not None:
+                    record['start'] = start
+                    record['end'] = end
+                day_records.append(record)
+            yield day_records
+
+    @staticmethod
+    def _expected_absence_rates(dates: pd.DatetimeIndex) -> np.ndarray:
+        """Mean PTO + sick leave share per day, as drawn by _calculate_pto and
+        _calculate_sick_leave."""
+        month, day = dates.month.values, dates.day.values
+        pto = np.select([np.isin(month, [7, 8]), (month == 12) & (day >= 20), month == 12],
+                        [0.08, 0.15, 0.05], 0.03)
+        pto = np.where(dates.weekday.values >= 5, pto * 0.5, pto)
+        sick = np.where(np.isin(month, [12, 1, 2, 3]), 0.04 * 1.3, 0.04)
+        return pto + sick
+
+    def _calculate_pto(self, date: datetime, scheduled: int, rng) -> int:
         """Calculate PTO based on seasonal patterns."""
         month = date.month
 
@@ -348,23 +1452,23 @@ class WFMDataGenerator:
         if date.weekday() >= 5:
             pto_rate *= 0.5
 
-        return np.random.binomial(scheduled, pto_rate)
+        return int(rng.binomial(scheduled, pto_rate))
 
-    def _calculate_sick_leave(self, date: datetime, scheduled: int) -> int:
+    def _calculate_sick_leave(self, date: datetime, scheduled: int, rng) -> int:
         """Calculate sick leave (random 3-5% daily)."""
-        sick_rate = np.random.uniform(0.03, 0.05)
+        sick_rate = rng.uniform(0.03, 0.05)
 
         # Higher in winter months (flu season)
         if date.month in [12, 1, 2, 3]:
             sick_rate *= 1.3
 
-        return np.random.binomial(scheduled, sick_rate)
+        return int(rng.binomial(scheduled, sick_rate))
 
-    def _calculate_training(self, date: datetime, shift_name: str) -> int:
+    def _calculate_training(self, date: datetime, shift_name: str, rng) -> int:
         """Calculate training time (Tuesday/Thursday afternoons)."""
         # Training mostly on Tuesday/Thursday midday shift
         if date.weekday() in [1, 3] and shift_name == 'midday':
-            return np.random.randint(2, 6)  # 2-5 people in training
+            return int(rng.integers(2, 6))  # 2-5 people in training
         return 0
 
     def generate_sla_performance(self, volume_data: List[Dict],
@@ -373,87 +1477,255 @@ class WFMDataGenerator:
         """Generate daily SLA performance based on staffing and volume."""
         print("📈 Generating SLA performance data...")
 
-        sla_data = []
-
-        # Group staffing by date
-        daily_staffing = {}
-        for record in staffing_data:
-            date = record['date']
-            if date not in daily_staffing:
-                daily_staffing[date] = {}
-            daily_staffing[date][record['shift']] = record
-
-        # Group volume by date
-        daily_volumes = {}
-        for record in volume_data:
-            date = record['date']
-            if date not in daily_volumes:
-                daily_volumes[date] = 0
-            daily_volumes[date] += record['calls'] + record['chats'] + record['emails']
-
-        # Get monthly deflection rates
+        # Aggregate volume and staffing by date once; summary stats reuse it
+        self._daily = DailyAggregates.from_records(volume_data, staffing_data)
+        self._daily_source = volume_data
+
+        columns = self._sla_columns(self._daily, deflection_data)
+        self._queueing = self._queueing_aggregates(columns)
+        sla_data = list(self._sla_records(self._daily.dates, columns))
+
+        print(f"   Generated {len(sla_data)} daily SLA records")
+        return sla_data
+
+    def iter_sla_performance(self, daily: DailyAggregates,
+                             deflection_data: List[Dict]) -> Iterator[Dict]:
+        """Yield daily SLA records from per-day volume and staffing totals.
+
+        Args:
+            daily: Per-day volume and staffing totals.
+            deflection_data: Monthly deflection history.
+        """
+        yield from self._sla_records(daily.dates, self._sla_columns(daily, deflection_data))
+
+    @staticmethod
+    def _sla_records(dates: List[str], columns: Dict[str, np.ndarray]) -> Iterator[Dict]:
+        """Yield SLA records from the per-day columns of _sla_columns."""
+        for date_str, actual, wait, abandonment in zip(dates, columns['actual'].tolist(),
+                                                       columns['avgWaitTime'].tolist(),
+                                                       columns['abandonment'].tolist()):
+            yield {
+                'date': date_str,
+                'target': SLA_TARGET,
+                'actual': round(actual, 3),
+                'avgWaitTime': wait,
+                'abandonment': round(abandonment, 3)
+            }
+
+    def _sla_columns(self, daily: DailyAggregates,
+                     deflection_data: List[Dict]) -> Dict[str, np.ndarray]:
+        """Compute SLA, average wait and abandonment for every day at once.
+
+        Returns:
+            Per-day 'actual', 'avgWaitTime' and 'abandonment' arrays. The
+            erlang model adds per-hour 'requiredAgents' and 'onQueueAgents'
+            (days x hours).
+        """
+        dates = pd.to_datetime(daily.dates)
+        deflection_rate = self._deflection_rates(dates, deflection_data)
+
+        if self.sla_model == 'erlang':
+            columns = self._erlang_sla_columns(daily, dates, deflection_rate)
+        elif self.sla_model == 'simulation':
+            columns = self._simulated_sla_columns(daily, dates, deflection_rate)
+        else:
+            columns = self._heuristic_sla_columns(daily, dates, deflection_rate)
+
+        self._apply_sla_events(dates, columns)
+        return columns
+
+    def _apply_sla_events(self, dates: pd.DatetimeIndex, columns: Dict[str, np.ndarray]):
+        """Overwrite SLA metrics on outage and bot failure days, in place.
+
+        Works on (..., days) arrays; earlier catalog entries win on overlap.
+        """
+        overrides = event_masks(self.events, dates, self.operating_hours)['sla']
+        for metric in SLA_METRICS:
+            mask = ~np.isnan(overrides[metric])
+            columns[metric][..., mask] = overrides[metric][mask]
+
+    @staticmethod
+    def _deflection_rates(dates: pd.DatetimeIndex, deflection_data: List[Dict]) -> np.ndarray:
+        """Each day's monthly overall deflection rate (0.20 for unknown months)."""
         deflection_by_month = {d['month']: d['overallRate'] for d in deflection_data}
+        return np.array([deflection_by_month.get(month_key, 0.20)
+                         for month_key in dates.strftime('%Y-%m')])
+
+    @staticmethod
+    def _offered_load(daily: DailyAggregates, deflection_rate: np.ndarray) -> np.ndarray:
+        """Hourly contacts reaching agents after bot deflection (days x hours).
+
+        Calls count fully, chats are divided by the chat concurrency and
+        emails are worked off-queue.
+        """
+        return ((daily.hourly_calls + daily.hourly_chats / CHAT_CONCURRENCY)
+                * (1 - deflection_rate)[:, None])
+
+    def _erlang_sla_columns(self, daily: DailyAggregates, dates: pd.DatetimeIndex,
+                            deflection_rate: np.ndarray) -> Dict[str, np.ndarray]:
+        """Daily SLA from queueing math over every operating hour at once.
+
+        Contacts left after bot deflection (calls, plus chats divided by the
+        chat concurrency; emails are worked off-queue) are offered to the
+        agents of the shifts covering each hour. Service level comes from
+        Erlang C; wait and abandonment come from Erlang A, which stays
+        meaningful when an hour is understaffed. Daily values are weighted by
+        each hour's offered contacts.
+        """
+        offered = self._offered_load(daily, deflection_rate)
 
-        for date_str in sorted(daily_volumes.keys()):
-            date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-            month_key = date_obj.strftime('%Y-%m')
+        # Day-to-day handle time variation (±5%)
+        aht = AVG_HANDLE_SECONDS * self.random.daily_normal('sla', dates, 1.0, 0.05)[:, None]
 
-            daily_volume = daily_volumes[date_str]
-            deflection_rate = deflection_by_month.get(month_key, 0.20)
+        on_queue = self._on_queue_agents(daily)
 
-            # Calculate total daily staffing
-            total_scheduled = sum(daily_staffing[date_str][shift]['scheduled']
-                                for shift in self.shifts.keys())
-            total_actual = sum(daily_staffing[date_str][shift]['actual']
-                             for shift in self.shifts.keys())
+        return {
+            **self._erlang_daily_metrics(offered, on_queue, aht),
+            'requiredAgents': self.staffing_table.required_agents(
+                offered, aht, SLA_TARGET, ANSWER_THRESHOLD_SECONDS),
+            'onQueueAgents': on_queue
+        }
 
-            # Calculate staffing ratio
-            staffing_ratio = total_actual / total_scheduled if total_scheduled > 0 else 1.0
+    @staticmethod
+    def _erlang_daily_metrics(offered: np.ndarray, on_queue: np.ndarray,
+                              aht: np.ndarray) -> Dict[str, np.ndarray]:
+        """Daily SLA, average wait and abandonment from (..., days, hours) arrays.
 
-            # Calculate SLA based on multiple factors
-            base_sla = 0.82  # Average performance
+        Hourly Erlang C service level and Erlang A wait and abandonment,
+        averaged over each day weighted by offered contacts.
+        """
+        traffic = traffic_intensity(offered, aht)
+        level = service_level(on_queue, traffic, aht, ANSWER_THRESHOLD_SECONDS)
+        queue = erlang_a(on_queue, offered, aht, PATIENCE_SECONDS)
 
-            # Staffing impact
-            sla_adjustment = (staffing_ratio - 1.0) * 0.3
+        weight = offered.sum(axis=-1)
+        has_load = weight > 0
+        weight = np.where(has_load, weight, 1.0)
 
-            # Volume impact (high volume hurts SLA)
-            volume_factor = min(daily_volume / 1000, 3.0)  # Cap at 3x normal
-            sla_adjustment -= (volume_factor - 1.0) * 0.1
+        def daily_mean(hourly: np.ndarray, idle_value: float) -> np.ndarray:
+            return np.where(has_load, (hourly * offered).sum(axis=-1) / weight, idle_value)
 
-            # Deflection helps SLA
-            deflection_boost = (deflection_rate - 0.20) * 0.5
-            sla_adjustment += deflection_boost
+        return {
+            'actual': daily_mean(level, 1.0),
+            'avgWaitTime': daily_mean(queue.mean_wait, 0.0).astype(np.int64),
+            'abandonment': daily_mean(queue.abandonment, 0.0)
+        }
 
-            # Add some randomness
-            random_factor = np.random.normal(0, 0.05)
+    def _on_queue_agents(self, daily: DailyAggregates) -> np.ndarray:
+        """Agents on the queue each day and hour (days x hours).
+
+        Counts the actual staff of the shifts covering the hour that day
+        (planned windows, or the configured hours for unplanned records),
+        less shrinkage.
+        """
+        configured = np.array([[self.shifts[name]['start'], self.shifts[name]['end']]
+                               for name in daily.shifts], dtype=np.int64).reshape(-1, 2)
+        windows = np.where(daily.shift_windows < 0, configured, daily.shift_windows)
+        hours = np.asarray(daily.hours)
+        coverage = ((windows[:, :, :1] <= hours) & (hours < windows[:, :, 1:])).astype(np.int64)
+        return np.floor(np.einsum('ds,dsh->dh', daily.shift_actual, coverage)
+                        * ON_QUEUE_SHARE).astype(np.int64)
+
+    def _simulated_sla_columns(self, daily: DailyAggregates, dates: pd.DatetimeIndex,
+                               deflection_rate: np.ndarray) -> Dict[str, np.ndarray]:
+        """Daily SLA from a discrete-event replay of each day's contacts.
+
+        The generated calls and chats that the bot does not deflect are
+        queued for the agents on the queue each hour, with the same handle
+        time and patience assumptions as the erlang model. Returns the erlang
+        model's columns plus per-hour 'intervalStats' (days x INTERVAL_STATS
+        x hours).
+        """
+        # Same day-to-day handle time variation (±5%) as the erlang model
+        aht = AVG_HANDLE_SECONDS * self.random.daily_normal('sla', dates, 1.0, 0.05)
+        on_queue = self._on_queue_agents(daily)
+
+        contacts = [draw_contacts(self.random.day('simulation', date), calls, chats,
+                                  1 - rate, day_aht, PATIENCE_SECONDS, CHAT_CONCURRENCY)
+                    for date, calls, chats, rate, day_aht in zip(
+                        dates, daily.hourly_calls, daily.hourly_chats, deflection_rate, aht)]
+        stats = simulate_days(contacts, on_queue * CHAT_CONCURRENCY, ANSWER_THRESHOLD_SECONDS,
+                              self.sim_workers)
+        offered, answered, in_threshold, abandoned, wait = stats.sum(axis=2).T
+
+        has_load = offered > 0
+        offered = np.where(has_load, offered, 1.0)
+        return {
+            'actual': np.where(has_load, in_threshold / offered, 1.0),
+            'avgWaitTime': (wait / np.maximum(answered, 1)).astype(np.int64),
+            'abandonment': np.where(has_load, abandoned / offered, 0.0),
+            'requiredAgents': self.staffing_table.required_agents(
+                self._offered_load(daily, deflection_rate), aht[:, None], SLA_TARGET,
+                ANSWER_THRESHOLD_SECONDS),
+            'onQueueAgents': on_queue,
+            'intervalStats': stats
+        }
 
-            actual_sla = base_sla + sla_adjustment + random_factor
-            actual_sla = max(0.65, min(0.95, actual_sla))  # Clamp to realistic range
+    @staticmethod
+    def _sla_interval_records(dates: List[str], hours: List[int],
+                              stats: np.ndarray) -> Iterator[Dict]:
+        """Yield hourly SLA records from simulated interval statistics."""
+        offered, answered, in_threshold, abandoned, wait = (
+            stats[:, INTERVAL_STATS.index(name)] for name in INTERVAL_STATS)
+        for day, date_str in enumerate(dates):
+            for index, hour in enumerate(hours):
+                count = int(offered[day, index])
+                served = int(answered[day, index])
+                yield {
+                    'date': date_str,
+                    'hour': hour,
+                    'offered': count,
+                    'answered': served,
+                    'abandoned': int(abandoned[day, index]),
+                    'serviceLevel': round(in_threshold[day, index] / count, 3) if count else 1.0,
+                    'avgWaitTime': int(wait[day, index] / served) if served else 0
+                }
 
-            # Calculate related metrics
-            avg_wait_time = max(5, int(45 * (1 - actual_sla)))  # Inverse relationship
-            abandonment_rate = max(0.01, (1 - actual_sla) * 0.2)
+    def _heuristic_sla_columns(self, daily: DailyAggregates, dates: pd.DatetimeIndex,
+                               deflection_rate: np.ndarray) -> Dict[str, np.ndarray]:
+        """Daily SLA from the original linear formula.
 
-            # Special anomalies
-            if date_str == '2024-03-15':  # System outage day
-                actual_sla = 0.45
-                avg_wait_time = 180
-                abandonment_rate = 0.25
-            elif date_str == '2024-10-10':  # Bot failure day
-                actual_sla = 0.60
-                avg_wait_time = 90
-                abandonment_rate = 0.15
+        Float operations follow the original per-day formula in the same
+        order, so the values are identical to the scalar version.
+        """
+        # Calculate SLA based on multiple factors
+        base_sla = 0.82  # Average performance
 
-            sla_data.append({
-                'date': date_str,
-                'target': 0.80,
-                'actual': round(actual_sla, 3),
-                'avgWaitTime': avg_wait_time,
-                'abandonment': round(abandonment_rate, 3)
-            })
+        # Staffing impact
+        sla_adjustment = (daily.staffing_ratio - 1.0) * 0.3
 
-        print(f"   Generated {len(sla_data)} daily SLA records")
-        return sla_data
+        # Volume impact (high volume hurts SLA)
+        volume_factor = np.minimum(daily.volume / 1000, 3.0)  # Cap at 3x normal
+        sla_adjustment = sla_adjustment - (volume_factor - 1.0) * 0.1
+
+        # Deflection helps SLA
+        deflection_boost = (deflection_rate - 0.20) * 0.5
+        sla_adjustment = sla_adjustment + deflection_boost
+
+        # Add some randomness
+        random_factor = self.random.daily_normal('sla', dates, 0, 0.05)
+
+        actual_sla = base_sla + sla_adjustment + random_factor
+        actual_sla = np.maximum(0.65, np.minimum(0.95, actual_sla))  # Clamp to realistic range
+
+        # Calculate related metrics
+        avg_wait_time = np.maximum(5, np.trunc(45 * (1 - actual_sla)).astype(np.int64))  # Inverse relationship
+        abandonment_rate = np.maximum(0.01, (1 - actual_sla) * 0.2)
+
+        return {'actual': actual_sla, 'avgWaitTime': avg_wait_time, 'abandonment': abandonment_rate}
+
+    @staticmethod
+    def _queueing_aggregates(columns: Dict[str, np.ndarray]) -> Dict[str, int]:
+        """Required vs. on-queue agent totals for the summary (erlang and simulation models)."""
+        if 'requiredAgents' not in columns:
+            return {}
+        required, on_queue = columns['requiredAgents'], columns['onQueueAgents']
+        return {
+            'intervals': int(required.size),
+            'requiredAgentHours': int(required.sum()),
+            'onQueueAgentHours': int(on_queue.sum()),
+            'understaffedIntervals': int((on_queue < required).sum())
+        }
 
     def generate_cost_data(self) -> Dict[str, Any]:
         """Generate cost analysis and benchmark data."""
@@ -461,19 +1733,14 @@ class WFMDataGenerator:
 
         return {
             'agentCosts': {
-                'average': 52000,
+                'average': AGENT_AVG_SALARY,
                 'range': {'min': 45000, 'max': 65000},
-                'byTenure': [
-                    {'years': '0-1', 'avgSalary': 45000, 'count': 28},
-                    {'years': '1-3', 'avgSalary': 50000, 'count': 35},
-                    {'years': '3-5', 'avgSalary': 56000, 'count': 20},
-                    {'years': '5+', 'avgSalary': 62000, 'count': 11}
-                ],
-                'benefits': 0.32,  # 32% benefits load
+                'byTenure': [dict(band) for band in AGENT_TENURE],
+                'benefits': BENEFITS_LOAD,
                 'overtimeRate': 1.5
             },
             'aiCosts': {
-                'perContact': 0.12,
+                'perContact': AI_COST_PER_CONTACT,
                 'monthlyTrend': [
                     {'month': '2024-01', 'perContact': 0.15, 'totalCost': 4050},
                     {'month': '2024-03', 'perContact': 0.13, 'totalCost': 4225},  # Bot v2
@@ -519,19 +1786,28 @@ class WFMDataGenerator:
         """Generate summary statistics for the year."""
         print("📋 Generating summary statistics...")
 
-        # Calculate totals
-        total_contacts = sum(r['calls'] + r['chats'] + r['emails'] for r in volume_data)
+        # Reuse the daily totals built for SLA when they cover the same records
+        if self._daily_source is volume_data:
+            daily, queueing = self._daily, self._queueing
+        else:
+            daily, queueing = DailyAggregates.from_records(volume_data), {}
+
+        aggregates = daily.summary([r['actual'] for r in sla_data])
+        aggregates.update(queueing)
+        return self._build_summary_stats(aggregates, deflection_data, self.start_date)
 
-        # Find peak and lowest days
-        daily_totals = {}
-        for record in volume_data:
-            date = record['date']
-            if date not in daily_totals:
-                daily_totals[date] = 0
-            daily_totals[date] += record['calls'] + record['chats'] + record['emails']
+    def _build_summary_stats(self, aggregates: Dict[str, Any], deflection_data: List[Dict],
+                             history_start: datetime) -> Dict[str, Any]:
+        """Build summary statistics from running aggregates.
 
-        peak_day = max(daily_totals.items(), key=lambda x: x[1])
-        lowest_day = min(daily_totals.items(), key=lambda x: x[1])
+        Args:
+            aggregates: See DailyAggregates.summary.
+            deflection_data: Monthly deflection history for the whole history.
+            history_start: First day of the whole history (differs from
+                start_date when appending).
+        """
+        total_contacts = aggregates['totalContacts']
+        num_weeks = max(aggregates['days'] // 7, 1)
 
         # Calculate deflection improvement
         start_deflection = deflection_data[0]['overallRate']
@@ -539,20 +1815,14 @@ class WFMDataGenerator:
         deflection_improvement = (end_deflection - start_deflection) / start_deflection
 
         # SLA statistics
-        avg_sla = np.mean([r['actual'] for r in sla_data])
-        sla_variance = np.std([r['actual'] for r in sla_data])
+        avg_sla = aggregates['slaMean']
+        sla_variance = aggregates['slaStd']
 
-        return {
+        summary = {
             'totalContacts': total_contacts,
-            'avgWeeklyVolume': int(total_contacts / 52),
-            'peakDay': {
-                'date': peak_day[0],
-                'volume': peak_day[1]
-            },
-            'lowestDay': {
-                'date': lowest_day[0],
-                'volume': lowest_day[1]
-            },
+            'avgWeeklyVolume': int(total_contacts / num_weeks),
+            'peakDay': dict(aggregates['peakDay']),
+            'lowestDay': dict(aggregates['lowestDay']),
             'deflectionImprovement': f"+{deflection_improvement:.1%}",
             'avgSLA': round(avg_sla, 3),
             'slaVariance': round(sla_variance, 3),
@@ -562,29 +1832,623 @@ class WFMDataGenerator:
                 'emails': '10%'
             },
             'keyMetrics': {
-                'totalFTEs': 94,
+                'totalFTEs': self.total_ftes,
                 'avgHandleTime': 6.0,
                 'annualAgentCost': 4916000,  # 94 FTEs * $52,270 avg
                 'deflectionSavings': 892000  # Estimated annual savings from AI
             },
             'dataQuality': {
-                'recordCount': len(volume_data),
-                'dateRange': f"{self.start_date.strftime('%Y-%m-%d')} to {self.end_date.strftime('%Y-%m-%d')}",
-                'anomaliesIncluded': ['2024-03-15 outage', '2024-06-03 viral incident',
-                                    '2024-09-01 campaign', '2024-10-10 bot failure']
+                'recordCount': aggregates['recordCount'],
+                'dateRange': f"{history_start.strftime('%Y-%m-%d')} to {self.end_date.strftime('%Y-%m-%d')}",
+                'anomaliesIncluded': [f"{anchor.strftime('%Y-%m-%d')} {event['label']}"
+                                      for anchor, event in event_occurrences(self.events, history_start,
+                                                                             self.end_date)]
             }
         }
 
+        # Erlang C staffing requirement vs. agents actually on the queue
+        if 'requiredAgentHours' in aggregates:
+            summary['staffingCoverage'] = {
+                'requiredAgentHours': aggregates['requiredAgentHours'],
+                'onQueueAgentHours': aggregates['onQueueAgentHours'],
+                'understaffedIntervalShare': round(aggregates['understaffedIntervals']
+                                                   / max(aggregates['intervals'], 1), 3)
+            }
+        return summary
+
+    def _write_rollups(self, daily: DailyAggregates, deflection_data: List[Dict],
+                       append: bool = False):
+        """Write the dashboard rollups (see rollups.py) for the whole history.
+
+        When appending, the existing daily rollup and hourly profile are
+        merged with the newly generated days.
+        """
+        rollup_dir = self.output_dir / ROLLUP_DIRNAME
+        days = daily_records(daily.dates, daily.totals, daily.sla_actual,
+                             daily.scheduled, daily.actual)
+        previous_profile = None
+        if append:
+            days = [r for r in read_rollup(rollup_dir, 'daily') if r['date'] < daily.dates[0]] + days
+            previous_profile = read_rollup(rollup_dir, 'hourlyProfile')
+
+        deflection_by_month = {d['month']: d['overallRate'] for d in deflection_data}
+        write_rollups(rollup_dir, {
+            'daily': days,
+            'weekly': period_records(days, 'week', SLA_TARGET),
+            'monthly': period_records(days, 'month', SLA_TARGET, deflection_by_month),
+            'hourlyProfile': hourly_profile(daily.dates, daily.hours, daily.hourly_volume,
+                                            previous_profile)
+        }, self.json_format)
+        print(f"   ✅ {ROLLUP_DIRNAME}/ ({', '.join(ROLLUP_FILES.values())})")
+
+    def generate_ensemble(self, members: int, full_output: bool = False) -> Dict[str, Any]:
+        """Generate a Monte Carlo ensemble of volume, absences and SLA.
+
+        Every member redraws the volume noise, PTO, sick leave, training and
+        handle time variation. Calendar effects, trends and the deflection
+        history are shared by all members. Members are computed ENSEMBLE_BATCH
+        at a time as stacked (members, days, hours) arrays, using the
+        configured shifts and the erlang SLA model.
+
+        Writes per-day quantile bands to ensemble_quantiles.json and, with
+        full_output, every member to an npy bundle in ensemble/.
+
+        Args:
+            members: Number of realizations.
+            full_output: Also keep every member's hourly volume, shift
+                staffing and daily SLA.
+
+        Returns:
+            The ensemble_quantiles.json document.
+        """
+        if members < 1:
+            raise ValueError("members must be at least 1")
+        print(f"🎲 Generating a {members}-member scenario ensemble...")
+
+        dates = pd.date_range(self.start_date, self.end_date)
+        hours = np.array(self.operating_hours)
+        shift_names = list(self.shifts)
+        scheduled = np.array([self.shifts[name]['agents'] for name in shift_names])
+        coverage = np.array([[self.shifts[name]['start'] <= hour < self.shifts[name]['end']
+                              for hour in hours] for name in shift_names],
+                            dtype=np.int64).reshape(-1, len(hours))
+        deflection_rate = self._deflection_rates(dates, self.generate_deflection_history())
+
+        daily = {name: np.zeros((members, len(dates))) for name in (
+            'volume', 'peakHourVolume', 'actualAgents', 'sla', 'avgWaitTime', 'abandonment')}
+        writer = None
+        if full_output:
+            writer = EnsembleWriter(self.output_dir / ENSEMBLE_DIRNAME, {
+                'calls': ((members, len(dates), len(hours)), 'int32'),
+                'chats': ((members, len(dates), len(hours)), 'int32'),
+                'emails': ((members, len(dates), len(hours)), 'int32'),
+                'actual': ((members, len(dates), len(shift_names)), 'int16'),
+                'sla': ((members, len(dates)), 'float32'),
+                'avgWaitTime': ((members, len(dates)), 'int16'),
+                'abandonment': ((members, len(dates)), 'float32'),
+            }, {
+                'date': dates.values.astype('datetime64[D]'),
+                'hour': hours.astype(np.int16),
+                'shift': np.array(shift_names),
+            })
+
+        for first in range(0, members, ENSEMBLE_BATCH):
+            batch = range(first, min(first + ENSEMBLE_BATCH, members))
+            noise = np.stack([self.random.ensemble('volume', self.start_date, m)
+                              .normal(1.0, 0.15, size=(len(dates), len(hours))) for m in batch])
+            _, _, columns = self._volume_grid(noise)
+            actual = np.stack([self._ensemble_absences(dates, scheduled, shift_names,
+                                                       self.random.ensemble('staffing', self.start_date, m))
+                               for m in batch])
+            aht = AVG_HANDLE_SECONDS * np.stack([
+                self.random.ensemble('sla', self.start_date, m).normal(1.0, 0.05, size=len(dates))
+                for m in batch])[:, :, None]
+
+            offered = ((columns['calls'] + columns['chats'] / CHAT_CONCURRENCY)
+                       * (1 - deflection_rate)[:, None])
+            on_queue = np.floor(actual @ coverage * ON_QUEUE_SHARE).astype(np.int64)
+            sla = self._erlang_daily_metrics(offered, on_queue, aht)
+            self._apply_sla_events(dates, sla)
+
+            volume = columns['calls'] + columns['chats'] + columns['emails']
+            rows = slice(first, first + len(batch))
+            daily['volume'][rows] = volume.sum(axis=-1)
+            daily['peakHourVolume'][rows] = volume.max(axis=-1)
+            daily['actualAgents'][rows] = actual.sum(axis=-1)
+            daily['sla'][rows] = sla['actual']
+            daily['avgWaitTime'][rows] = sla['avgWaitTime']
+            daily['abandonment'][rows] = sla['abandonment']
+            if writer is not None:
+                writer.write(first, {
+                    'calls': columns['calls'], 'chats': columns['chats'],
+                    'emails': columns['emails'], 'actual': actual, 'sla': sla['actual'],
+                    'avgWaitTime': sla['avgWaitTime'], 'abandonment': sla['abandonment']})
+
+        decimals = {'sla': 3, 'abandonment': 3}
+        totals = quantile_bands(daily['volume'].sum(axis=1))
+        sla_mean = quantile_bands(daily['sla'].mean(axis=1))
+        document = {
+            'members': members,
+            'seed': self.seed,
+            'quantiles': list(ENSEMBLE_QUANTILES),
+            'startDate': self.start_date.strftime('%Y-%m-%d'),
+            'endDate': self.end_date.strftime('%Y-%m-%d'),
+            'totals': {
+                'volume': {label: int(round(v)) for label, v in totals.items()},
+                'slaMean': {label: round(float(v), 3) for label, v in sla_mean.items()},
+            },
+            'days': list(band_records(dates.strftime('%Y-%m-%d'), daily, decimals)),
+        }
+        write_json_document(self.output_dir / ENSEMBLE_FILENAME, document, self.json_format)
+        print(f"   ✅ {ENSEMBLE_FILENAME}")
+        if writer is not None:
+            writer.close()
+            print(f"   ✅ {ENSEMBLE_DIRNAME}/ ({members} members)")
+
+        print(f"   Window volume P10/P50/P90: "
+              f"{' / '.join(str(v) for v in document['totals']['volume'].values())}")
+        return document
+
+    @staticmethod
+    def _ensemble_absences(dates: pd.DatetimeIndex, scheduled: np.ndarray,
+                           shift_names: List[str], rng) -> np.ndarray:
+        """One member's actual agents per day and shift (days x shifts).
+
+        The same PTO, sick leave and training rules as iter_staffing_days,
+        drawn for the whole window at once.
+        """
+        month, day = dates.month.values, dates.day.values
+        pto_rate = np.select([np.isin(month, [7, 8]), (month == 12) & (day >= 20), month == 12],
+                             [0.08, 0.15, 0.05], 0.03)
+        pto_rate = np.where(dates.weekday.values >= 5, pto_rate * 0.5, pto_rate)
+        shape = (len(dates), len(scheduled))
+
+        pto = rng.binomial(scheduled, pto_rate[:, None], size=shape)
+        sick_rate = rng.uniform(0.03, 0.05, size=shape)
+        sick_rate = np.where(np.isin(month, [12, 1, 2, 3])[:, None], sick_rate * 1.3, sick_rate)
+        sick = rng.binomial(scheduled, sick_rate)
+        training_day = np.isin(dates.weekday.values, [1, 3])[:, None] & (np.array(shift_names) == 'midday')
+        training = np.where(training_day, rng.integers(2, 6, size=shape), 0)
+
+        return np.maximum(scheduled - pto - sick - training, 0)
+
     def save_data_files(self, data_dict: Dict[str, Any]):
         """Save all generated data to JSON files."""
         print("💾 Saving data files...")
 
         for filename, data in data_dict.items():
-            filepath = self.output_dir / filename
-            with open(filepath, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+            if isinstance(data, list):
+                self._write_records(filename, data)
+                continue
+            write_json_document(self.output_dir / filename, data, self.json_format)
             print(f"   ✅ {filename}")
 
+    def _records_path(self, filename: str) -> str:
+        """On-disk name of a record dataset in the configured output format."""
+        if self.partition != 'none' and filename in PARTITIONED_DATASETS:
+            return Path(filename).stem
+        if self.output_format == 'columnar' and filename in COLUMNAR_SCHEMAS:
+            return columnar_filename(filename, self.columnar_backend)
+        return records_filename(filename, self.json_format, self.compression)
+
+    def _write_records(self, filename: str, records: Iterable[Dict], append: bool = False) -> int:
+        """Write records to disk as they are produced, in the configured format.
+
+        Datasets with a columnar schema are written as typed columns in
+        columnar mode; everything else uses the configured JSON style, with
+        ``.ndjson`` files in NDJSON mode. With ``--partition month`` the
+        date-keyed datasets go to monthly files and their manifest entry is
+        updated. With ``append`` the records are added to the end of the
+        existing file. Returns the number of records written.
+        """
+        path = self.output_dir / self._records_path(filename)
+        if self.partition != 'none' and filename in PARTITIONED_DATASETS:
+            previous = (self._manifest['datasets'].get(path.name, {}).get('partitions')
+                        if append else None)
+            count, partitions = write_partitioned_records(path, records, self.json_format, previous)
+            self._manifest['datasets'][path.name] = {'partitions': partitions}
+            print(f"   ✅ {path.name}/ ({len(partitions)} monthly partitions)")
+            return count
+        if self.output_format == 'columnar' and filename in COLUMNAR_SCHEMAS:
+            write = append_columnar_records if append else write_columnar_records
+            count = write(path, records, self._columnar_schema(filename), self.columnar_backend)
+        elif self.pipeline:
+            return self._write_blocks(filename, batched(records, DEFAULT_CHUNK_ROWS), append)
+        else:
+            write = append_json_records if append else write_json_records
+            count = write(path, records, self.json_format)
+        print(f"   ✅ {path.name}")
+        return count
+
+    def _write_blocks(self, filename: str, blocks: Iterable[List[Dict]], append: bool = False) -> int:
+        """Write record blocks through the pipeline's writer threads (see pipeline.py)."""
+        path = self.output_dir / self._records_path(filename)
+        label = f"{self.site_name}/{path.name}" if self.site_name else path.name
+        writer = BlockWriter(path, self.json_format, self.compression, self.writer_threads, label)
+        count = writer.write(blocks, append)
+        self.throughput.append(writer.meter.summary())
+        print(f"   ✅ {path.name}")
+        return count
+
+    def _columnar_schema(self, filename: str) -> List[Tuple[str, str, Tuple[str, ...]]]:
+        """Column layout of a dataset, including columns added by run options."""
+        schema = COLUMNAR_SCHEMAS[filename]
+        if filename == 'historical_volume.json' and self.interval_minutes != 60:
+            schema = schema[:2] + INTERVAL_COLUMNS + schema[2:]
+        if filename == 'staffing_schedules.json' and self.scheduler != 'static':
+            schema = schema + PLANNED_SHIFT_COLUMNS
+        return schema
+
+    def _read_records(self, filename: str) -> List[Dict]:
+        """Read back a small JSON record dataset (e.g. deflection history)."""
+        return list(self._iter_records(filename))
+
+    def _iter_records(self, filename: str) -> Iterator[Dict]:
+        """Read back a JSON record dataset one file (or monthly partition) at a time."""
+        return iter_records(self.output_dir, filename, self.json_format,
+                            self.partition != 'none' and filename in PARTITIONED_DATASETS,
+                            self.compression)
+
+    def _volume_history(self) -> Tuple[pd.DatetimeIndex, np.ndarray, np.ndarray]:
+        """Written volume history as a (days x hours x VOLUME_COLUMNS) grid."""
+        if self.output_format == 'columnar':
+            return columnar_volume_grid(
+                read_columnar(self.output_dir / self._records_path('historical_volume.json')))
+        return volume_grid(self._iter_records('historical_volume.json'))
+
+    def _calendar_flags(self, dates: pd.DatetimeIndex) -> Dict[str, np.ndarray]:
+        """Per-day indicators of the calendar effects on volume, for forecasting."""
+        month = dates.month.values
+        day = dates.day.values
+        flags = {
+            'blackFridayWeek': (month == 11) & (day >= 22) & (day <= 29),
+            'christmasWeek': (month == 12) & (day >= 23) & (day <= 26),
+            'monthEnd': day >= 25,  # Billing share rises at the end of each month
+        }
+        days = dates.to_pydatetime()
+        for event in self.events:
+            if 'volume' in event:
+                flags[event['type']] = flags.get(event['type'], False) | np.array(
+                    [active_event(self.events, d, 'volume') is event for d in days], dtype=bool)
+        return flags
+
+    def generate_forecast(self, horizon_days: int,
+                          confidence: float = FORECAST_CONFIDENCE) -> Dict[str, Any]:
+        """Forecast the days after the written history (see forecast_outputs)."""
+        return forecast_outputs([self], horizon_days, confidence)[0]
+
+    def generate_sweep(self, grid: Optional[Dict[str, List[float]]] = None) -> Dict[str, Any]:
+        """Write the what-if deflection/cost table for the written history.
+
+        Evaluates the last SWEEP_WINDOW_DAYS days of volume at every point
+        of the grid (see sweep.py) and writes deflection_sweep.json, always
+        compact since it is a lookup table. The table's potentialSavings
+        block prices SAVINGS_SCENARIOS against the history's current
+        deflection rate at the generator's nominal AHT, shrinkage and target.
+
+        Args:
+            grid: Values per axis of SWEEP_AXES; missing axes use
+                DEFAULT_SWEEP_GRID.
+
+        Returns:
+            The written document.
+        """
+        grid = validate_grid(grid or {})
+        dates, hours, volume = self._volume_history()
+        window = slice(-min(len(dates), SWEEP_WINDOW_DAYS), None)
+        dates, volume = dates[window], volume[window]
+        points = int(np.prod([len(grid[axis]) for axis in SWEEP_AXES]))
+        print(f"🎛️  Sweeping {points} what-if points over {volume.shape[0] * volume.shape[1]} "
+              "hourly intervals...")
+
+        offered = (volume[..., 0] + volume[..., 1] / CHAT_CONCURRENCY).ravel()
+        contacts = float(volume[..., :3].sum())
+        cost_per_fte = AGENT_AVG_SALARY * (1 + BENEFITS_LOAD)
+
+        def evaluate(axes: Dict[str, List[float]]) -> Dict[str, np.ndarray]:
+            return sweep_table(offered, contacts, axes, self.staffing_table,
+                               ANSWER_THRESHOLD_SECONDS, 365 / len(dates), cost_per_fte,
+                               AI_COST_PER_CONTACT)
+
+        table = evaluate(grid)
+        current_rate = round(float(self._deflection_rates(
+            dates, self._read_records('deflection_history.json')).mean()), 4)
+        nominal = {'ahtMinutes': [AVG_HANDLE_SECONDS / 60], 'shrinkage': [round(1 - ON_QUEUE_SHARE, 2)],
+                   'slaTarget': [SLA_TARGET]}
+        potential = savings_scenarios(evaluate({'deflectionRate': list(SAVINGS_SCENARIOS), **nominal}),
+                                      evaluate({'deflectionRate': [current_rate], **nominal}))
+
+        document = {
+            'historyStart': dates[0].strftime('%Y-%m-%d'),
+            'historyEnd': dates[-1].strftime('%Y-%m-%d'),
+            'days': len(dates),
+            'intervals': int(offered.size),
+            'currentDeflectionRate': current_rate,
+            'assumptions': {
+                'answerThresholdSeconds': ANSWER_THRESHOLD_SECONDS,
+                'chatConcurrency': CHAT_CONCURRENCY,
+                'hoursPerFte': HOURS_PER_FTE,
+                'costPerFte': cost_per_fte,
+                'aiCostPerContact': AI_COST_PER_CONTACT,
+                'nominal': {axis: values[0] for axis, values in nominal.items()}
+            },
+            'axes': grid,
+            'shape': [len(grid[axis]) for axis in SWEEP_AXES],
+            'requiredFtes': np.round(table['requiredFtes'], 1).ravel().tolist(),
+            'peakAgents': table['peakAgents'].ravel().tolist(),
+            'annualCost': np.rint(table['annualCost']).astype(np.int64).ravel().tolist(),
+            'annualSavings': np.rint(table['annualSavings']).astype(np.int64).ravel().tolist(),
+            'potentialSavings': potential
+        }
+        write_json_document(self.output_dir / SWEEP_FILENAME, document, 'compact')
+        print(f"   ✅ {SWEEP_FILENAME}")
+        if self.erlang_cache is not None:
+            self.staffing_table.save(self.erlang_cache)
+        return document
+
+    def _site_settings(self) -> Dict[str, Any]:
+        """Current center parameters in site config form."""
+        return {
+            'base_weekly_volume': self.base_weekly_volume,
+            'total_ftes': self.total_ftes,
+            'contact_types': self.contact_types,
+            'shifts': self.shifts,
+            'operating_hours': {'start': self.operating_hours[0],
+                                'end': self.operating_hours[-1] + 1}
+        }
+
+    def _save_manifest(self):
+        """Write the partition manifest, or remove a stale one from an earlier run.
+
+        The manifest is always compact: its per-day offset pairs would
+        otherwise take several lines each.
+        """
+        path = self.output_dir / MANIFEST_FILENAME
+        if self.partition == 'none':
+            if path.exists():
+                path.unlink()
+            return
+        write_json_document(path, {
+            'partition': self.partition,
+            'jsonFormat': self.json_format,
+            'datasets': self._manifest['datasets']
+        }, 'compact')
+        print(f"   ✅ {MANIFEST_FILENAME}")
+
+    def _save_anomaly_index(self, history_start: datetime):
+        """Write the anomaly index of the whole history (see events.anomaly_index)."""
+        write_json_document(self.output_dir / ANOMALY_INDEX_FILENAME,
+                            anomaly_index(self.events, history_start, self.end_date),
+                            self.json_format)
+        print(f"   ✅ {ANOMALY_INDEX_FILENAME}")
+
+    def _save_erlang_cache(self):
+        """Report staffing table hit rates and persist it (with erlang_cache)."""
+        stats = self.staffing_table.stats()
+        if stats['lookups']:
+            print(f"🧮 Erlang staffing table: {stats['lookups']} interval lookups, "
+                  f"{stats['hitRate']:.1%} hit rate, {stats['entries']} entries")
+        if self.erlang_cache is not None:
+            self.staffing_table.save(self.erlang_cache)
+            print(f"   ✅ {self.erlang_cache}")
+
+    def _save_profile(self):
+        """Write the per-stage timing report next to the outputs (with --profile)."""
+        if not self.profiler.enabled:
+            return
+        self.profiler.finish()
+        write_json_document(self.output_dir / PROFILE_REPORT_FILENAME, self.profiler.report(
+            engine=self.engine,
+            seedCompat=self.seed_compat,
+            startDate=self.start_date.strftime('%Y-%m-%d'),
+            endDate=self.end_date.strftime('%Y-%m-%d'),
+            jsonFormat=self.json_format,
+            outputFormat=self.output_format,
+            slaModel=self.sla_model,
+            scheduler=self.scheduler,
+            staffingModel=self.staffing_model,
+            intervalMinutes=self.interval_minutes,
+            partition=self.partition,
+            erlangTable=self.staffing_table.stats()
+        ))
+        self.profiler.print_summary()
+        print(f"   ✅ {PROFILE_REPORT_FILENAME}")
+
+    def _save_state(self, aggregates: Dict[str, Any], history_start: datetime):
+        """Record settings and running aggregates for a later --append."""
+        write_json_document(self.output_dir / STATE_FILENAME, {
+            'seed': self.seed,
+            'seedCompat': self.seed_compat,
+            'trendStart': self.trend_start.strftime('%Y-%m-%d'),
+            'startDate': history_start.strftime('%Y-%m-%d'),
+            'endDate': self.end_date.strftime('%Y-%m-%d'),
+            'jsonFormat': self.json_format,
+            'outputFormat': self.output_format,
+            'columnarBackend': self.columnar_backend,
+            'slaModel': self.sla_model,
+            'scheduler': self.scheduler,
+            'staffingModel': self.staffing_model,
+            'intervalMinutes': self.interval_minutes,
+            'partition': self.partition,
+            'compression': self.compression,
+            'events': self.events,
+            'site': self._site_settings(),
+            'aggregates': aggregates
+        })
+
+
+def forecast_outputs(generators: List[WFMDataGenerator], horizon_days: int,
+                     confidence: float = FORECAST_CONFIDENCE) -> List[Dict[str, Any]]:
+    """Fit and write volume forecasts for one or more generated outputs.
+
+    Each output's written volume history is read back into a grid of seven
+    series (three channels and four contact types). Outputs covering the
+    same days and hours, such as the sites of a --sites run, share a design
+    matrix, so all their series are fitted in one least-squares solve. The
+    forecast covers horizon_days days after the history and is written to
+    volume_forecast.json in the output's JSON style, with the fit details
+    and a backtest in forecast_model.json.
+
+    Returns:
+        The forecast_model.json document of each output, in order.
+    """
+    if horizon_days < 1:
+        raise ValueError(f"horizon_days must be at least 1, got {horizon_days}")
+    print(f"🔮 Forecasting {horizon_days} days for {len(generators)} output(s)...")
+    histories = [generator._volume_history() for generator in generators]
+    groups: Dict[Tuple, List[int]] = {}
+    for i, (dates, hours, _) in enumerate(histories):
+        groups.setdefault((dates[0], len(dates), tuple(hours.tolist())), []).append(i)
+
+    documents: List[Optional[Dict[str, Any]]] = [None] * len(generators)
+    for indices in groups.values():
+        dates, hours, _ = histories[indices[0]]
+        calendar = generators[indices[0]]
+        future = pd.date_range(dates[-1] + pd.Timedelta(days=1), periods=horizon_days)
+        matrix, features = design_matrix(dates, hours, dates[0], calendar._calendar_flags(dates))
+        future_matrix, _ = design_matrix(future, hours, dates[0], calendar._calendar_flags(future))
+
+        # Observations x (outputs * VOLUME_COLUMNS), one column per series
+        volume = np.concatenate([histories[i][2].reshape(len(dates) * len(hours), -1)
+                                 for i in indices], axis=1)
+        fit = fit_regression(matrix, volume)
+        mean, lower, upper = predict(fit, future_matrix, confidence)
+        holdout_days = min(horizon_days, int(len(dates) * HOLDOUT_FRACTION))
+        wape = (holdout_wape(matrix, volume, holdout_days * len(hours)) if holdout_days
+                else np.full(volume.shape[1], np.nan))
+
+        width = len(VOLUME_COLUMNS)
+        for position, i in enumerate(indices):
+            generator = generators[i]
+            series = slice(position * width, (position + 1) * width)
+            generator._write_records(FORECAST_FILENAME, forecast_records(
+                future, hours, mean[:, series], lower[:, series], upper[:, series]))
+            document = {
+                'model': 'log-linear regression',
+                'features': features,
+                'historyStart': dates[0].strftime('%Y-%m-%d'),
+                'historyEnd': dates[-1].strftime('%Y-%m-%d'),
+                'forecastStart': future[0].strftime('%Y-%m-%d'),
+                'forecastEnd': future[-1].strftime('%Y-%m-%d'),
+                'horizonDays': horizon_days,
+                'confidence': confidence,
+                'jointSeries': volume.shape[1],
+                'holdoutDays': holdout_days,
+                'series': {
+                    name: {
+                        'residualStd': round(float(sigma), 4),
+                        'holdoutWape': None if np.isnan(error) else round(float(error), 4)
+                    }
+                    for name, sigma, error in zip(VOLUME_COLUMNS, fit.sigma[series], wape[series])
+                }
+            }
+            write_json_document(generator.output_dir / FORECAST_MODEL_FILENAME, document,
+                                generator.json_format)
+            print(f"   ✅ {FORECAST_MODEL_FILENAME}")
+            documents[i] = document
+    return documents
+
+
+def load_site_config(path: Path) -> List[Dict[str, Any]]:
+    """Load the list of sites from a JSON or YAML site config file.
+
+    The file holds ``{"sites": [{"name": ..., ...}, ...]}``; see
+    SITE_CONFIG_KEYS for the per-site settings. YAML requires PyYAML.
+    """
+    path = Path(path)
+    with open(path) as f:
+        if path.suffix in ('.yaml', '.yml'):
+            import yaml
+            config = yaml.safe_load(f)
+        else:
+            config = json.load(f)
+
+    sites = config.get('sites', [])
+    names = [site.get('name') for site in sites]
+    if not sites or None in names or len(set(names)) != len(names):
+        raise ValueError(f"{path}: expected a non-empty 'sites' list with unique names")
+    return sites
+
+
+def site_seeds(seed: int, num_sites: int) -> List[int]:
+    """Derive one independent, deterministic seed per site from the root seed."""
+    children = np.random.SeedSequence(seed).spawn(num_sites)
+    return [int(child.generate_state(1)[0]) for child in children]
+
+
+def _generate_site(site: Dict[str, Any], site_seed: int, output_dir: str,
+                   generator_kwargs: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+    """Generate every dataset for one site (runs inside a worker process).
+
+    Returns:
+        The site's sites.json entry and the throughput summaries of its
+        pipeline writes, which the parent prints (worker stdout is discarded).
+    """
+    # Every site draws from streams derived from its own seed, so results do
+    # not depend on which worker runs it or what ran there before
+    generator = WFMDataGenerator(seed=site_seed, **generator_kwargs)
+    generator.apply_site_config(site)
+    generator.output_dir = Path(output_dir) / site['name']
+    generator.output_dir.mkdir(parents=True, exist_ok=True)
+    generator.site_name = site['name']
+
+    with redirect_stdout(io.StringIO()):
+        generator.generate_all_data()
+
+    return ({'name': site['name'], 'seed': site_seed, 'directory': site['name']},
+            generator.throughput)
+
+
+def generate_sites(sites: List[Dict[str, Any]], output_dir: Path, seed: int,
+                   workers: int, generator_kwargs: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Generate datasets for many sites in parallel.
+
+    Each site gets a seed spawned from ``seed`` via ``np.random.SeedSequence``
+    and is written to ``output_dir/<name>/``. Output is identical for any
+    number of workers. A ``sites.json`` manifest lists the sites in config
+    order.
+    """
+    seeds = site_seeds(seed, len(sites))
+    jobs = [(site, site_seed, str(output_dir), generator_kwargs)
+            for site, site_seed in zip(sites, seeds)]
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        if pool is None:
+            pending = (_generate_site(*job) for job in jobs)
+        else:
+            futures = [pool.submit(_generate_site, *job) for job in jobs]
+            pending = (future.result() for future in futures)
+
+        results = []
+        for done, (result, throughput) in enumerate(pending, start=1):
+            results.append(result)
+            print(f"   ✅ {result['name']} ({done}/{len(jobs)})")
+            for summary in throughput:
+                print(f"   ⏱️  {summary}")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    write_json_document(Path(output_dir) / 'sites.json', {'seed': seed, 'sites': results})
+    return results
+
+
+def _parse_date(value: str) -> datetime:
+    """Parse a YYYY-MM-DD command line date."""
+    try:
+        return datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date '{value}', expected YYYY-MM-DD")
+
+
+def _parse_grid_axis(value: str) -> List[float]:
+    """Parse a command line sweep grid."""
+    try:
+        return parse_axis(value)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error))
+
 
 def main():
     """Main function to generate all synthetic data."""
@@ -593,32 +2457,228 @@ def main():
                        help='Output directory for JSON files')
     parser.add_argument('--seed', '-s', type=int, default=42,
                        help='Random seed for reproducibility')
+    parser.add_argument('--start', type=_parse_date, default=DEFAULT_START_DATE,
+                       help='First date to generate (YYYY-MM-DD, default 2024-01-01)')
+    parser.add_argument('--end', type=_parse_date, default=DEFAULT_END_DATE,
+                       help='Last date to generate, inclusive (YYYY-MM-DD, default 2024-12-31)')
+    parser.add_argument('--json-format', choices=JSON_FORMATS, default='pretty',
+                       help='Output style: indented JSON, compact JSON or NDJSON (one record per line)')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='json', dest='output_format',
+                       help='Write historical volume and staffing as JSON or as typed columns')
+    parser.add_argument('--columnar-backend', choices=COLUMNAR_BACKENDS, default='auto',
+                       help='Columnar target: Parquet (needs pyarrow), .npy bundle, or auto')
+    parser.add_argument('--sites', type=Path,
+                       help='JSON/YAML site config; generates every listed site into <output>/<name>/')
+    parser.add_argument('--workers', '-j', type=int, default=os.cpu_count(),
+                       help='Worker processes for --sites (default: number of CPUs)')
+    parser.add_argument('--append', action='store_true',
+                       help='Extend existing outputs with the days after their last date through --end')
+    parser.add_argument('--engine', choices=ENGINES, default='loop',
+                       help='Volume generation engine (vectorized is much faster on long ranges)')
+    parser.add_argument('--seed-compat', action='store_true',
+                       help='Draw from the legacy global np.random sequence with the heuristic SLA model, '
+                            'reproducing the original output byte for byte')
+    parser.add_argument('--trend-start', type=_parse_date,
+                       help='Origin of long-run trends (default --start); set to a full run\'s start to regenerate a slice of it')
+    parser.add_argument('--sla-model', choices=SLA_MODELS,
+                       help='Derive daily SLA from Erlang C/A queueing math, a discrete-event simulation or the original linear heuristic '
+                            '(default erlang; heuristic with --seed-compat)')
+    parser.add_argument('--erlang-cache', type=Path,
+                       help='.npz file of memoized Erlang staffing solves, loaded if present and updated after the run')
+    parser.add_argument('--ensemble', type=int, metavar='N',
+                       help=f'Generate N Monte Carlo realizations and write per-day P10/P50/P90 bands '
+                            f'to {ENSEMBLE_FILENAME} instead of the regular datasets')
+    parser.add_argument('--ensemble-full', action='store_true',
+                       help=f'With --ensemble, also write every member to the {ENSEMBLE_DIRNAME}/ npy bundle')
+    parser.add_argument('--interval-minutes', type=int, choices=INTERVAL_MINUTES, default=60,
+                       help='Volume interval length; 15 or 30 split each hour along an intra-hour '
+                            'arrival shape (default 60, hourly records)')
+    parser.add_argument('--partition', choices=PARTITION_MODES, default='none',
+                       help=f"'month' writes volume, staffing and SLA records as monthly files with a "
+                            f"{MANIFEST_FILENAME} byte-offset index for range reads")
+    parser.add_argument('--events', type=Path,
+                       help=f'JSON/YAML anomaly event catalog replacing the built-in one '
+                            f'(see scripts/events.example.json); events are indexed in {ANOMALY_INDEX_FILENAME}')
+    parser.add_argument('--pipeline', action='store_true',
+                       help='Generate in blocks of --chunk-days days and write them through a bounded '
+                            'queue to writer threads, reporting rows/sec (records held: a few blocks)')
+    parser.add_argument('--chunk-days', type=int, default=DEFAULT_CHUNK_DAYS, metavar='N',
+                       help=f'Days per block of the vectorized volume kernel and --pipeline '
+                            f'(default {DEFAULT_CHUNK_DAYS})')
+    parser.add_argument('--writer-threads', type=int, default=DEFAULT_WRITER_THREADS, metavar='N',
+                       help=f'Threads encoding and flushing --pipeline blocks (default {DEFAULT_WRITER_THREADS})')
+    parser.add_argument('--compress', choices=COMPRESSIONS, default='none', dest='compression',
+                       help="'gzip' writes record datasets as .ndjson.gz, one gzip member per block "
+                            "(implies --pipeline; requires --json-format ndjson)")
+    parser.add_argument('--forecast-days', type=int, default=0, metavar='N',
+                       help=f'Fit a regression to the written volume history and forecast N days '
+                            f'ahead to {FORECAST_FILENAME}, with confidence bands')
+    parser.add_argument('--forecast-confidence', type=float, default=FORECAST_CONFIDENCE,
+                       help=f'Coverage of the forecast bands (default {FORECAST_CONFIDENCE})')
+    parser.add_argument('--sweep', action='store_true',
+                       help=f'Write a what-if table of required FTEs and annual cost over a grid of '
+                            f'deflection rate, AHT, shrinkage and SLA target to {SWEEP_FILENAME}')
+    for axis, flag, unit in (('deflectionRate', '--sweep-deflection', 'rates'),
+                             ('ahtMinutes', '--sweep-aht', 'minutes'),
+                             ('shrinkage', '--sweep-shrinkage', 'shares'),
+                             ('slaTarget', '--sweep-sla', 'targets')):
+        parser.add_argument(flag, type=_parse_grid_axis, dest=f'sweep_{axis}', metavar='GRID',
+                           help=f"Sweep {unit} as 'a,b,c' or 'start:stop:step' (implies --sweep)")
+    parser.add_argument('--cache', action='store_true',
+                       help=f'Reuse datasets whose inputs are unchanged since the last --cache run '
+                            f'(content hashes and aggregates in <output>/{CACHE_DIRNAME}/)')
+    parser.add_argument('--sim-workers', type=int, default=1,
+                       help='Worker processes for --sla-model simulation (default 1)')
+    parser.add_argument('--scheduler', choices=SCHEDULERS, default='static',
+                       help="Shift planning: 'static' uses the configured shifts, 'greedy' or 'milp' "
+                            "re-plan each day's shift windows and headcounts to fit hourly demand")
+    parser.add_argument('--staffing-model', choices=STAFFING_MODELS, default='shift',
+                       help="'shift' draws absence counts per shift; 'agent' simulates every agent's "
+                            f"PTO, sick days and training and saves the bitmaps to {ROSTER_DIRNAME}/")
+    parser.add_argument('--profile', action='store_true',
+                       help=f'Record per-stage wall/CPU time, record counts and allocations in {PROFILE_REPORT_FILENAME}')
+    parser.add_argument('--cprofile', action='append', choices=PROFILE_STAGES, default=[],
+                       metavar='STAGE', dest='cprofile_stages',
+                       help=f"Run a stage under cProfile and dump profile_<stage>.prof (implies --profile; "
+                            f"repeatable; one of {', '.join(PROFILE_STAGES)})")
 
     args = parser.parse_args()
-
-    # Set random seed
-    np.random.seed(args.seed)
-    random.seed(args.seed)
+    if args.end < args.start:
+        parser.error('--end must not be before --start')
+    if args.sla_model is None:
+        args.sla_model = 'heuristic' if args.seed_compat else 'erlang'
+    elif args.seed_compat and args.sla_model != 'heuristic':
+        parser.error('--seed-compat reproduces the original output, which uses the heuristic SLA model; '
+                     f'it cannot be combined with --sla-model {args.sla_model}')
+    if args.compression != 'none':
+        args.pipeline = True
+        if args.json_format != 'ndjson':
+            parser.error('--compress requires --json-format ndjson')
+    events = None
+    if args.events:
+        if args.append:
+            parser.error('--events cannot be combined with --append (the catalog of the extended run is kept)')
+        try:
+            events = load_event_catalog(args.events)
+        except (OSError, ValueError) as error:
+            parser.error(str(error))
+    if args.chunk_days < 1 or args.writer_threads < 1:
+        parser.error('--chunk-days and --writer-threads must be at least 1')
+    if args.pipeline and (args.partition != 'none' or args.output_format == 'columnar'):
+        parser.error('--pipeline cannot be combined with --partition or --format columnar')
+
+    generator_kwargs = {
+        'engine': args.engine,
+        'seed_compat': args.seed_compat,
+        'start_date': args.start,
+        'end_date': args.end,
+        'json_format': args.json_format,
+        'output_format': args.output_format,
+        'columnar_backend': args.columnar_backend,
+        'trend_start': args.trend_start,
+        'profile': args.profile,
+        'cprofile_stages': args.cprofile_stages,
+        'sla_model': args.sla_model,
+        'erlang_cache': args.erlang_cache,
+        'scheduler': args.scheduler,
+        'staffing_model': args.staffing_model,
+        'sim_workers': args.sim_workers,
+        'interval_minutes': args.interval_minutes,
+        'partition': args.partition,
+        'cache': args.cache,
+        'pipeline': args.pipeline,
+        'chunk_days': args.chunk_days,
+        'writer_threads': args.writer_threads,
+        'compression': args.compression,
+        'events': events
+    }
+
+    if args.ensemble is not None:
+        if args.ensemble < 1:
+            parser.error('--ensemble must be at least 1')
+        if args.sites or args.append:
+            parser.error('--ensemble cannot be combined with --sites or --append')
+    elif args.ensemble_full:
+        parser.error('--ensemble-full requires --ensemble N')
+    if args.cache and args.seed_compat:
+        parser.error('--cache requires per-day random streams and cannot be combined with --seed-compat')
+    if args.forecast_days < 0:
+        parser.error('--forecast-days must not be negative')
+    if args.forecast_days and args.ensemble is not None:
+        parser.error('--forecast-days cannot be combined with --ensemble')
+    if not 0 < args.forecast_confidence < 1:
+        parser.error('--forecast-confidence must be between 0 and 1')
+    sweep_grid = {axis: getattr(args, f'sweep_{axis}') for axis in SWEEP_AXES
+                  if getattr(args, f'sweep_{axis}') is not None}
+    if sweep_grid:
+        args.sweep = True
+    if args.sweep:
+        if args.ensemble is not None:
+            parser.error('--sweep cannot be combined with --ensemble')
+        try:
+            sweep_grid = validate_grid(sweep_grid)
+        except ValueError as error:
+            parser.error(str(error))
+
+    if args.sites:
+        if args.append:
+            parser.error('--append cannot be combined with --sites')
+        sites = load_site_config(args.sites)
+        print(f"🏢 Generating {len(sites)} sites with {args.workers} workers...")
+        output_dir = Path(args.output)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        generate_sites(sites, output_dir, args.seed, args.workers, generator_kwargs)
+        if args.forecast_days or args.sweep:
+            generators = []
+            for site in sites:
+                generator = WFMDataGenerator(seed=args.seed, **generator_kwargs)
+                generator.apply_site_config(site)
+                generator.output_dir = output_dir / site['name']
+                generators.append(generator)
+            if args.forecast_days:
+                forecast_outputs(generators, args.forecast_days, args.forecast_confidence)
+            if args.sweep:
+                for generator in generators:
+                    generator.generate_sweep(sweep_grid)
+        print(f"\n🎉 Successfully generated {len(sites)} sites in {output_dir}")
+        return 0
 
     # Initialize generator
-    generator = WFMDataGenerator()
+    generator = WFMDataGenerator(seed=args.seed, **generator_kwargs)
     if args.output != 'public/data':
         generator.output_dir = Path(args.output)
         generator.output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Generate all data
-    success = generator.generate_all_data()
+    if args.ensemble is not None:
+        generator.generate_ensemble(args.ensemble, full_output=args.ensemble_full)
+        print(f"\n🎉 Ensemble saved to: {generator.output_dir}")
+        return 0
+
+    # Generate all data (or just the missing days)
+    if args.append:
+        try:
+            success = generator.append_all_data()
+        except (FileNotFoundError, ValueError) as error:
+            print(f"❌ Cannot append: {error}")
+            return 1
+    else:
+        success = generator.generate_all_data()
+    if success and args.forecast_days:
+        generator.generate_forecast(args.forecast_days, args.forecast_confidence)
+    if success and args.sweep:
+        generator.generate_sweep(sweep_grid)
 
     if success:
         print("\n🎉 Successfully generated all WFM.ai synthetic data!")
         print(f"📁 Files saved to: {generator.output_dir}")
         print("\n📊 Generated datasets:")
-        print("   • historical_volume.json - 12 months of hourly contact volumes")
+        print("   • historical_volume.json - Hourly contact volumes")
         print("   • deflection_history.json - AI deflection improvements over time")
         print("   • staffing_schedules.json - Daily staffing with PTO/sick/training")
         print("   • sla_performance.json - Daily SLA performance tracking")
         print("   • cost_data.json - Cost analysis and industry benchmarks")
         print("   • summary_stats.json - Key metrics and insights")
+        print("   • anomaly_index.json - Anomaly events by date and type")
         print("\n🚀 Ready to power your WFM.ai prototype with realistic data!")
     else:
         print("❌ Data generation failed!")
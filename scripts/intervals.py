@@ -0,0 +1,150 @@
+"""
+Sub-hourly volume intervals for the WFM.ai synthetic data generator.
+
+Hourly volumes are generated as usual. Each hour's calls, chats, emails and
+contact type counts are then split into 15- or 30-minute intervals with
+conditional binomial draws, following a front-loaded intra-hour arrival
+shape. Interval counts therefore always add up to the hourly counts of an
+hourly run with the same seed.
+
+``IntervalVolume`` holds a whole window of interval volumes as a few
+int32 arrays (days x intervals per day). It only builds dict records when
+iterated, so a multi-year 15-minute history takes a few megabytes instead
+of a list of nested dicts. The block pipeline also uses it for its volume
+blocks (hourly ones too), encoding them straight from the arrays.
+"""
+
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from data_writers import encode_template_block, record_template
+
+# Supported interval lengths in minutes
+INTERVAL_MINUTES = (15, 30, 60)
+
+# Share of an hour's arrivals in each quarter hour: contacts bunch up at the
+# top of the hour (callbacks, meeting ends) and taper towards its end
+INTRA_HOUR_SHAPE = (0.28, 0.26, 0.24, 0.22)
+
+# Columns of an interval volume table, in record order
+VOLUME_COLUMNS = ('calls', 'chats', 'emails', 'billing', 'technical', 'general', 'sales')
+CONTACT_TYPE_COLUMNS = VOLUME_COLUMNS[3:]
+
+
+def intra_hour_shares(interval_minutes: int) -> np.ndarray:
+    """Share of an hour's arrivals falling in each interval of the hour."""
+    if interval_minutes not in INTERVAL_MINUTES:
+        raise ValueError(f"Unsupported interval of {interval_minutes} minutes, "
+                         f"expected one of {INTERVAL_MINUTES}")
+    quarters = np.array(INTRA_HOUR_SHAPE)
+    return quarters.reshape(-1, interval_minutes // 15).sum(axis=1)
+
+
+def split_counts(rng, counts: np.ndarray, shares: np.ndarray) -> np.ndarray:
+    """Split integer counts across intervals with the given shares.
+
+    Uses one binomial draw per interval boundary (a multinomial split done
+    as conditional binomials), which works on whole arrays of counts with
+    both ``np.random.Generator`` and the legacy global state.
+
+    Returns:
+        Array with a trailing axis of len(shares) that sums to counts.
+    """
+    remaining = np.asarray(counts, dtype=np.int64)
+    parts = []
+    left = 1.0
+    for share in shares[:-1]:
+        part = rng.binomial(remaining, min(share / left, 1.0))
+        parts.append(part)
+        remaining = remaining - part
+        left -= share
+    parts.append(remaining)
+    return np.stack(parts, axis=-1)
+
+
+class IntervalVolume:
+    """Compact columnar store of sub-hourly volume for a run of days.
+
+    Args:
+        dates: Day of each row, as 'YYYY-MM-DD' strings.
+        hours: Hour of each interval column.
+        minutes: Minute past the hour of each interval column, or None for
+            hourly records (which have no 'minute' field).
+        columns: One (days x intervals) integer array per VOLUME_COLUMNS entry.
+    """
+
+    __slots__ = ('dates', 'hours', 'minutes', 'columns')
+
+    def __init__(self, dates: List[str], hours: np.ndarray, minutes: Optional[np.ndarray],
+                 columns: Dict[str, np.ndarray]):
+        self.dates = dates
+        self.hours = hours
+        self.minutes = minutes
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.dates) * len(self.hours)
+
+    def __iter__(self) -> Iterator[Dict]:
+        for day in range(len(self.dates)):
+            yield from self.day_records(day)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the count arrays."""
+        return sum(column.nbytes for column in self.columns.values())
+
+    def day_records(self, day: int) -> List[Dict]:
+        """Materialize one day's interval records."""
+        return interval_records(self.dates[day], self.hours, self.minutes,
+                                {name: column[day] for name, column in self.columns.items()})
+
+    def encode(self, json_format: str, first: bool) -> str:
+        """Encode every record like data_writers.encode_record_block, from the arrays."""
+        shape = {'date': '%s', 'hour': '%d'}
+        if self.minutes is not None:
+            shape['minute'] = '%d'
+        shape.update({name: '%d' for name in VOLUME_COLUMNS[:3]})
+        shape['contactType'] = {name: '%d' for name in CONTACT_TYPE_COLUMNS}
+
+        per_day = len(self.hours)
+        fields = [[date for date in self.dates for _ in range(per_day)],
+                  np.asarray(self.hours).tolist() * len(self.dates)]
+        if self.minutes is not None:
+            fields.append(np.asarray(self.minutes).tolist() * len(self.dates))
+        fields += [np.asarray(self.columns[name], dtype=np.int64).ravel().tolist()
+                   for name in VOLUME_COLUMNS]
+        return encode_template_block(record_template(shape, json_format), zip(*fields),
+                                     json_format, first)
+
+
+def interval_records(date_str: str, hours: Sequence[int], minutes: Optional[Sequence[int]],
+                     columns: Dict[str, np.ndarray]) -> List[Dict]:
+    """Volume records of one day from its per-interval count arrays (hourly if minutes is None)."""
+    values = {name: np.asarray(column).tolist() for name, column in columns.items()}
+    if minutes is None:
+        return [
+            {
+                'date': date_str,
+                'hour': hour,
+                'calls': values['calls'][i],
+                'chats': values['chats'][i],
+                'emails': values['emails'][i],
+                'contactType': {name: values[name][i] for name in CONTACT_TYPE_COLUMNS}
+            }
+            for i, hour in enumerate(np.asarray(hours).tolist())
+        ]
+    return [
+        {
+            'date': date_str,
+            'hour': hour,
+            'minute': minute,
+            'calls': values['calls'][i],
+            'chats': values['chats'][i],
+            'emails': values['emails'][i],
+            'contactType': {name: values[name][i] for name in CONTACT_TYPE_COLUMNS}
+        }
+        for i, (hour, minute) in enumerate(zip(np.asarray(hours).tolist(),
+                                               np.asarray(minutes).tolist()))
+    ]
@@ -0,0 +1,164 @@
+"""
+Month-partitioned record output for the WFM.ai synthetic data generator.
+
+With ``--partition month`` each date-keyed record dataset is written as one
+file per calendar month, e.g. ``historical_volume/2024-03.json``, instead of
+a single multi-year file. A manifest (``partitions.json``) lists every
+partition with its date range and record count, and indexes the byte span
+of each day's records inside the partition file:
+
+    offsets[i] = [start, end)  for the day firstDate + i
+
+A client answering a one-day or one-week query fetches only the covering
+partitions, or just the indexed bytes with an HTTP Range request. For JSON
+arrays the span runs from the first record's opening brace to the last
+record's closing brace, so ``'[' + text + ']'`` parses; for NDJSON it is a
+run of whole lines.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from data_writers import append_json_records, open_records, records_filename, write_json_records
+
+PARTITION_MODES = ('none', 'month')
+
+MANIFEST_FILENAME = 'partitions.json'
+
+
+def partition_key(date_str: str) -> str:
+    """Monthly partition of a 'YYYY-MM-DD' date, e.g. '2024-03'."""
+    return date_str[:7]
+
+
+def _group_by_month(records: Iterable[Dict]) -> Iterator[Tuple[str, Iterator[Dict]]]:
+    """Split a date-ordered record stream into consecutive runs per month.
+
+    Each run must be consumed before the next one is requested.
+    """
+    records = iter(records)
+    pending = next(records, None)
+    while pending is not None:
+        month = partition_key(pending['date'])
+
+        def run() -> Iterator[Dict]:
+            nonlocal pending
+            while pending is not None and partition_key(pending['date']) == month:
+                yield pending
+                pending = next(records, None)
+
+        yield month, run()
+
+
+def _day_offsets(dates: List[str], spans: List[Tuple[int, int]]) -> List[List[int]]:
+    """Byte span of each day's records from per-record spans (dates in order)."""
+    offsets: List[List[int]] = []
+    previous = None
+    for date_str, (start, end) in zip(dates, spans):
+        if date_str == previous:
+            offsets[-1][1] = end
+        else:
+            offsets.append([start, end])
+            previous = date_str
+    return offsets
+
+
+def write_partitioned_records(directory: Path, records: Iterable[Dict], json_format: str = 'pretty',
+                              previous: Optional[List[Dict]] = None) -> Tuple[int, List[Dict]]:
+    """Stream date-ordered records into one file per month.
+
+    Args:
+        directory: Partition directory of the dataset (created if missing).
+        records: Records with a 'date' key, in date order and with no gaps
+            between days.
+        json_format: One of data_writers.JSON_FORMATS.
+        previous: Manifest partitions of the dataset when appending. New
+            days of the last partition's month are appended to its file in
+            place; otherwise the directory is cleared first.
+
+    Returns:
+        Number of records written and the dataset's manifest partitions.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    partitions = [dict(p) for p in previous] if previous else []
+    if not previous:
+        for path in directory.glob(records_filename('*.json', json_format)):
+            path.unlink()
+
+    count = 0
+    for month, run in _group_by_month(records):
+        dates: List[str] = []
+        spans: List[Tuple[int, int]] = []
+
+        def tracked(month_records: Iterator[Dict]) -> Iterator[Dict]:
+            for record in month_records:
+                dates.append(record['date'])
+                yield record
+
+        filename = records_filename(f"{month}.json", json_format)
+        path = directory / filename
+        extend = bool(partitions) and partitions[-1]['month'] == month
+        if extend:
+            written = append_json_records(path, tracked(run), json_format, spans)
+            partition = partitions[-1]
+            partition['records'] += written
+            partition['offsets'] = partition['offsets'] + _day_offsets(dates, spans)
+        else:
+            written = write_json_records(path, tracked(run), json_format, spans)
+            partition = {
+                'month': month,
+                'path': f"{directory.name}/{filename}",
+                'firstDate': dates[0],
+                'records': written,
+                'offsets': _day_offsets(dates, spans)
+            }
+            partitions.append(partition)
+        partition['lastDate'] = dates[-1]
+        partition['bytes'] = path.stat().st_size
+        count += written
+    return count, partitions
+
+
+def iter_records(directory: Path, filename: str, json_format: str = 'pretty',
+                 partitioned: bool = False, compression: str = 'none') -> Iterator[Dict]:
+    """Read back a JSON record dataset one file (or monthly partition) at a time.
+
+    Args:
+        directory: Output directory.
+        filename: Dataset name, e.g. 'historical_volume.json'.
+        json_format: The style it was written in.
+        partitioned: Read the partitions listed in the manifest instead of
+            a single file.
+        compression: 'gzip' for .gz files written by the block pipeline.
+    """
+    directory = Path(directory)
+    if partitioned:
+        manifest = read_manifest(directory)
+        paths = [directory / partition['path'] for partition
+                 in manifest['datasets'][Path(filename).stem]['partitions']]
+    else:
+        paths = [directory / records_filename(filename, json_format, compression)]
+
+    for path in paths:
+        with open_records(path) as f:
+            if json_format == 'ndjson':
+                yield from (json.loads(line) for line in f if line.strip())
+            else:
+                yield from json.load(f)
+
+
+def read_manifest(directory: Path) -> Dict[str, Any]:
+    """Load the partition manifest of an output directory (empty if none)."""
+    path = Path(directory) / MANIFEST_FILENAME
+    if not path.exists():
+        return {'datasets': {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def manifest_last_date(manifest: Dict[str, Any], dataset: str) -> Optional[str]:
+    """Last date covered by a dataset's partitions, if any."""
+    partitions = manifest['datasets'].get(dataset, {}).get('partitions')
+    return partitions[-1]['lastDate'] if partitions else None
@@ -0,0 +1,234 @@
+"""
+Chunked block pipeline for very large WFM.ai synthetic datasets.
+
+With ``--pipeline`` the generator produces records in blocks of a fixed
+number of days (the vectorized volume kernel runs once per block) and hands
+each block to a BlockWriter. The writer passes blocks through a bounded
+queue to a small pool of writer threads, which serialize and optionally
+gzip them and flush them to the file strictly in block order. The producer
+blocks while the queue is full, so at most a few blocks are ever held in
+memory, however many rows the run writes.
+
+Blocks are encoded exactly as write_json_records would write the same
+records, so pipeline output is byte-identical to a regular run. Volume
+blocks arrive as IntervalVolume arrays and are formatted straight from
+them, without building a dict per row. With gzip
+compression (NDJSON only) every block is its own gzip member; concatenated
+members are a valid .gz file that gzip, zcat and gzip.open read as one
+stream, and --append adds members at the end.
+
+Rows per second are reported on stderr while each dataset is written, so
+the reports also reach the terminal from --sites worker processes, whose
+stdout is discarded. The final rate of each dataset is printed to stdout
+(by the parent process for --sites).
+"""
+
+import gzip
+import queue
+import sys
+import threading
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+from data_writers import array_closing, encode_record_block, reopen_json_array
+from intervals import IntervalVolume
+
+DEFAULT_CHUNK_DAYS = 32         # Days generated per block
+DEFAULT_WRITER_THREADS = 2
+QUEUE_BLOCKS_PER_WRITER = 2     # Encoded or waiting blocks allowed per writer thread
+GZIP_LEVEL = 6                  # Favors throughput over ratio
+REPORT_SECONDS = 5.0            # Interval between throughput reports
+
+
+def batched(items: Iterable, size: int) -> Iterator[List]:
+    """Split an iterable into lists of size items (the last may be shorter)."""
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class ThroughputMeter:
+    """Thread-safe row counter that reports rows/sec while a dataset is written.
+
+    Progress lines go to stderr; finish prints the summary to stdout.
+
+    Args:
+        label: Name shown in the reports (e.g. the file name).
+        interval: Seconds between progress lines.
+    """
+
+    def __init__(self, label: str, interval: float = REPORT_SECONDS):
+        self.label = label
+        self.interval = interval
+        self.rows = 0
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._reported = self._started
+        self.elapsed = 0.0
+
+    def add(self, rows: int):
+        """Count rows flushed to disk, printing a progress line when due."""
+        with self._lock:
+            self.rows += rows
+            now = time.perf_counter()
+            if now - self._reported < self.interval:
+                return
+            self._reported = now
+            rate = self.rows / (now - self._started)
+        print(f"   ⏩ {self.label}: {self.rows:,} rows ({rate:,.0f} rows/s)", file=sys.stderr)
+
+    @property
+    def rate(self) -> float:
+        """Average rows/sec of a finished write."""
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        """One-line report of a finished write."""
+        return f"{self.label}: {self.rows:,} rows in {self.elapsed:.1f}s ({self.rate:,.0f} rows/s)"
+
+    def finish(self) -> float:
+        """Stop the clock, print the summary and return the average rows/sec."""
+        self.elapsed = time.perf_counter() - self._started
+        print(f"   ⏱️  {self.summary()}")
+        return self.rate
+
+
+class _FlushState:
+    """Ordering and error state shared by the writer threads of one write."""
+
+    def __init__(self, file, empty: bool, meter: ThroughputMeter):
+        self.file = file
+        self.empty = empty              # The array had no records before this write
+        self.meter = meter
+        self.next_block = 0
+        self.rows = 0
+        self.error: Optional[BaseException] = None
+        self.turn = threading.Condition()
+
+    def fail(self, error: BaseException):
+        with self.turn:
+            if self.error is None:
+                self.error = error
+            self.turn.notify_all()
+
+
+class BlockWriter:
+    """Write record blocks to one file through a bounded queue and writer threads.
+
+    Args:
+        filepath: Destination file.
+        json_format: One of data_writers.JSON_FORMATS.
+        compression: 'none', or 'gzip' (NDJSON only) to compress each block.
+        threads: Writer threads that encode, compress and flush blocks.
+        label: Name in the throughput reports (default: the file name).
+
+    Attributes:
+        meter: ThroughputMeter of the last write.
+    """
+
+    def __init__(self, filepath: Path, json_format: str = 'ndjson', compression: str = 'none',
+                 threads: int = DEFAULT_WRITER_THREADS, label: Optional[str] = None):
+        if compression == 'gzip' and json_format != 'ndjson':
+            raise ValueError("gzip compression requires NDJSON records")
+        if threads < 1:
+            raise ValueError("BlockWriter needs at least one writer thread")
+        self.filepath = Path(filepath)
+        self.json_format = json_format
+        self.compression = compression
+        self.threads = threads
+        self.label = label or self.filepath.name
+        self.meter: Optional[ThroughputMeter] = None
+
+    def write(self, blocks: Iterable[Sequence[Dict]], append: bool = False) -> int:
+        """Write every block in order, appending to an existing file if asked.
+
+        A block is a list of records or an IntervalVolume.
+
+        Returns:
+            Number of records written.
+
+        Raises:
+            Whatever a writer thread raised while encoding or flushing.
+        """
+        array = self.json_format != 'ndjson'
+        mode = ('r+b' if array else 'ab') if append else 'wb'
+        meter = self.meter = ThroughputMeter(self.label)
+        with open(self.filepath, mode) as f:
+            empty = True
+            if array:
+                if append:
+                    empty = reopen_json_array(f, self.json_format)
+                else:
+                    f.write(b'[')
+            state = _FlushState(f, empty, meter)
+
+            work: queue.Queue = queue.Queue(maxsize=self.threads * QUEUE_BLOCKS_PER_WRITER)
+            workers = [threading.Thread(target=self._work, args=(work, state), daemon=True)
+                       for _ in range(self.threads)]
+            for worker in workers:
+                worker.start()
+            try:
+                sequence = 0
+                for block in blocks:
+                    if state.error is not None:
+                        break
+                    if block:  # Empty blocks would shift which record opens the array
+                        work.put((sequence, block))  # Waits while the writers are behind
+                        sequence += 1
+            finally:
+                for _ in workers:
+                    work.put(None)
+                for worker in workers:
+                    worker.join()
+
+            if state.error is not None:
+                raise state.error
+            if array:
+                f.write(array_closing(self.json_format, empty and state.rows == 0).encode())
+        meter.finish()
+        return state.rows
+
+    def _encode(self, block: Sequence[Dict], first: bool) -> bytes:
+        if isinstance(block, IntervalVolume):
+            data = block.encode(self.json_format, first).encode()
+        else:
+            data = encode_record_block(block, self.json_format, first).encode()
+        if self.compression == 'gzip':
+            data = gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+        return data
+
+    def _work(self, work: queue.Queue, state: _FlushState):
+        """Writer thread: encode blocks as they arrive, flush them in sequence."""
+        while True:
+            item = work.get()
+            if item is None:
+                return
+            sequence, block = item
+            if state.error is not None:
+                continue  # Keep draining so the producer never blocks
+            try:
+                data = self._encode(block, first=state.empty and sequence == 0)
+            except BaseException as error:
+                state.fail(error)
+                continue
+
+            with state.turn:
+                while state.next_block != sequence and state.error is None:
+                    state.turn.wait()
+                if state.error is not None:
+                    continue
+                try:
+                    state.file.write(data)
+                except BaseException as error:
+                    state.error = error
+                    state.turn.notify_all()
+                    continue
+                state.next_block += 1
+                state.rows += len(block)
+                state.turn.notify_all()
+            state.meter.add(len(block))
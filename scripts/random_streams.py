@@ -0,0 +1,128 @@
+"""
+Random number streams for the WFM.ai synthetic data generator.
+
+Every dataset draws from its own family of ``np.random.Generator`` (PCG64)
+substreams, one per day (or per month for monthly datasets). A substream is
+addressed directly by ``SeedSequence(seed, spawn_key=(dataset, ordinal))``,
+where the ordinal is an absolute day or month number. No stream depends on
+how many numbers were drawn before it, so any dataset or date range can be
+regenerated on its own, or in parallel, with the same numbers as a full run.
+
+``LegacyRandom`` exposes the same interface on top of the global
+``np.random`` state. It reproduces the output of the original generator,
+which drew every dataset from one shared sequence.
+"""
+
+from datetime import datetime
+from typing import Iterable, Optional
+
+import numpy as np
+
+# Stable stream ids; changing these changes every generated number
+STREAM_IDS = {
+    'volume': 0,
+    'deflection': 1,
+    'staffing': 2,
+    'sla': 3,
+    'simulation': 4,
+    'interval': 5,
+    'ensemble': 6,
+    'roster': 7,
+}
+
+
+class _LegacyAdapter:
+    """Generator-style method names over the global np.random state."""
+
+    def normal(self, *args, **kwargs):
+        return np.random.normal(*args, **kwargs)
+
+    def binomial(self, *args, **kwargs):
+        return np.random.binomial(*args, **kwargs)
+
+    def uniform(self, *args, **kwargs):
+        return np.random.uniform(*args, **kwargs)
+
+    def integers(self, *args, **kwargs):
+        return np.random.randint(*args, **kwargs)
+
+    def lognormal(self, *args, **kwargs):
+        return np.random.lognormal(*args, **kwargs)
+
+    def exponential(self, *args, **kwargs):
+        return np.random.exponential(*args, **kwargs)
+
+    def choice(self, *args, **kwargs):
+        return np.random.choice(*args, **kwargs)
+
+
+class RandomStreams:
+    """Counter-addressed PCG64 substreams, one per dataset and day or month."""
+
+    def __init__(self, seed: int):
+        self.seed = seed
+
+    def _stream(self, dataset: str, ordinal: int) -> np.random.Generator:
+        key = np.random.SeedSequence(self.seed, spawn_key=(STREAM_IDS[dataset], ordinal))
+        return np.random.Generator(np.random.PCG64(key))
+
+    def day(self, dataset: str, date: datetime) -> np.random.Generator:
+        """Stream for one dataset on one calendar day."""
+        return self._stream(dataset, date.toordinal())
+
+    def month(self, dataset: str, year: int, month: int) -> np.random.Generator:
+        """Stream for one dataset in one calendar month."""
+        return self._stream(dataset, year * 12 + month - 1)
+
+    def initial(self, dataset: str, start: datetime) -> np.random.Generator:
+        """Stream for a dataset's one-off draws before its first day.
+
+        Used for state that later days evolve, such as the agent roster's
+        hiring, so it is fixed by the start date alone.
+        """
+        key = np.random.SeedSequence(self.seed, spawn_key=(STREAM_IDS[dataset], start.toordinal(), 0))
+        return np.random.Generator(np.random.PCG64(key))
+
+    def ensemble(self, dataset: str, start: datetime, member: int) -> np.random.Generator:
+        """Stream for one Monte Carlo ensemble member's draws of a dataset.
+
+        A member draws its whole window (days x hours) from this stream at
+        once. Members are keyed by index, so member i is the same for any
+        ensemble size.
+        """
+        key = np.random.SeedSequence(self.seed, spawn_key=(STREAM_IDS['ensemble'],
+                                                           STREAM_IDS[dataset],
+                                                           start.toordinal(), member))
+        return np.random.Generator(np.random.PCG64(key))
+
+    def daily_normal(self, dataset: str, dates: Iterable[datetime], loc: float, scale: float,
+                     size: Optional[int] = None) -> np.ndarray:
+        """Normal draws for a run of days, one row per day from that day's stream."""
+        return np.array([self.day(dataset, date).normal(loc, scale, size=size) for date in dates])
+
+
+class LegacyRandom:
+    """Every stream is the global np.random state, consumed in call order."""
+
+    def __init__(self, seed: int):
+        self.seed = seed
+        np.random.seed(seed)
+        self._adapter = _LegacyAdapter()
+
+    def day(self, dataset: str, date: datetime) -> _LegacyAdapter:
+        return self._adapter
+
+    def month(self, dataset: str, year: int, month: int) -> _LegacyAdapter:
+        return self._adapter
+
+    def initial(self, dataset: str, start: datetime) -> _LegacyAdapter:
+        return self._adapter
+
+    def ensemble(self, dataset: str, start: datetime, member: int) -> _LegacyAdapter:
+        return self._adapter
+
+    def daily_normal(self, dataset: str, dates: Iterable[datetime], loc: float, scale: float,
+                     size: Optional[int] = None) -> np.ndarray:
+        """Normal draws for a run of days in one batch (same numbers as a per-day loop)."""
+        shape = (len(dates),) if size is None else (len(dates), size)
+        return np.random.normal(loc, scale, size=shape)
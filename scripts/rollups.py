@@ -0,0 +1,177 @@
+"""
+Pre-aggregated rollup files for the WFM.ai dashboard.
+
+The dashboard charts daily, weekly and monthly totals and a typical day's
+hourly shape. Reducing thousands of hourly records
+in the browser for each of these is slow, so the generator writes them to
+small JSON documents in ``rollups/``:
+
+- daily.json:          totals per day by channel and contact type, with SLA and staffing
+- weekly.json:         the same per ISO week (Monday start)
+- monthly.json:        per month, with SLA statistics and the deflection rate
+- hourly_profile.json: average contacts per weekday and operating hour
+
+The anomaly calendar is anomaly_index.json (see events.anomaly_index).
+
+Everything is computed from the generator's DailyAggregates. When a run
+is appended, the existing daily rollup and hourly profile sums are merged
+with the new days, so no raw records are reread.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from data_writers import write_json_document
+from intervals import CONTACT_TYPE_COLUMNS
+
+ROLLUP_DIRNAME = 'rollups'
+
+ROLLUP_FILES = {
+    'daily': 'daily.json',
+    'weekly': 'weekly.json',
+    'monthly': 'monthly.json',
+    'hourlyProfile': 'hourly_profile.json',
+}
+
+WEEKDAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+_SUM_KEYS = ('totalVolume', 'calls', 'chats', 'emails')
+
+
+def daily_records(dates: Sequence[str], totals: np.ndarray, sla: Sequence[float],
+                  scheduled: np.ndarray, actual: np.ndarray) -> List[Dict]:
+    """One rollup record per day.
+
+    Args:
+        dates: Day of each row, as 'YYYY-MM-DD' strings.
+        totals: Daily totals per channel and contact type (days x
+            intervals.VOLUME_COLUMNS).
+        sla: Daily SLA actuals.
+        scheduled: Scheduled agents per day.
+        actual: Agents actually working per day.
+    """
+    records = []
+    for date_str, row, day_sla, day_scheduled, day_actual in zip(
+            dates, totals.tolist(), list(sla), scheduled.tolist(), actual.tolist()):
+        calls, chats, emails = row[:3]
+        records.append({
+            'date': date_str,
+            'totalVolume': calls + chats + emails,
+            'calls': calls,
+            'chats': chats,
+            'emails': emails,
+            'byType': dict(zip(CONTACT_TYPE_COLUMNS, row[3:])),
+            'sla': day_sla,
+            'scheduled': day_scheduled,
+            'actual': day_actual
+        })
+    return records
+
+
+def _daily_frame(daily: Sequence[Dict]) -> pd.DataFrame:
+    return pd.DataFrame({
+        'date': pd.to_datetime([r['date'] for r in daily]),
+        **{key: [r[key] for r in daily] for key in _SUM_KEYS},
+        **{name: [r['byType'][name] for r in daily] for name in CONTACT_TYPE_COLUMNS},
+        'sla': [r['sla'] for r in daily],
+    })
+
+
+def period_records(daily: Sequence[Dict], period: str, sla_target: float = 0.80,
+                   deflection_by_month: Optional[Dict[str, float]] = None) -> List[Dict]:
+    """Weekly ('week') or monthly ('month') totals from daily rollup records.
+
+    Weeks start on Monday; partial weeks and months at the ends of the
+    history are included, with 'days' giving how many days they cover.
+    Monthly records add SLA statistics and, when given, the month's
+    overall deflection rate.
+    """
+    frame = _daily_frame(daily)
+    if period == 'week':
+        key = (frame['date'] - pd.to_timedelta(frame['date'].dt.weekday, unit='D')
+               ).dt.strftime('%Y-%m-%d')
+        key_name = 'weekStart'
+    elif period == 'month':
+        key = frame['date'].dt.strftime('%Y-%m')
+        key_name = 'month'
+    else:
+        raise ValueError(f"Unknown rollup period '{period}', expected 'week' or 'month'")
+
+    grouped = frame.assign(key=key, below=frame['sla'] < sla_target).groupby('key', sort=True)
+    sums = grouped[list(_SUM_KEYS) + list(CONTACT_TYPE_COLUMNS)].sum()
+    days = grouped.size()
+    sla_mean = grouped['sla'].mean()
+
+    records = []
+    for period_key in sums.index:
+        row = sums.loc[period_key]
+        record = {
+            key_name: period_key,
+            'days': int(days[period_key]),
+            **{k: int(row[k]) for k in _SUM_KEYS},
+            'byType': {name: int(row[name]) for name in CONTACT_TYPE_COLUMNS},
+            'avgDailyVolume': int(round(row['totalVolume'] / days[period_key])),
+            'avgSLA': round(float(sla_mean[period_key]), 3),
+        }
+        if period == 'month':
+            record['minSLA'] = round(float(grouped['sla'].min()[period_key]), 3)
+            record['daysBelowTarget'] = int(grouped['below'].sum()[period_key])
+            if deflection_by_month is not None and period_key in deflection_by_month:
+                record['deflectionRate'] = deflection_by_month[period_key]
+        records.append(record)
+    return records
+
+
+def hourly_profile(dates: Sequence[str], hours: Sequence[int], hourly_volume: np.ndarray,
+                   previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Average contacts per weekday and operating hour.
+
+    The document keeps the per-weekday sums and day counts next to the
+    averages, so a later append can merge new days into it.
+
+    Args:
+        dates: Day of each row of hourly_volume.
+        hours: Operating hour of each column.
+        hourly_volume: Contacts per day and hour (days x hours).
+        previous: Profile document of the history being extended.
+    """
+    weekday = pd.to_datetime(list(dates)).weekday.values
+    totals = np.zeros((len(WEEKDAYS), len(hours)), dtype=np.int64)
+    np.add.at(totals, weekday, hourly_volume)
+    days = np.bincount(weekday, minlength=len(WEEKDAYS))
+
+    if previous is not None:
+        if previous['hours'] != list(hours):
+            raise ValueError("Operating hours differ from the existing hourly profile")
+        totals += np.array(previous['totals'], dtype=np.int64)
+        days += np.array(previous['days'], dtype=np.int64)
+
+    average = totals / np.maximum(days, 1)[:, None]
+    overall = totals.sum(axis=0) / max(int(days.sum()), 1)
+    return {
+        'hours': list(hours),
+        'weekdays': list(WEEKDAYS),
+        'days': days.tolist(),
+        'totals': totals.tolist(),
+        'average': np.round(average, 1).tolist(),
+        'overall': np.round(overall, 1).tolist(),
+        'peakHour': f"{hours[int(np.argmax(overall))]:02d}:00" if len(hours) else None
+    }
+
+
+def read_rollup(directory: Path, name: str) -> Any:
+    """Load one rollup document written by write_rollups."""
+    with open(Path(directory) / ROLLUP_FILES[name]) as f:
+        return json.load(f)
+
+
+def write_rollups(directory: Path, rollups: Dict[str, Any], json_format: str = 'pretty'):
+    """Write each rollup document to its file in directory (created if missing)."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for name, document in rollups.items():
+        write_json_document(directory / ROLLUP_FILES[name], document, json_format)
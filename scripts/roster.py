@@ -0,0 +1,298 @@
+"""
+Agent-level roster simulation for the WFM.ai synthetic data generator.
+
+With ``--staffing-model agent`` absences are simulated for every agent
+instead of drawn as binomial counts per shift, so tenure, PTO balances and
+multi-day sick spells are modelled. Agent state lives in NumPy arrays, never
+in per-agent objects:
+
+- ``agents``: one structured row per agent (AGENT_DTYPE) with its home
+  shift, tenure and running PTO balance and absence flags
+- ``pto``, ``sick``, ``training``: agent x day bitmaps packed 8 agents per
+  byte, one row per day (days x ceil(agents / 8) uint8), so 10,000 agents
+  over ten years take about 5 MB per bitmap
+
+Each day every agent is stepped at once:
+
+- Sick spells are a two-state Markov chain: a spell continues with
+  SICK_CONTINUE and starts at the rate that keeps SICK_RATE of agents out on
+  an average day (x1.3 in flu season, with a day-level shock)
+- PTO is taken in blocks the same way, at the seasonal rates of the shift
+  model, and only while the agent's balance lasts. Balances reset each
+  January to an allowance set by tenure (PTO_ALLOWANCE_DAYS)
+- On Tuesdays and Thursdays 2-5 available midday agents train, newest
+  hires first
+
+Day d's shifts take consecutive slices of the roster, so with static shifts
+every agent works their home shift. The shift-level staffing records are a
+reduction of the bitmaps over those slices (shift_counts).
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+STAFFING_MODELS = ('shift', 'agent')
+
+ROSTER_DIRNAME = 'agent_roster'
+ROSTER_META_FILENAME = 'roster.json'
+
+BITMAPS = ('pto', 'sick', 'training')
+
+AGENT_DTYPE = np.dtype([
+    ('agentId', 'i4'),
+    ('homeShift', 'i2'),       # Index into the configured shifts; -1 beyond their headcount
+    ('tenureAtStart', 'f4'),   # Years of tenure on the roster's start date
+    ('ptoAllowance', 'i2'),    # PTO days granted for the current year
+    ('ptoBalance', 'i2'),      # PTO days left in the current year
+    ('sick', '?'),             # Out sick on the last simulated day
+    ('pto', '?'),              # On PTO on the last simulated day
+])
+
+TENURE_MAX_YEARS = 10          # Upper end of the open '5+' tenure band
+PTO_ALLOWANCE_DAYS = ((0, 10), (1, 15), (3, 20), (5, 25))  # (minimum tenure years, days per year)
+PTO_CONTINUE = 0.6             # Chance a PTO block runs another day (mean block 2.5 days)
+SICK_RATE = 0.04               # Share of agents out sick on an average day
+SICK_CONTINUE = 0.5            # Chance a sick spell runs another day (mean spell 2 days)
+FLU_SEASON_MONTHS = (12, 1, 2, 3)
+TRAINING_WEEKDAYS = (1, 3)     # Tuesday, Thursday
+TRAINING_SHIFT = 'midday'
+TRAINING_TENURE_JITTER = 2.0   # Years of noise on tenure when picking trainees
+
+
+def pto_rate(date: datetime) -> float:
+    """Share of agents on PTO on a day (the shift model's seasonal rates)."""
+    if date.month in (7, 8):
+        rate = 0.08
+    elif date.month == 12 and date.day >= 20:
+        rate = 0.15
+    elif date.month == 12:
+        rate = 0.05
+    else:
+        rate = 0.03
+    return rate * 0.5 if date.weekday() >= 5 else rate
+
+
+def _onset(rate: float, persistence: float) -> float:
+    """Daily start probability giving a stationary share of rate for spells
+    that continue with probability persistence."""
+    return rate * (1 - persistence) / (1 - rate)
+
+
+def tenure_bands(by_tenure: Sequence[Dict]) -> List[Tuple[float, float, float]]:
+    """(low, high, weight) years per band from cost_data byTenure entries.
+
+    Labels are 'a-b' or 'a+' ('a+' runs to TENURE_MAX_YEARS); weights are
+    the band's share of the counts.
+    """
+    total = sum(band['count'] for band in by_tenure)
+    bands = []
+    for band in by_tenure:
+        label = band['years']
+        if label.endswith('+'):
+            low, high = float(label[:-1]), float(TENURE_MAX_YEARS)
+        else:
+            low, high = (float(part) for part in label.split('-'))
+        bands.append((low, high, band['count'] / total))
+    return bands
+
+
+def pto_allowance(tenure_years: np.ndarray) -> np.ndarray:
+    """Yearly PTO days for each tenure."""
+    thresholds = np.array([years for years, _ in PTO_ALLOWANCE_DAYS])
+    days = np.array([allowance for _, allowance in PTO_ALLOWANCE_DAYS], dtype=np.int16)
+    return days[np.searchsorted(thresholds, tenure_years, side='right') - 1]
+
+
+def shift_counts(bitmap: np.ndarray, bounds: np.ndarray, agents: int,
+                 chunk_days: int = 256) -> np.ndarray:
+    """Agents flagged in each day's shift slices.
+
+    Args:
+        bitmap: Packed agent x day bitmap (days x ceil(agents / 8)).
+        bounds: Roster positions where each day's shifts start, plus the
+            end of the last shift (days x shifts + 1, ascending).
+        agents: Roster size.
+        chunk_days: Days unpacked at a time, bounding memory to about
+            chunk_days x agents x 4 bytes.
+
+    Returns:
+        Flagged agents per day and shift (days x shifts).
+    """
+    counts = np.empty((len(bitmap), bounds.shape[1] - 1), dtype=np.int64)
+    for lo in range(0, len(bitmap), chunk_days):
+        bits = np.unpackbits(bitmap[lo:lo + chunk_days], axis=1, count=agents)
+        cumulative = np.zeros((len(bits), agents + 1), dtype=np.int32)
+        np.cumsum(bits, axis=1, out=cumulative[:, 1:])
+        edges = np.take_along_axis(cumulative, bounds[lo:lo + chunk_days], axis=1)
+        counts[lo:lo + chunk_days] = np.diff(edges, axis=1)
+    return counts
+
+
+class AgentRoster:
+    """Every agent's state plus the absence bitmaps of the simulated days.
+
+    Args:
+        agents: Structured array of AGENT_DTYPE.
+        start: Date the agents' tenure is measured from.
+        last_date: Last day already simulated (the state in agents is as of
+            its end), or None before the first day.
+    """
+
+    def __init__(self, agents: np.ndarray, start: datetime, last_date: Optional[datetime] = None):
+        self.agents = agents
+        self.start = start
+        self.last_date = last_date
+        self.dates: List[str] = []
+        self._rows: Dict[str, List[np.ndarray]] = {name: [] for name in BITMAPS}
+
+    @classmethod
+    def hire(cls, home_counts: Sequence[int], size: int, by_tenure: Sequence[Dict],
+             start: datetime, rng) -> 'AgentRoster':
+        """Staff a roster of size agents as of start.
+
+        Args:
+            home_counts: Configured headcount of each shift; agents are
+                numbered through the shifts in order, and any beyond their
+                total get homeShift -1.
+            size: Number of agents.
+            by_tenure: cost_data byTenure entries giving the tenure mix.
+            start: Date the tenure is drawn for.
+            rng: Stream for the hiring draws.
+        """
+        bands = tenure_bands(by_tenure)
+        band = rng.choice(len(bands), size=size, p=[weight for _, _, weight in bands])
+        low = np.array([b[0] for b in bands])[band]
+        high = np.array([b[1] for b in bands])[band]
+
+        agents = np.zeros(size, dtype=AGENT_DTYPE)
+        agents['agentId'] = np.arange(size)
+        home = np.repeat(np.arange(len(home_counts)), home_counts)[:size]
+        agents['homeShift'] = -1
+        agents['homeShift'][:len(home)] = home
+        agents['tenureAtStart'] = rng.uniform(low, high)
+
+        # Prorate the first year's allowance to the days left in it
+        allowance = pto_allowance(agents['tenureAtStart'])
+        next_year = datetime(start.year + 1, 1, 1)
+        remaining = (next_year - start).days / (next_year - datetime(start.year, 1, 1)).days
+        agents['ptoAllowance'] = allowance
+        agents['ptoBalance'] = np.rint(allowance * remaining).astype(np.int16)
+        return cls(agents, start)
+
+    def _tenure(self, date: datetime) -> np.ndarray:
+        return self.agents['tenureAtStart'] + (date - self.start).days / 365.25
+
+    def _step(self, date: datetime, rng) -> Tuple[np.ndarray, np.ndarray]:
+        """Advance every agent one day; returns the day's sick and PTO masks."""
+        agents = self.agents
+        if date.month == 1 and date.day == 1:
+            agents['ptoAllowance'] = pto_allowance(self._tenure(date))
+            agents['ptoBalance'] = agents['ptoAllowance']
+
+        sick_rate = SICK_RATE * (1.3 if date.month in FLU_SEASON_MONTHS else 1.0)
+        shock = rng.uniform(0.75, 1.25)
+        draws = rng.uniform(size=(2, len(agents)))
+
+        sick = np.where(agents['sick'], draws[0] < SICK_CONTINUE,
+                        draws[0] < _onset(sick_rate, SICK_CONTINUE) * shock)
+        pto = (~sick & (agents['ptoBalance'] > 0)
+               & np.where(agents['pto'], draws[1] < PTO_CONTINUE,
+                          draws[1] < _onset(pto_rate(date), PTO_CONTINUE)))
+        agents['ptoBalance'] -= pto
+        agents['sick'] = sick
+        agents['pto'] = pto
+        self.last_date = date
+        return sick, pto
+
+    def advance(self, dates: pd.DatetimeIndex, day_rng: Callable[[datetime], object]):
+        """Step through days without recording them (e.g. before the output window)."""
+        for date in dates:
+            self._step(date, day_rng(date))
+
+    def run(self, dates: pd.DatetimeIndex, bounds: np.ndarray, shift_names: Sequence[str],
+            day_rng: Callable[[datetime], object]):
+        """Step through days, recording each day's bitmaps.
+
+        Args:
+            dates: Consecutive days following last_date.
+            bounds: Each day's shift slice boundaries (see shift_counts).
+            shift_names: Shift of each slice.
+            day_rng: Stream for a day's draws.
+        """
+        training_slice = (list(shift_names).index(TRAINING_SHIFT)
+                          if TRAINING_SHIFT in shift_names else None)
+        for date, day_bounds in zip(dates, bounds):
+            rng = day_rng(date)
+            sick, pto = self._step(date, rng)
+
+            training = np.zeros(len(self.agents), dtype=bool)
+            if training_slice is not None and date.weekday() in TRAINING_WEEKDAYS:
+                lo, hi = day_bounds[training_slice], day_bounds[training_slice + 1]
+                trainees = int(rng.integers(2, 6))
+                candidates = lo + np.flatnonzero(~(sick[lo:hi] | pto[lo:hi]))
+                if len(candidates) > trainees:
+                    priority = (self._tenure(date)[candidates]
+                                + rng.uniform(0, TRAINING_TENURE_JITTER, size=len(candidates)))
+                    candidates = candidates[np.argpartition(priority, trainees)[:trainees]]
+                training[candidates] = True
+
+            self.dates.append(date.strftime('%Y-%m-%d'))
+            for name, mask in zip(BITMAPS, (pto, sick, training)):
+                self._rows[name].append(np.packbits(mask))
+
+    def bitmaps(self) -> Dict[str, np.ndarray]:
+        """Packed bitmaps of the days recorded by run (days x ceil(agents / 8))."""
+        width = (len(self.agents) + 7) // 8
+        return {name: np.array(rows, dtype=np.uint8).reshape(len(rows), width)
+                for name, rows in self._rows.items()}
+
+    def save(self, directory: Path, shift_names: Sequence[str], append: bool = False):
+        """Write the agents and bitmaps as an .npy bundle with a roster.json index.
+
+        When appending, the recorded days are added to the existing bitmaps.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        first_date = self.dates[0]
+        for name, bitmap in self.bitmaps().items():
+            if append:
+                bitmap = np.concatenate([np.load(directory / f"{name}.npy"), bitmap])
+            np.save(directory / f"{name}.npy", bitmap)
+        if append:
+            first_date = read_roster_meta(directory)['firstDate']
+        np.save(directory / 'agents.npy', self.agents)
+        with open(directory / ROSTER_META_FILENAME, 'w') as f:
+            json.dump({
+                'agents': len(self.agents),
+                'shifts': list(shift_names),
+                'tenureStart': self.start.strftime('%Y-%m-%d'),
+                'firstDate': first_date,
+                'lastDate': self.dates[-1],
+                'bitmaps': list(BITMAPS),
+                'bitOrder': 'big'
+            }, f, indent=2)
+
+    @classmethod
+    def load(cls, directory: Path) -> 'AgentRoster':
+        """Resume a saved roster from the state after its last day."""
+        meta = read_roster_meta(directory)
+        return cls(np.load(Path(directory) / 'agents.npy'),
+                   datetime.strptime(meta['tenureStart'], '%Y-%m-%d'),
+                   datetime.strptime(meta['lastDate'], '%Y-%m-%d'))
+
+
+def read_roster_meta(directory: Path) -> Dict:
+    """Load the roster.json index of a saved roster."""
+    with open(Path(directory) / ROSTER_META_FILENAME) as f:
+        return json.load(f)
+
+
+def read_bitmap(directory: Path, name: str, agents: int) -> np.ndarray:
+    """One saved bitmap unpacked to a boolean days x agents array."""
+    packed = np.load(Path(directory) / f"{name}.npy", mmap_mode='r')
+    return np.unpackbits(packed, axis=1, count=agents).astype(bool)
@@ -0,0 +1,358 @@
+"""
+Shift schedule optimizer for the WFM.ai synthetic data generator.
+
+Given the agents required in every operating hour of every day, picks for
+each named shift (morning, midday, evening, ...) a start time, a length and
+a headcount per day. The goal is to cover the demand of every hour and,
+among the schedules that do, to minimize overstaffing. Understaffing is
+weighted so heavily that a shortfall remains only where the headcount cap
+or the shift windows make an hour impossible to cover, or where it is a
+small fraction of an agent, cheaper than the excess of another shift.
+Each named shift may start up to START_FLEX hours
+earlier or later than its configured start and run for any of
+SHIFT_LENGTHS hours within operating hours. At most one pattern per named
+shift is used on a day, so schedules keep the existing one record per
+shift and day.
+
+Two solvers are available:
+
+- greedy: numpy only. Agents are added to the pattern that removes the
+  most weighted shortfall, for all days at once, until adding an agent no
+  longer lowers the cost. The first agent given to a named shift fixes
+  that shift's pattern for the day. The result is then refined one named
+  shift at a time, with the shift's best pattern and headcount found
+  exactly while the other shifts stay fixed.
+- milp:   integer programs via scipy.optimize.milp (requires scipy). The
+  pattern choice is solved exactly once per day type (e.g. weekday) on the
+  type's mean demand. Each day then keeps its type's patterns or the
+  greedy plan's, whichever costs less with exact headcounts, and the
+  headcounts of all days come from one integer program per block of days.
+  The result is never worse than greedy.
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from scipy import sparse
+    from scipy.optimize import Bounds, LinearConstraint, milp
+except ImportError:  # scipy is optional; the greedy solver needs only numpy
+    milp = None
+
+SCHEDULERS = ('static', 'greedy', 'milp')
+
+SHIFT_LENGTHS = (4, 5, 6, 8)  # Hours
+START_FLEX = 2                # Hours a shift may start before/after its configured start
+
+# Cost of one agent-hour of understaffing relative to one of overstaffing.
+# Above the longest shift length, so covering a whole missing agent always
+# beats the overstaffing it causes: shortfall is minimized first, then
+# excess. The margin for absences and handle-time variation belongs in the
+# demand.
+UNDERSTAFF_WEIGHT = 100.0
+OVERSTAFF_WEIGHT = 1.0
+
+HEADCOUNT_BLOCK_DAYS = 366  # Days per headcount integer program of the milp solver
+
+
+class ShiftPattern(NamedTuple):
+    """One candidate way to run a named shift."""
+    shift: str
+    start: int  # First hour covered
+    end: int    # Hour the shift ends (exclusive)
+
+
+def candidate_patterns(shifts: Dict[str, Dict], operating_hours: Sequence[int],
+                       lengths: Sequence[int] = SHIFT_LENGTHS,
+                       start_flex: int = START_FLEX) -> List[ShiftPattern]:
+    """All (start, length) patterns for each named shift within operating hours.
+
+    The configured start and end of every shift are always included.
+    """
+    open_hour, close_hour = operating_hours[0], operating_hours[-1] + 1
+    patterns = []
+    for name, info in shifts.items():
+        options = {(info['start'], info['end'])}
+        for start in range(info['start'] - start_flex, info['start'] + start_flex + 1):
+            for length in lengths:
+                if open_hour <= start and start + length <= close_hour:
+                    options.add((start, start + length))
+        patterns.extend(ShiftPattern(name, start, end) for start, end in sorted(options))
+    return patterns
+
+
+def coverage_matrix(patterns: Sequence[ShiftPattern], hours: Sequence[int]) -> np.ndarray:
+    """(patterns x hours) 0/1 matrix of the hours each pattern covers."""
+    hours = np.asarray(hours)
+    return np.array([(hours >= p.start) & (hours < p.end) for p in patterns], dtype=np.int64)
+
+
+def greedy_schedule(demand: np.ndarray, patterns: Sequence[ShiftPattern],
+                    hours: Sequence[int], max_headcount: int,
+                    under_weight: float = UNDERSTAFF_WEIGHT,
+                    over_weight: float = OVERSTAFF_WEIGHT) -> np.ndarray:
+    """Headcount per day and pattern (days x patterns), all days at once.
+
+    Args:
+        demand: Agents needed per day and hour (days x hours), may be fractional.
+        patterns: Candidate patterns (see candidate_patterns).
+        hours: Hour of each demand column.
+        max_headcount: Upper bound on agents scheduled per day.
+        under_weight: Cost per agent-hour short.
+        over_weight: Cost per agent-hour in excess.
+    """
+    cover = coverage_matrix(patterns, hours)
+    shift_names = list(dict.fromkeys(p.shift for p in patterns))
+    shift_of = np.array([shift_names.index(p.shift) for p in patterns])
+    num_days = len(demand)
+    rows = np.arange(num_days)
+
+    remaining = np.asarray(demand, dtype=np.float64).copy()
+    headcount = np.zeros((num_days, len(patterns)), dtype=np.int64)
+    chosen = np.full((num_days, len(shift_names)), -1)  # Pattern locked in per named shift
+    active = np.ones(num_days, dtype=bool)
+
+    while active.any():
+        # Cost change of one more agent on each pattern
+        delta = np.where(remaining > 0, -under_weight, over_weight) @ cover.T
+        locked = chosen[:, shift_of]
+        allowed = (locked == -1) | (locked == np.arange(len(patterns)))
+        delta = np.where(allowed, delta, np.inf)
+
+        best = np.argmin(delta, axis=1)
+        active &= (delta[rows, best] < 0) & (headcount.sum(axis=1) < max_headcount)
+        if not active.any():
+            break
+
+        # Add as many agents as keep every covered hour short (at least one)
+        covered = cover[best].astype(bool)
+        shortfall = np.where(covered, remaining, np.inf).min(axis=1)
+        step = np.maximum(np.floor(shortfall), 1).astype(np.int64)
+        step = np.minimum(step, max_headcount - headcount.sum(axis=1))
+        step = np.where(active, step, 0)
+
+        headcount[rows, best] += step
+        remaining -= step[:, None] * cover[best]
+        chosen[rows[active], shift_of[best[active]]] = best[active]
+
+    return _refine(demand, cover, shift_of, headcount, max_headcount, under_weight, over_weight)
+
+
+def _staffing_cost(remaining: np.ndarray, under_weight: float, over_weight: float) -> np.ndarray:
+    """Weighted under/overstaffing summed over the last (hours) axis."""
+    return np.where(remaining > 0, under_weight * remaining, -over_weight * remaining).sum(axis=-1)
+
+
+def _refine(demand: np.ndarray, cover: np.ndarray, shift_of: np.ndarray, headcount: np.ndarray,
+            max_headcount: int, under_weight: float, over_weight: float,
+            max_rounds: int = 5) -> np.ndarray:
+    """Improve a schedule one named shift at a time, for all days at once.
+
+    With every other shift fixed, the best pattern and headcount for one
+    shift is found exactly: for a given pattern the cost is convex and
+    piecewise linear in the headcount, with its minimum at the
+    under/(under+over) quantile of the remaining demand over the covered
+    hours. Only the integers around that quantile (and zero) need to be
+    evaluated. Rounds repeat until no day improves.
+    """
+    demand = np.asarray(demand, dtype=np.float64)
+    rows = np.arange(len(demand))
+    quantile = under_weight / (under_weight + over_weight)
+
+    for _ in range(max_rounds):
+        improved = False
+        for shift in np.unique(shift_of):
+            members = np.flatnonzero(shift_of == shift)
+            member_cover = cover[members]
+            others = headcount.copy()
+            others[:, members] = 0
+            remaining = demand - others @ cover
+            current = _staffing_cost(remaining - headcount[:, members] @ member_cover, under_weight,
+                                     over_weight)
+
+            # Optimal real headcount per pattern: a quantile of the covered remaining demand
+            covered = np.where(member_cover[None, :, :] > 0, remaining[:, None, :], np.inf)
+            ordered = np.sort(covered, axis=2)
+            length = member_cover.sum(axis=1)
+            rank = np.maximum(np.ceil(length * quantile).astype(np.int64) - 1, 0)
+            optimum = ordered[:, np.arange(len(members)), rank]
+
+            budget = (max_headcount - others.sum(axis=1))[:, None, None]
+            counts = np.stack([np.zeros_like(optimum), np.floor(optimum), np.ceil(optimum)], axis=2)
+            counts = np.clip(counts, 0, budget)
+
+            # cost[day, pattern, candidate]
+            trial = (remaining[:, None, None, :]
+                     - counts[..., None] * member_cover[None, :, None, :])
+            cost = _staffing_cost(trial, under_weight, over_weight)
+
+            flat = cost.reshape(len(demand), -1).argmin(axis=1)
+            best_pattern, best_candidate = np.unravel_index(flat, cost.shape[1:])
+            best_cost = cost[rows, best_pattern, best_candidate]
+            better = best_cost < current - 1e-9
+            if better.any():
+                improved = True
+                headcount[np.ix_(better, members)] = 0
+                headcount[rows[better], members[best_pattern[better]]] = \
+                    counts[rows, best_pattern, best_candidate][better].astype(np.int64)
+        if not improved:
+            break
+    return headcount
+
+
+def _pattern_milp(day_demand: np.ndarray, cover: np.ndarray, one_pattern: np.ndarray,
+                  max_headcount: int, under_weight: float, over_weight: float) -> np.ndarray:
+    """Optimal headcount per pattern for one day's demand (one pattern per named shift).
+
+    Variables: headcount x_p (integer), pattern switch y_p (binary),
+    shortfall u_h and excess o_h. Minimizes under_weight * sum(u) +
+    over_weight * sum(o) subject to cover^T x + u - o = demand,
+    x_p <= M_p * y_p, at most one pattern per named shift, and
+    sum(x) <= max_headcount.
+    """
+    num_patterns, num_hours = cover.shape
+    num_shifts = len(one_pattern)
+    # A pattern never needs more agents than the peak demand it covers;
+    # this tight big-M keeps the LP relaxation (and the solve) small
+    big_m = np.ceil((cover * day_demand).max(axis=1)).clip(0, max_headcount)
+    identity = np.eye(num_hours)
+    matrix = np.vstack([
+        np.hstack([cover.T, np.zeros((num_hours, num_patterns)), identity, -identity]),
+        np.hstack([np.eye(num_patterns), -np.diag(big_m), np.zeros((num_patterns, 2 * num_hours))]),
+        np.hstack([np.zeros((num_shifts, num_patterns)), one_pattern,
+                   np.zeros((num_shifts, 2 * num_hours))]),
+        np.concatenate([np.ones(num_patterns), np.zeros(num_patterns + 2 * num_hours)])[None, :],
+    ])
+    lower = np.concatenate([day_demand, np.full(num_patterns, -np.inf), np.zeros(num_shifts), [0]])
+    upper = np.concatenate([day_demand, np.zeros(num_patterns), np.ones(num_shifts), [max_headcount]])
+    cost = np.concatenate([np.zeros(2 * num_patterns),
+                           np.full(num_hours, under_weight), np.full(num_hours, over_weight)])
+    result = milp(cost, integrality=np.concatenate([np.ones(2 * num_patterns), np.zeros(2 * num_hours)]),
+                  bounds=Bounds(0, np.concatenate([big_m, np.ones(num_patterns),
+                                                   np.full(2 * num_hours, np.inf)])),
+                  constraints=LinearConstraint(matrix, lower, upper))
+    if result.x is None:
+        raise RuntimeError(f"Shift pattern MILP failed: {result.message}")
+    return np.round(result.x[:num_patterns]).astype(np.int64)
+
+
+def _fixed_pattern_headcounts(demand: np.ndarray, cover: np.ndarray, allowed: np.ndarray,
+                              max_headcount: int, under_weight: float, over_weight: float,
+                              block_days: int = HEADCOUNT_BLOCK_DAYS) -> np.ndarray:
+    """Optimal headcounts when each day's patterns are given (days x patterns).
+
+    Only the allowed patterns of a day get a headcount. With the patterns
+    fixed, each day's coverage matrix is an interval matrix (totally
+    unimodular), so one integer program per block of days solves at the
+    root instead of branching per day.
+    """
+    num_patterns, num_hours = cover.shape
+    per_day = num_patterns + 2 * num_hours
+    slack = sparse.hstack([sparse.identity(num_hours), -sparse.identity(num_hours)])
+    cost = np.concatenate([np.zeros(num_patterns),
+                           np.full(num_hours, under_weight), np.full(num_hours, over_weight)])
+    cap_row = sparse.csr_matrix(np.concatenate([np.ones(num_patterns), np.zeros(2 * num_hours)]))
+
+    headcount = np.zeros((len(demand), num_patterns), dtype=np.int64)
+    for first in range(0, len(demand), block_days):
+        block = slice(first, first + block_days)
+        days = len(demand[block])
+        coverage = sparse.block_diag([sparse.hstack([sparse.csr_matrix(cover.T * mask), slack])
+                                      for mask in allowed[block]], format='csr')
+        caps = sparse.block_diag([cap_row] * days, format='csr')
+        upper = np.where(allowed[block], max_headcount, 0)
+        result = milp(np.tile(cost, days),
+                      integrality=np.tile(np.concatenate([np.ones(num_patterns),
+                                                          np.zeros(2 * num_hours)]), days),
+                      bounds=Bounds(0, np.hstack([upper, np.full((days, 2 * num_hours), np.inf)]
+                                                 ).ravel()),
+                      constraints=[LinearConstraint(coverage, demand[block].ravel(),
+                                                    demand[block].ravel()),
+                                   LinearConstraint(caps, 0, max_headcount)])
+        if result.x is None:
+            raise RuntimeError(f"Shift headcount MILP failed: {result.message}")
+        headcount[block] = np.round(result.x.reshape(days, per_day)[:, :num_patterns])
+    return headcount
+
+
+def milp_schedule(demand: np.ndarray, patterns: Sequence[ShiftPattern],
+                  hours: Sequence[int], max_headcount: int,
+                  under_weight: float = UNDERSTAFF_WEIGHT,
+                  over_weight: float = OVERSTAFF_WEIGHT,
+                  day_types: Optional[Sequence[int]] = None) -> np.ndarray:
+    """Headcount per day and pattern from integer programs (see the module docstring).
+
+    Args:
+        demand: Agents needed per day and hour (days x hours).
+        patterns: Candidate patterns (see candidate_patterns).
+        hours: Hour of each demand column.
+        max_headcount: Upper bound on agents scheduled per day.
+        under_weight: Cost per agent-hour short.
+        over_weight: Cost per agent-hour in excess.
+        day_types: Type label of each day (e.g. its weekday). Patterns are
+            solved once per type; without labels every day is its own type,
+            which is exact per day but takes a fraction of a second per day.
+    """
+    if milp is None:
+        raise ImportError("scipy is required for the milp scheduler (pip install scipy)")
+
+    demand = np.asarray(demand, dtype=np.float64)
+    cover = coverage_matrix(patterns, hours)
+    shift_names = list(dict.fromkeys(p.shift for p in patterns))
+    one_pattern = np.array([[p.shift == name for p in patterns] for name in shift_names],
+                           dtype=float)
+
+    types, day_type = np.unique(np.arange(len(demand)) if day_types is None else day_types,
+                                return_inverse=True)
+    type_patterns = np.array([_pattern_milp(demand[day_type == t].mean(axis=0), cover, one_pattern,
+                                            max_headcount, under_weight, over_weight) > 0
+                              for t in range(len(types))]).reshape(len(types), len(patterns))
+
+    # Each day keeps the cheaper of its type's patterns and the greedy plan's
+    greedy = greedy_schedule(demand, patterns, hours, max_headcount, under_weight, over_weight)
+    candidates = [_fixed_pattern_headcounts(demand, cover, allowed, max_headcount,
+                                            under_weight, over_weight)
+                  for allowed in (greedy > 0, type_patterns[day_type])]
+    costs = np.array([_staffing_cost(demand - headcount @ cover, under_weight, over_weight)
+                      for headcount in candidates])
+    best = np.argmin(costs, axis=0)
+    return np.stack(candidates)[best, np.arange(len(demand))]
+
+
+def schedule_shifts(demand: np.ndarray, shifts: Dict[str, Dict], operating_hours: Sequence[int],
+                    max_headcount: int, method: str = 'greedy',
+                    day_types: Optional[Sequence[int]] = None
+                    ) -> List[List[Tuple[str, int, int, int]]]:
+    """Pick each named shift's pattern and headcount for every day.
+
+    Args:
+        demand: Agents needed per day and operating hour (days x hours).
+        shifts: Configured shifts, {name: {'start', 'end', ...}}.
+        operating_hours: Hour of each demand column.
+        max_headcount: Upper bound on agents scheduled per day.
+        method: 'greedy' or 'milp'.
+        day_types: Type label of each day for the milp solver (see milp_schedule).
+
+    Returns:
+        Per day, one (shift name, start, end, headcount) tuple per
+        configured shift in config order. Shifts left without agents keep
+        their configured hours.
+    """
+    patterns = candidate_patterns(shifts, operating_hours)
+    if method == 'greedy':
+        headcount = greedy_schedule(demand, patterns, operating_hours, max_headcount)
+    elif method == 'milp':
+        headcount = milp_schedule(demand, patterns, operating_hours, max_headcount,
+                                  day_types=day_types)
+    else:
+        raise ValueError(f"Unknown scheduler '{method}', expected 'greedy' or 'milp'")
+
+    plan = []
+    for day_headcount in headcount.tolist():
+        by_shift = {name: (name, info['start'], info['end'], 0) for name, info in shifts.items()}
+        for pattern, count in zip(patterns, day_headcount):
+            if count:
+                by_shift[pattern.shift] = (pattern.shift, pattern.start, pattern.end, count)
+        plan.append(list(by_shift.values()))
+    return plan
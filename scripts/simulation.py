@@ -0,0 +1,186 @@
+"""
+Discrete-event contact center simulation for the WFM.ai synthetic data generator.
+
+Each day's generated calls and chats are replayed against the agents on the
+queue in every operating hour:
+
+- Within an hour, arrivals are uniform order statistics, which is a Poisson
+  process conditioned on the hour's generated count.
+- Handle times are lognormal with mean ``aht`` and coefficient of variation
+  HANDLE_TIME_CV.
+- Every contact has an exponential patience. A contact still waiting when
+  its patience runs out abandons.
+- Agents are pooled as capacity slots, ``concurrency`` per agent. A chat
+  holds one slot and a call holds ``concurrency`` slots.
+- Contacts are served first come, first served. Staffing changes at each
+  hour boundary, and contacts already in service finish even when capacity
+  drops.
+
+All random draws for a day are made up front with NumPy (draw_contacts).
+The event loop (simulate_day) is a heap of completion times walked in
+step with the sorted arrivals and the hour boundaries. simulate_days
+optionally runs days in parallel worker processes.
+"""
+
+import heapq
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import List, NamedTuple, Sequence
+
+import numpy as np
+
+HANDLE_TIME_CV = 0.6     # Standard deviation / mean of handle times
+INTERVAL_SECONDS = 3600  # Staffing and reporting interval
+
+# Rows of the per-interval statistics returned by simulate_day
+INTERVAL_STATS = ('offered', 'answered', 'answeredInThreshold', 'abandoned', 'waitSeconds')
+
+
+class DayContacts(NamedTuple):
+    """Pre-drawn contacts of one day, sorted by arrival."""
+    arrival: np.ndarray   # Seconds after the start of the first operating hour
+    slots: np.ndarray     # Capacity slots held while in service
+    handle: np.ndarray    # Handle time in seconds
+    patience: np.ndarray  # Seconds the contact waits before abandoning
+
+
+def draw_contacts(rng, calls: np.ndarray, chats: np.ndarray, keep: float, aht: float,
+                  patience: float, concurrency: int,
+                  handle_cv: float = HANDLE_TIME_CV) -> DayContacts:
+    """Draw one day's contacts from its hourly call and chat counts.
+
+    Args:
+        rng: Random generator for the day (``Generator`` or the legacy adapter).
+        calls: Calls arriving in each operating hour.
+        chats: Chats arriving in each operating hour.
+        keep: Share of contacts not deflected by the bot; each contact
+            reaches the queue with this probability.
+        aht: Mean handle time in seconds.
+        patience: Mean patience in seconds.
+        concurrency: Chats an agent handles at once.
+        handle_cv: Coefficient of variation of handle times.
+    """
+    calls = rng.binomial(np.asarray(calls, dtype=np.int64), keep)
+    chats = rng.binomial(np.asarray(chats, dtype=np.int64), keep)
+    hours = np.arange(len(calls))
+    hour = np.concatenate([np.repeat(hours, calls), np.repeat(hours, chats)])
+    slots = np.concatenate([np.full(calls.sum(), concurrency, dtype=np.int64),
+                            np.ones(chats.sum(), dtype=np.int64)])
+    count = len(hour)
+
+    arrival = (hour + rng.uniform(0.0, 1.0, size=count)) * INTERVAL_SECONDS
+    sigma = np.sqrt(np.log1p(handle_cv ** 2))
+    handle = rng.lognormal(np.log(aht) - sigma ** 2 / 2, sigma, size=count)
+    wait_limit = rng.exponential(patience, size=count)
+
+    order = np.argsort(arrival, kind='stable')
+    return DayContacts(arrival[order], slots[order], handle[order], wait_limit[order])
+
+
+def simulate_day(contacts: DayContacts, capacity: Sequence[int],
+                 threshold: float) -> np.ndarray:
+    """Run one day's queue and summarize it per interval of arrival.
+
+    Args:
+        contacts: The day's contacts from draw_contacts.
+        capacity: Capacity slots on the queue in each interval. The last
+            interval's capacity also serves contacts still queued at close.
+        threshold: Answer time in seconds counted as within service level.
+
+    Returns:
+        Array of shape (len(INTERVAL_STATS), intervals): contacts offered,
+        answered, answered within threshold and abandoned, plus the total
+        wait of answered contacts, by the interval they arrived in.
+    """
+    intervals = len(capacity)
+    arrival = contacts.arrival.tolist()
+    slots = contacts.slots.tolist()
+    handle = contacts.handle.tolist()
+    deadline = (contacts.arrival + contacts.patience).tolist()
+    limits = [int(c) for c in capacity]
+    count = len(arrival)
+    inf = float('inf')
+
+    start = [inf] * count
+    completions: List = []  # (time, slots freed); slots 0 wakes a blocked queue
+    waiting = deque()
+    busy = 0
+    limit = limits[0] if intervals else 0
+    next_arrival = 0
+    next_interval = 1
+    boundary = float(INTERVAL_SECONDS)
+    woken = -1
+
+    while True:
+        arrival_time = arrival[next_arrival] if next_arrival < count else inf
+        completion_time = completions[0][0] if completions else inf
+        boundary_time = boundary if next_interval < intervals else inf
+        now = min(arrival_time, completion_time, boundary_time)
+        if now == inf:
+            break
+
+        if completion_time == now:
+            busy -= heapq.heappop(completions)[1]
+        elif arrival_time == now:
+            waiting.append(next_arrival)
+            next_arrival += 1
+        else:
+            limit = limits[next_interval]
+            next_interval += 1
+            boundary += INTERVAL_SECONDS
+
+        # Start waiting contacts in arrival order while capacity allows
+        while waiting:
+            head = waiting[0]
+            if deadline[head] <= now:
+                waiting.popleft()  # Abandoned while waiting
+            elif busy + slots[head] <= limit:
+                waiting.popleft()
+                start[head] = now
+                busy += slots[head]
+                heapq.heappush(completions, (now + handle[head], slots[head]))
+            else:
+                # Blocked: look again when the head of the queue would abandon
+                if woken != head:
+                    heapq.heappush(completions, (deadline[head], 0))
+                    woken = head
+                break
+
+    arrival = contacts.arrival
+    start = np.array(start)
+    answered = np.isfinite(start)
+    wait = np.where(answered, start - arrival, 0.0)
+    interval = np.minimum((arrival // INTERVAL_SECONDS).astype(np.int64), max(intervals - 1, 0))
+
+    offered = np.bincount(interval, minlength=intervals)
+    answered_count = np.bincount(interval, weights=answered, minlength=intervals)
+    in_threshold = np.bincount(interval, weights=answered & (wait <= threshold),
+                               minlength=intervals)
+    return np.stack([offered, answered_count, in_threshold, offered - answered_count,
+                     np.bincount(interval, weights=wait, minlength=intervals)])
+
+
+def simulate_days(days: Sequence[DayContacts], capacity: np.ndarray, threshold: float,
+                  workers: int = 1) -> np.ndarray:
+    """Simulate many days, optionally in parallel worker processes.
+
+    Args:
+        days: Each day's contacts from draw_contacts.
+        capacity: Capacity slots per day and interval (days x intervals).
+        threshold: Answer time in seconds counted as within service level.
+        workers: Worker processes; 1 simulates in this process.
+
+    Returns:
+        Array of shape (days, len(INTERVAL_STATS), intervals).
+    """
+    capacity = np.asarray(capacity)
+    if workers > 1 and len(days) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(simulate_day, days, capacity, repeat(threshold),
+                                        chunksize=max(1, len(days) // (workers * 4))))
+    else:
+        results = [simulate_day(day, day_capacity, threshold)
+                   for day, day_capacity in zip(days, capacity)]
+    return np.stack(results) if results else np.zeros((0, len(INTERVAL_STATS),
+                                                       capacity.shape[-1]))
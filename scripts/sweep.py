@@ -0,0 +1,144 @@
+"""
+What-if deflection and cost sweep for the WFM.ai synthetic data generator.
+
+The dashboard's deflection slider asks the same question for many inputs:
+how many FTEs, and what annual cost, does a year of the generated contacts
+need at a given bot deflection rate, handle time, shrinkage and service
+level target? This module answers it for a whole grid of those inputs at
+once and writes the answers to ``deflection_sweep.json``, so the dashboard
+looks a point up instead of recomputing it per slider move.
+
+For every (deflection, AHT, SLA target) point the Erlang C requirement of
+every hourly interval is solved in one broadcast call through the
+generator's StaffingTable (shrinkage only grosses the requirement up, so it
+is applied afterwards by broadcasting). Required agent-hours are converted
+to annual FTEs and priced at the fully loaded agent cost, plus the bot's
+per-contact cost for deflected contacts.
+
+Each measure is stored as a flat list in C order over SWEEP_AXES, so the
+point (i, j, k, l) is at ((i * len(ahtMinutes) + j) * len(shrinkage) + k)
+* len(slaTarget) + l.
+"""
+
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from erlang import StaffingTable
+
+SWEEP_FILENAME = 'deflection_sweep.json'
+
+SWEEP_AXES = ('deflectionRate', 'ahtMinutes', 'shrinkage', 'slaTarget')
+
+DEFAULT_SWEEP_GRID = {
+    'deflectionRate': [0.0, 0.05, 0.10, 0.15, 0.20, 0.25, 0.30, 0.35, 0.40, 0.45, 0.50, 0.55, 0.60],
+    'ahtMinutes': [4.0, 4.5, 5.0, 5.5, 6.0, 6.5, 7.0, 7.5, 8.0],
+    'shrinkage': [0.20, 0.25, 0.30, 0.35, 0.40],
+    'slaTarget': [0.70, 0.75, 0.80, 0.85, 0.90],
+}
+
+SWEEP_WINDOW_DAYS = 365         # Trailing days of history the sweep is evaluated on
+HOURS_PER_FTE = 2080            # Paid hours per FTE per year (40 h x 52 weeks)
+SAVINGS_SCENARIOS = (0.30, 0.35, 0.40)  # Deflection rates of the potentialSavings block
+
+
+def parse_axis(text: str) -> List[float]:
+    """Grid values from 'a,b,c' or an inclusive 'start:stop:step' range."""
+    try:
+        if ':' in text:
+            start, stop, step = (float(part) for part in text.split(':'))
+            if step <= 0:
+                raise ValueError
+            values = np.arange(start, stop + step / 2, step)
+        else:
+            values = [float(part) for part in text.split(',') if part.strip()]
+    except ValueError:
+        raise ValueError(f"invalid grid '{text}', expected 'a,b,c' or 'start:stop:step'")
+    if not len(values):
+        raise ValueError(f"grid '{text}' is empty")
+    return [round(float(value), 6) for value in values]
+
+
+def validate_grid(grid: Dict[str, Sequence[float]]) -> Dict[str, List[float]]:
+    """DEFAULT_SWEEP_GRID overridden by grid, with each axis checked and sorted."""
+    unknown = set(grid) - set(SWEEP_AXES)
+    if unknown:
+        raise ValueError(f"Unknown sweep axes: {sorted(unknown)}, expected {SWEEP_AXES}")
+    merged = {axis: sorted(float(v) for v in grid.get(axis, DEFAULT_SWEEP_GRID[axis]))
+              for axis in SWEEP_AXES}
+    checks = {
+        'deflectionRate': lambda v: 0 <= v < 1,
+        'ahtMinutes': lambda v: v > 0,
+        'shrinkage': lambda v: 0 <= v < 1,
+        'slaTarget': lambda v: 0 < v < 1,
+    }
+    for axis, valid in checks.items():
+        invalid = [v for v in merged[axis] if not valid(v)]
+        if invalid:
+            raise ValueError(f"Invalid {axis} values {invalid}")
+    return merged
+
+
+def sweep_table(offered: np.ndarray, contacts: float, grid: Dict[str, List[float]],
+                table: StaffingTable, threshold: float, annual_factor: float,
+                cost_per_fte: float, ai_cost_per_contact: float) -> Dict[str, np.ndarray]:
+    """Required FTEs and annual cost at every grid point.
+
+    Args:
+        offered: Contacts reaching the queue per hourly interval before
+            deflection (calls plus chats over their concurrency), flattened.
+        contacts: All contacts in the window, for the bot's cost.
+        grid: Axis values, as returned by validate_grid.
+        table: Memoized Erlang solves.
+        threshold: Answer time threshold, seconds.
+        annual_factor: Years per window (365 / days) scale to annual totals.
+        cost_per_fte: Fully loaded annual cost of one FTE.
+        ai_cost_per_contact: Bot cost per deflected contact.
+
+    Returns:
+        Arrays shaped by SWEEP_AXES: 'requiredFtes', 'peakAgents' (most
+        agents scheduled in any hour), 'annualCost' and 'annualSavings'
+        (against no deflection at the same AHT, shrinkage and target).
+    """
+    deflection = np.asarray(grid['deflectionRate'])
+    aht = np.asarray(grid['ahtMinutes']) * 60
+    gross_up = 1 / (1 - np.asarray(grid['shrinkage']))
+    target = np.asarray(grid['slaTarget'])
+
+    # (deflection + baseline, aht, target, interval); the last deflection row is no deflection
+    rates = np.append(deflection, 0.0)
+    required = table.required_agents(offered[None, None, None, :] * (1 - rates)[:, None, None, None],
+                                     aht[None, :, None, None], target[None, None, :, None],
+                                     threshold)
+    agent_hours = required.sum(axis=-1)[:, :, None, :] * gross_up[None, None, :, None]
+    peak = np.ceil(required.max(axis=-1)[:, :, None, :] * gross_up[None, None, :, None] - 1e-9)
+
+    ftes = agent_hours * annual_factor / HOURS_PER_FTE
+    bot_cost = contacts * annual_factor * rates * ai_cost_per_contact
+    cost = ftes * cost_per_fte + bot_cost[:, None, None, None]
+    return {
+        'requiredFtes': ftes[:-1],
+        'peakAgents': peak[:-1].astype(np.int64),
+        'annualCost': cost[:-1],
+        'annualSavings': cost[-1:] - cost[:-1],
+    }
+
+
+def savings_scenarios(points: Dict[str, np.ndarray], current: Dict[str, np.ndarray],
+                      rates: Sequence[float] = SAVINGS_SCENARIOS) -> Dict[str, Dict[str, int]]:
+    """potentialSavings-style block: agent reduction and annual savings per rate.
+
+    Args:
+        points: sweep_table output over the scenario rates (one point each
+            on the other axes).
+        current: sweep_table output at the current deflection rate.
+    """
+    return {
+        f"{rate:.0%}": {
+            'agentReduction': int(round(float(current['requiredFtes'].ravel()[0]
+                                              - points['requiredFtes'].ravel()[i]))),
+            'annualSavings': int(round(float(current['annualCost'].ravel()[0]
+                                             - points['annualCost'].ravel()[i]), -3))
+        }
+        for i, rate in enumerate(rates)
+    }
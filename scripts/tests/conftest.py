@@ -0,0 +1,26 @@
+"""
+Shared fixtures for the generator tests.
+
+The scripts are flat modules importing their siblings, so the scripts
+directory goes on sys.path, as it does when a script is run directly.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+GENERATOR = SCRIPTS_DIR / 'generate_synthetic_data.py'
+
+
+@pytest.fixture
+def generate(tmp_path):
+    """Run the generator CLI with the given arguments (cwd is tmp_path)."""
+    def run(*args: str):
+        subprocess.run([sys.executable, str(GENERATOR), *args], cwd=tmp_path, check=True,
+                       stdout=subprocess.DEVNULL)
+    return run
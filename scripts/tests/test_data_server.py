@@ -0,0 +1,121 @@
+"""Range, ETag and path handling of the local data service."""
+
+import asyncio
+import gzip
+
+import pytest
+
+from data_server import DataService, QueryError, encode_variants, etag_matches, parse_range
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('bytes=0-99', (0, 100)),
+    ('bytes=900-', (900, 1000)),
+    ('bytes=990-2000', (990, 1000)),   # Clamped to the body
+    ('bytes=-100', (900, 1000)),       # Suffix range
+    ('bytes=-2000', (0, 1000)),
+    ('bytes=5-5', (5, 6)),
+    (' bytes = 0-0', (0, 1)),
+    ('bytes=1000-', None),             # Starts past the end: 416
+    ('bytes=-0', None),
+])
+def test_parse_range(header, expected):
+    assert parse_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize('header', [
+    'items=0-10', 'bytes=0-10,20-30', 'bytes=-', 'bytes=abc-', 'bytes=1-x',
+    'bytes=5-3', 'bytes=--5', 'bytes=+1-2',
+])
+def test_parse_range_rejects_unsupported_and_malformed(header):
+    with pytest.raises(QueryError):
+        parse_range(header, 1000)
+
+
+@pytest.mark.parametrize('header, matches', [
+    ('"abc"', True),
+    ('W/"abc"', True),                 # Weak comparison
+    ('"x", "abc"', True),
+    ('"x",W/"abc" ', True),
+    ('*', True),
+    ('"abcd"', False),
+    ('abc', False),
+    ('', False),
+])
+def test_etag_matches(header, matches):
+    assert etag_matches(header, '"abc"') is matches
+
+
+def test_encoded_etags_are_stable_per_content():
+    body = b'{"a": 1}\n' * 500
+    first, second = encode_variants(body), encode_variants(body)
+    assert {k: v.etag for k, v in first.items()} == {k: v.etag for k, v in second.items()}
+    assert gzip.decompress(first['gzip'].body) == body
+    assert encode_variants(body + b' ')[None].etag != first[None].etag
+
+
+@pytest.fixture
+def service(tmp_path):
+    data = tmp_path / 'data'
+    (data / 'rollups').mkdir(parents=True)
+    (data / '.cache').mkdir()
+    (data / 'summary_stats.json').write_text('{"ok": true}')
+    (data / 'rollups' / 'daily.json').write_text('[]')
+    (data / '.cache' / 'index.json').write_text('{}')
+    (tmp_path / 'secret.json').write_text('{"secret": true}')
+    (data / 'escape.json').symlink_to(tmp_path / 'secret.json')
+    return DataService(data)
+
+
+@pytest.mark.parametrize('relative', ['summary_stats.json', 'rollups/daily.json',
+                                      'rollups/../summary_stats.json', 'rollups%2Fdaily.json'])
+def test_resolve_serves_files_inside_the_directory(service, relative):
+    path = service._resolve(relative)
+    assert path is not None and path.is_relative_to(service.directory)
+
+
+@pytest.mark.parametrize('relative', [
+    '../secret.json', '..%2Fsecret.json', '%2e%2e/secret.json', 'rollups/../../secret.json',
+    '/etc/passwd', 'escape.json',      # Symlink pointing outside
+    '.cache/index.json', 'rollups',    # Hidden file, directory
+    'missing.json', '',
+])
+def test_resolve_refuses_paths_outside_hidden_or_missing(service, relative):
+    assert service._resolve(relative) is None
+
+
+def _get(service, target, **headers):
+    return asyncio.run(service.handle('GET', target, {k.replace('_', '-'): v
+                                                      for k, v in headers.items()}))
+
+
+def test_file_requests(service):
+    full = _get(service, '/data/summary_stats.json')
+    assert full.status == 200 and full.body == b'{"ok": true}'
+
+    revalidated = _get(service, '/data/summary_stats.json', if_none_match=full.headers['ETag'])
+    assert revalidated.status == 304 and not revalidated.body
+
+    partial = _get(service, '/data/summary_stats.json', range='bytes=1-4')
+    assert partial.status == 206 and partial.body == b'"ok"'
+    assert partial.headers['Content-Range'] == 'bytes 1-4/12'
+    assert _get(service, '/data/summary_stats.json', range='bytes=50-').status == 416
+    assert _get(service, '/data/summary_stats.json', range='bytes=4-1').status == 200
+
+    assert _get(service, '/data/../secret.json').status == 404
+    assert _get(service, '/data/%2e%2e/secret.json').status == 404
+
+
+@pytest.mark.parametrize('json_format', ['pretty', 'ndjson'])
+def test_queries_without_generation_state(generate, tmp_path, json_format):
+    output = tmp_path / json_format
+    generate('--output', str(output), '--start', '2024-01-01', '--end', '2024-02-29',
+             '--json-format', json_format)
+    with_state = _get(DataService(output), '/volume?granularity=week')
+
+    (output / 'generation_state.json').unlink()
+    without_state = _get(DataService(output), '/volume?granularity=week')
+    assert with_state.status == without_state.status == 200
+    assert without_state.body == with_state.body
+
+    assert _get(DataService(tmp_path), '/volume').status == 503
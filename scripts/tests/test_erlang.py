@@ -0,0 +1,88 @@
+"""Log-space Erlang B/C/A against the textbook formulas."""
+
+import math
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from erlang import erlang_a, erlang_b, erlang_c, required_agents, service_level
+
+# (agents, traffic): light to heavy load, up to sizes where A^N / N! overflows floats
+CASES = [(1, 0.5), (3, 2.9), (5, 1.0), (12, 10.0), (25, 18.4), (60, 57.5),
+         (180, 150.0), (400, 390.0)]
+
+
+def _direct_b(agents: int, traffic: float) -> Fraction:
+    """B(N, A) = (A^N / N!) / sum_k A^k / k!, in exact arithmetic."""
+    a = Fraction(traffic)
+    terms = [a ** k / math.factorial(k) for k in range(agents + 1)]
+    return terms[-1] / sum(terms)
+
+
+def _direct_c(agents: int, traffic: float) -> Fraction:
+    """C(N, A) = (A^N / N! * N / (N - A)) / (sum_{k<N} A^k / k! + A^N / N! * N / (N - A))."""
+    a = Fraction(traffic)
+    terms = [a ** k / math.factorial(k) for k in range(agents)]
+    top = a ** agents / math.factorial(agents) * agents / (agents - a)
+    return top / (sum(terms) + top)
+
+
+def _direct_a(agents: int, volume: float, aht: float, patience: float, queue: int = 2000):
+    """Erlang A metrics from the truncated birth-death chain, term by term."""
+    arrival, service, abandon = volume / 3600, 1 / aht, 1 / patience
+    pi = [1.0]
+    for k in range(1, agents + queue + 1):
+        pi.append(pi[-1] * arrival / (min(k, agents) * service + max(k - agents, 0) * abandon))
+    total = sum(pi)
+    wait_probability = sum(pi[agents:]) / total
+    mean_queue = sum(p * (k - agents) for k, p in enumerate(pi) if k > agents) / total
+    return wait_probability, abandon * mean_queue / arrival, mean_queue / arrival
+
+
+@pytest.mark.parametrize('agents, traffic', CASES)
+def test_erlang_b_matches_direct_formula(agents, traffic):
+    assert erlang_b(agents, traffic) == pytest.approx(float(_direct_b(agents, traffic)),
+                                                      rel=1e-9)
+
+
+@pytest.mark.parametrize('agents, traffic', CASES)
+def test_erlang_c_matches_direct_formula(agents, traffic):
+    assert erlang_c(agents, traffic) == pytest.approx(float(_direct_c(agents, traffic)),
+                                                      rel=1e-9)
+
+
+def test_erlang_c_is_vectorized_and_saturates():
+    agents = np.array([[c[0] for c in CASES], [2] * len(CASES)])
+    traffic = np.array([[c[1] for c in CASES], [2.0] * len(CASES)])
+    waiting = erlang_c(agents, traffic)
+
+    expected = [float(_direct_c(n, a)) for n, a in CASES]
+    assert waiting[0] == pytest.approx(expected, rel=1e-9)
+    assert (waiting[1] == 1.0).all()  # N <= A: every arrival waits
+    assert service_level(2, 2.0, 360, 20) == 0.0
+    assert service_level(3, 0.0, 360, 20) == 1.0
+
+
+@pytest.mark.parametrize('agents, volume, aht, patience', [
+    (1, 5, 360, 180), (4, 30, 360, 180), (10, 90, 360, 180),
+    (10, 120, 360, 180),  # Overloaded: stable only through abandonment
+    (30, 250, 400, 60),
+])
+def test_erlang_a_matches_birth_death_chain(agents, volume, aht, patience):
+    result = erlang_a(agents, volume, aht, patience)
+    assert tuple(result) == pytest.approx(_direct_a(agents, volume, aht, patience), rel=1e-9)
+
+
+def test_erlang_a_without_traffic():
+    assert tuple(erlang_a(2, 0, 360, 180)) == (0.0, 0.0, 0.0)
+
+
+def test_required_agents_is_the_fewest_meeting_target():
+    volume = np.array([0, 5, 40, 120, 900])
+    agents = required_agents(volume, 360, 0.8, 20)
+    traffic = volume * 360 / 3600
+
+    assert (service_level(agents, traffic, 360, 20) >= 0.8).all()
+    short = np.maximum(agents - 1, 0)
+    assert ((service_level(short, traffic, 360, 20) < 0.8) | (agents == 0)).all()
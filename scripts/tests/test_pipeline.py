@@ -0,0 +1,106 @@
+"""BlockWriter must write the same bytes as the single-pass record writers."""
+
+import gzip
+import math
+import zlib
+
+import numpy as np
+import pytest
+
+from data_writers import open_records, write_json_records
+from intervals import VOLUME_COLUMNS, IntervalVolume
+from pipeline import BlockWriter, batched
+
+
+def _records(count: int):
+    return [{'date': f'2024-01-{1 + i // 24:02d}', 'hour': i % 24, 'calls': i * 7 % 31,
+             'contactType': {'billing': i % 5, 'technical': i % 3}}
+            for i in range(count)]
+
+
+def _gzip_members(data: bytes):
+    """Decompressed payload of each gzip member in data."""
+    members = []
+    while data:
+        stream = zlib.decompressobj(wbits=31)
+        members.append(stream.decompress(data))
+        data = stream.unused_data
+    return members
+
+
+def _single_pass(tmp_path, records, json_format):
+    path = tmp_path / f'single.{json_format}'
+    write_json_records(path, records, json_format)
+    return path.read_bytes()
+
+
+@pytest.mark.parametrize('threads', [1, 3])
+def test_gzip_members_decompress_to_single_stream(tmp_path, threads):
+    records = _records(500)
+    path = tmp_path / 'records.ndjson.gz'
+    written = BlockWriter(path, 'ndjson', 'gzip', threads=threads).write(batched(records, 37))
+
+    plain = _single_pass(tmp_path, records, 'ndjson')
+    compressed = path.read_bytes()
+    assert written == len(records)
+    assert len(_gzip_members(compressed)) == math.ceil(len(records) / 37)  # One per block
+    assert b''.join(_gzip_members(compressed)) == plain
+    assert gzip.decompress(compressed) == gzip.decompress(gzip.compress(plain)) == plain
+    with open_records(path) as f:
+        assert f.read().encode() == plain
+
+
+def test_gzip_append_adds_members(tmp_path):
+    records = _records(300)
+    path = tmp_path / 'records.ndjson.gz'
+    writer = BlockWriter(path, 'ndjson', 'gzip', threads=2)
+    writer.write(batched(records[:120], 50))
+    writer.write(batched(records[120:], 50), append=True)
+
+    assert gzip.decompress(path.read_bytes()) == _single_pass(tmp_path, records, 'ndjson')
+
+
+@pytest.mark.parametrize('json_format', ['pretty', 'compact', 'ndjson'])
+def test_blocks_match_single_pass_writer(tmp_path, json_format):
+    records = _records(250)
+    blocks = [[]] + list(batched(records, 16)) + [[]]  # Empty blocks are skipped
+    path = tmp_path / 'records.json'
+    BlockWriter(path, json_format, threads=3).write(blocks)
+
+    assert path.read_bytes() == _single_pass(tmp_path, records, json_format)
+
+
+@pytest.mark.parametrize('json_format', ['pretty', 'compact', 'ndjson'])
+def test_append_matches_single_pass_writer(tmp_path, json_format):
+    records = _records(100)
+    path = tmp_path / 'records.json'
+    writer = BlockWriter(path, json_format)
+    writer.write([records[:40]])
+    writer.write(batched(records[40:], 25), append=True)
+
+    assert path.read_bytes() == _single_pass(tmp_path, records, json_format)
+
+
+@pytest.mark.parametrize('json_format', ['pretty', 'compact', 'ndjson'])
+@pytest.mark.parametrize('minutes', [None, [0, 30]])
+def test_interval_volume_blocks_encode_like_records(tmp_path, json_format, minutes):
+    rng = np.random.default_rng(3)
+    hours = np.repeat(np.arange(8, 12), 1 if minutes is None else 2)
+    minute_column = None if minutes is None else np.tile(minutes, 4)
+    blocks = [IntervalVolume([f'2024-02-{day:02d}' for day in days], hours, minute_column,
+                             {name: rng.integers(0, 900, size=(len(days), len(hours)))
+                              for name in VOLUME_COLUMNS})
+              for days in ([1, 2, 3], [4], [5, 6])]
+    path = tmp_path / 'volume.json'
+    BlockWriter(path, json_format, threads=2).write(blocks)
+
+    records = [record for block in blocks for record in block]
+    assert path.read_bytes() == _single_pass(tmp_path, records, json_format)
+
+
+def test_writer_errors_reach_the_caller(tmp_path):
+    circular = {'date': '2024-01-01'}
+    circular['self'] = circular
+    blocks = [_records(10), [circular], _records(10)]
+    with pytest.raises(ValueError, match='Circular reference'):
+        BlockWriter(tmp_path / 'records.ndjson', 'ndjson', threads=2).write(blocks)
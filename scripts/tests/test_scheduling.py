@@ -0,0 +1,66 @@
+"""Shift planning: coverage first, and milp never worse than greedy."""
+
+import numpy as np
+import pytest
+
+from scheduling import (OVERSTAFF_WEIGHT, SHIFT_LENGTHS, UNDERSTAFF_WEIGHT, _staffing_cost,
+                        candidate_patterns, coverage_matrix, greedy_schedule, milp_schedule,
+                        schedule_shifts)
+
+HOURS = list(range(8, 21))
+# Shortfall not worth an extra agent: its cost is below the excess of the longest shift
+TOLERANCE = max(SHIFT_LENGTHS) * OVERSTAFF_WEIGHT / UNDERSTAFF_WEIGHT
+SHIFTS = {'morning': {'start': 8, 'end': 12}, 'midday': {'start': 12, 'end': 17},
+          'evening': {'start': 17, 'end': 21}}
+
+
+def _demand(days: int = 28, seed: int = 5):
+    rng = np.random.default_rng(seed)
+    profile = np.interp(HOURS, [8, 11, 15, 20], [4, 16, 12, 5])
+    noise = rng.uniform(0, 2, size=(days, len(HOURS)))
+    return profile * rng.uniform(0.7, 1.3, size=(days, 1)) + noise
+
+
+def _cost(headcount, demand, patterns):
+    return _staffing_cost(demand - headcount @ coverage_matrix(patterns, HOURS),
+                          UNDERSTAFF_WEIGHT, OVERSTAFF_WEIGHT)
+
+
+def test_greedy_covers_every_hour_within_the_cap():
+    demand = _demand()
+    patterns = candidate_patterns(SHIFTS, HOURS)
+    headcount = greedy_schedule(demand, patterns, HOURS, max_headcount=94)
+
+    assert (headcount @ coverage_matrix(patterns, HOURS) >= demand - TOLERANCE).all()
+    assert (headcount.sum(axis=1) <= 94).all()
+
+
+def test_greedy_shares_a_tight_cap():
+    demand = _demand()
+    patterns = candidate_patterns(SHIFTS, HOURS)
+    headcount = greedy_schedule(demand, patterns, HOURS, max_headcount=10)
+    assert (headcount.sum(axis=1) <= 10).all()
+
+
+@pytest.mark.parametrize('days, day_types', [(3, None), (28, np.arange(28) % 2)])
+def test_milp_is_never_worse_than_greedy(days, day_types):
+    pytest.importorskip('scipy')
+    demand = _demand(days)
+    patterns = candidate_patterns(SHIFTS, HOURS)
+    greedy = greedy_schedule(demand, patterns, HOURS, max_headcount=94)
+    milp = milp_schedule(demand, patterns, HOURS, max_headcount=94, day_types=day_types)
+
+    assert (_cost(milp, demand, patterns) <= _cost(greedy, demand, patterns) + 1e-9).all()
+    assert (milp.sum(axis=1) <= 94).all()
+
+
+def test_schedule_shifts_plans_one_window_per_named_shift():
+    plan = schedule_shifts(_demand(days=3), SHIFTS, HOURS, max_headcount=94)
+
+    assert len(plan) == 3
+    for day in plan:
+        assert [name for name, *_ in day] == list(SHIFTS)
+        for name, start, end, count in day:
+            assert HOURS[0] <= start < end <= HOURS[-1] + 1 and count >= 0
+    with pytest.raises(ValueError):
+        schedule_shifts(_demand(days=1), SHIFTS, HOURS, 94, method='anneal')
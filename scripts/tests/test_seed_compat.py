@@ -0,0 +1,42 @@
+"""--seed-compat must reproduce the original generator's output byte for byte."""
+
+import hashlib
+import subprocess
+
+import pytest
+
+# SHA-256 of the files the original generator (the repository's baseline
+# commit) writes with its defaults: seed 42, 2024-01-01 to 2024-12-31
+BASELINE_DIGESTS = {
+    'cost_data.json': '55633fb56c695171e357ba29838cda14a17d74c3f31be0b9d711912f68fed7e1',
+    'deflection_history.json': '28c5d00c32131154ceb4189f0777a267f8e1b7888264f43d27aa9d0a4954368e',
+    'historical_volume.json': '261d4eaa611ae00e6fb5212d6aead2f04458f8f286c91cada8e31a31455423da',
+    'sla_performance.json': '9f88bac1a34d24196a3cc4683d09380dc4897259543c60ef5e97a11dcdcef02c',
+    'staffing_schedules.json': 'eae7b709935aaee3e5e4cd57c0a294fcf4efd868311b106ffd6f012b4c9216e6',
+    'summary_stats.json': '265c9c1768ed54e0fee1aca4721f1037002d166b00b82be965a0c79cfaf83cd9',
+}
+
+
+def _digests(output):
+    return {name: hashlib.sha256((output / name).read_bytes()).hexdigest()
+            for name in BASELINE_DIGESTS}
+
+
+@pytest.mark.parametrize('engine', ['loop', 'vectorized'])
+def test_seed_compat_reproduces_baseline(generate, tmp_path, engine):
+    output = tmp_path / 'data'
+    generate('--output', str(output), '--seed-compat', '--engine', engine)
+    assert _digests(output) == BASELINE_DIGESTS
+
+
+def test_seed_compat_accepts_the_heuristic_sla_model(generate, tmp_path):
+    output = tmp_path / 'data'
+    generate('--output', str(output), '--seed-compat', '--sla-model', 'heuristic')
+    assert _digests(output) == BASELINE_DIGESTS
+
+
+@pytest.mark.parametrize('sla_model', ['erlang', 'simulation'])
+def test_seed_compat_rejects_other_sla_models(generate, tmp_path, sla_model):
+    with pytest.raises(subprocess.CalledProcessError):
+        generate('--output', str(tmp_path / 'data'), '--seed-compat', '--sla-model', sla_model)
+    assert not (tmp_path / 'data').exists()
@@ -0,0 +1,50 @@
+"""The SLA simulation must not depend on how many worker processes run it."""
+
+import numpy as np
+import pytest
+
+from simulation import INTERVAL_STATS, draw_contacts, simulate_days
+
+
+def _days(count: int = 9, hours: int = 13):
+    rng = np.random.default_rng(7)
+    calls = rng.poisson(60, size=(count, hours))
+    chats = rng.poisson(30, size=(count, hours))
+    days = [draw_contacts(np.random.default_rng([7, day]), calls[day], chats[day], keep=0.8,
+                          aht=360, patience=180, concurrency=2)
+            for day in range(count)]
+    capacity = rng.integers(4, 20, size=(count, hours)) * 2
+    return days, capacity
+
+
+@pytest.mark.parametrize('workers', [2, 3, 8])
+def test_simulate_days_is_independent_of_workers(workers):
+    days, capacity = _days()
+    serial = simulate_days(days, capacity, threshold=20, workers=1)
+
+    assert serial.shape == (len(days), len(INTERVAL_STATS), capacity.shape[1])
+    np.testing.assert_array_equal(simulate_days(days, capacity, threshold=20, workers=workers),
+                                  serial)
+
+
+def test_simulated_contacts_are_accounted_for():
+    days, capacity = _days()
+    stats = simulate_days(days, capacity, threshold=20)
+    offered, answered, in_threshold, abandoned, _ = (stats[:, INTERVAL_STATS.index(name)]
+                                                     for name in INTERVAL_STATS)
+
+    assert offered.sum(axis=1).tolist() == [len(day.arrival) for day in days]
+    np.testing.assert_array_equal(answered + abandoned, offered)
+    assert (in_threshold <= answered).all()
+
+
+def test_sim_workers_output_is_identical(generate, tmp_path):
+    options = ('--start', '2024-01-01', '--end', '2024-01-21', '--sla-model', 'simulation')
+    generate('--output', str(tmp_path / 'serial'), *options, '--sim-workers', '1')
+    generate('--output', str(tmp_path / 'parallel'), *options, '--sim-workers', '3')
+
+    serial = sorted((tmp_path / 'serial').rglob('*.json'))
+    assert (tmp_path / 'serial' / 'sla_intervals.json') in serial
+    for path in serial:
+        name = path.relative_to(tmp_path / 'serial')
+        assert path.read_bytes() == (tmp_path / 'parallel' / name).read_bytes(), name
@@ -162,7 +162,9 @@ export const MetricsCards: React.FC = () => {
     deflectionParams,
     simulationMode,
     scenarioParams,
-    getCurrentDayVolume
+    getCurrentDayVolume,
+    loadDeflectionSweep,
+    loadVolumeForecast
   } = useForecastStore();
 
   const summaryMetrics = useSummaryMetrics();
@@ -186,7 +188,9 @@ export const MetricsCards: React.FC = () => {
     };
 
     loadInsights();
-  }, []);
+    loadDeflectionSweep();
+    loadVolumeForecast();
+  }, [loadDeflectionSweep, loadVolumeForecast]);
 
   // Track value changes for animations
   useEffect(() => {
@@ -233,7 +237,7 @@ export const MetricsCards: React.FC = () => {
       totalContacts: 782456,
       avgDailyVolume: 2141,
       slaPerformance: avgSLA,
-      costSavings: 1300000,
+      costSavings: summaryMetrics.costSavings,
       currentFTE: summaryMetrics.totalAiAwareFTE
     };
   };
@@ -1,6 +1,7 @@
 import { useState, useEffect, useCallback } from 'react';
 import { useAppStore } from '../store';
 import { forecastVolume, calculateStaffingRequirement } from '../lib/calculations';
+import { DataExtractors } from '../lib/dataLoader';
 import type { ForecastData } from '../lib/types';
 
 export const useForecast = () => {
@@ -14,6 +15,25 @@ export const useForecast = () => {
     setIsUpdating(true);
 
     try {
+      // Use the generator's volume forecast for its first day when there is one
+      const forecastWeek = historicalData ? [] : await DataExtractors.getForecastWeek();
+      if (forecastWeek.length > 0) {
+        const firstDay = forecastWeek
+          .filter(volume => volume.dayOfWeek === forecastWeek[0].dayOfWeek)
+          .slice(0, periods);
+        setForecastData(firstDay.map((volume, index) => {
+          const predicted = volume.calls + volume.chats + volume.emails;
+          return {
+            period: `${volume.hour.toString().padStart(2, '0')}:00`,
+            contactVolume: index === 0 ? predicted : 0, // Only current hour has actual data
+            predictedVolume: predicted,
+            staffRequired: calculateStaffingRequirement(predicted, 300), // 5 min avg handle time
+            currentStaff: Math.floor(predicted * 0.8) // Simulated current staffing
+          };
+        }));
+        return;
+      }
+
       // Simulate API delay
       await new Promise(resolve => setTimeout(resolve, 1000));
 
@@ -1,3 +1,4 @@
+import type { DeflectionSweep, PeriodRollup } from './dataLoader';
 import type {
   ForecastData,
   StaffingMetrics,
@@ -13,6 +14,17 @@ export interface DeflectionImpact {
   costSavings: number;
 }
 
+export interface SweepPoint {
+  deflectionRate: number;
+  ahtMinutes: number;
+  shrinkage: number;
+  slaTarget: number;
+  requiredFtes: number;
+  peakAgents: number;
+  annualCost: number;
+  annualSavings: number;
+}
+
 export interface CoverageGap {
   hour: number;
   gap: number; // positive = understaffed, negative = overstaffed
@@ -20,6 +32,12 @@ export interface CoverageGap {
   type: 'gap' | 'surplus';
 }
 
+export interface RollupTrends {
+  recentSLA: number;
+  previousSLA: number | null; // null when there is no earlier period to compare with
+  volumeTrend: 'up' | 'down' | 'stable';
+}
+
 export interface ForecastComparison {
   hourlyTraditional: StaffingRequirements[];
   hourlyAiAware: StaffingRequirements[];
@@ -86,6 +104,60 @@ export const calculateDeflectionImpact = (
   };
 };
 
+// 2b. Look up the nearest point of the precomputed what-if sweep (no Erlang math per slider move)
+const nearestIndex = (values: number[], target: number): number => {
+  let best = 0;
+  values.forEach((value, index) => {
+    if (Math.abs(value - target) < Math.abs(values[best] - target)) best = index;
+  });
+  return best;
+};
+
+export const lookupSweep = (
+  sweep: DeflectionSweep,
+  deflectionRate: number,
+  avgHandleTime: number = sweep.assumptions.nominal.ahtMinutes, // minutes
+  shrinkage: number = sweep.assumptions.nominal.shrinkage,
+  targetSLA: number = sweep.assumptions.nominal.slaTarget
+): SweepPoint => {
+  const { axes, shape } = sweep;
+  const i = nearestIndex(axes.deflectionRate, deflectionRate);
+  const j = nearestIndex(axes.ahtMinutes, avgHandleTime);
+  const k = nearestIndex(axes.shrinkage, shrinkage);
+  const l = nearestIndex(axes.slaTarget, targetSLA);
+  const index = ((i * shape[1] + j) * shape[2] + k) * shape[3] + l;
+
+  return {
+    deflectionRate: axes.deflectionRate[i],
+    ahtMinutes: axes.ahtMinutes[j],
+    shrinkage: axes.shrinkage[k],
+    slaTarget: axes.slaTarget[l],
+    requiredFtes: sweep.requiredFtes[index],
+    peakAgents: sweep.peakAgents[index],
+    annualCost: sweep.annualCost[index],
+    annualSavings: sweep.annualSavings[index]
+  };
+};
+
+// 2c. Deflection impact from the sweep table: Erlang staffing and loaded costs instead of the linear estimate
+export const calculateDeflectionImpactFromSweep = (
+  sweep: DeflectionSweep,
+  currentDeflection: number,
+  newDeflection: number,
+  avgHandleTime?: number,
+  shrinkage?: number,
+  targetSLA?: number
+): DeflectionImpact => {
+  const current = lookupSweep(sweep, currentDeflection, avgHandleTime, shrinkage, targetSLA);
+  const scenario = lookupSweep(sweep, newDeflection, avgHandleTime, shrinkage, targetSLA);
+
+  return {
+    staffingChange: Math.round(scenario.requiredFtes - current.requiredFtes), // negative = reduction
+    percentReduction: (newDeflection - currentDeflection) * 100,
+    costSavings: current.annualCost - scenario.annualCost
+  };
+};
+
 // 3. Calculate hourly coverage
 export const calculateHourlyCoverage = (
   hourlyVolume: HourlyVolume[],
@@ -253,6 +325,31 @@ export const forecastVolume = (
   return forecast;
 };
 
+// Compare the last three months of the monthly rollup with the three before
+export const compareRollupMonths = (monthly: PeriodRollup[]): RollupTrends => {
+  const recentMonths = monthly.slice(-3);
+  const previousMonths = monthly.slice(-6, -3);
+
+  // Day-weighted averages
+  const weightedSLA = (months: PeriodRollup[]) =>
+    months.reduce((sum, m) => sum + m.avgSLA * m.days, 0) / months.reduce((sum, m) => sum + m.days, 0);
+  const dailyVolume = (months: PeriodRollup[]) =>
+    months.reduce((sum, m) => sum + m.totalVolume, 0) / months.reduce((sum, m) => sum + m.days, 0);
+
+  const recentSLA = weightedSLA(recentMonths);
+  if (previousMonths.length === 0) {
+    // Three months or less of history: nothing to compare against
+    return { recentSLA, previousSLA: null, volumeTrend: 'stable' };
+  }
+
+  const volumeChange = dailyVolume(recentMonths) / dailyVolume(previousMonths) - 1;
+  return {
+    recentSLA,
+    previousSLA: weightedSLA(previousMonths),
+    volumeTrend: volumeChange > 0.05 ? 'up' : volumeChange < -0.05 ? 'down' : 'stable'
+  };
+};
+
 // UNIT TESTS
 export const runCalculationTests = () => {
   // console.log('Running WFM Calculation Tests...\n');
@@ -292,5 +389,22 @@ export const runCalculationTests = () => {
   // console.log(`Traditional total: ${test4Result.dailyTotalTraditional}, AI-aware total: ${test4Result.dailyTotalAiAware}`);
   // console.log(`Savings: ${test4Result.dailyDifference} agents\n`);
 
+  // Test 5: compareRollupMonths
+  // console.log('Test 5: compareRollupMonths');
+  const mockMonth = (month: string, days: number, avgSLA: number, totalVolume: number): PeriodRollup => ({
+    month, days, avgSLA, totalVolume, avgDailyVolume: totalVolume / days,
+    calls: totalVolume, chats: 0, emails: 0, byType: { billing: 0, technical: 0, general: 0, sales: 0 }
+  });
+  const test5Short = compareRollupMonths([mockMonth('2024-01', 31, 0.8, 3100), mockMonth('2024-02', 29, 0.9, 2900)]);
+  console.assert(test5Short.previousSLA === null && !Number.isNaN(test5Short.recentSLA) &&
+                 test5Short.volumeTrend === 'stable', 'Test 5: two months must not compare against NaN');
+  const test5Result = compareRollupMonths([
+    mockMonth('2024-01', 31, 0.70, 3100), mockMonth('2024-02', 29, 0.70, 2900), mockMonth('2024-03', 31, 0.70, 3100),
+    mockMonth('2024-04', 30, 0.85, 3600), mockMonth('2024-05', 31, 0.85, 3720), mockMonth('2024-06', 30, 0.85, 3600)
+  ]);
+  console.assert(test5Result.previousSLA !== null && test5Result.recentSLA > test5Result.previousSLA &&
+                 test5Result.volumeTrend === 'up', 'Test 5: six months must compare quarter over quarter');
+  // console.log(`Short history: ${JSON.stringify(test5Short)}, six months: ${JSON.stringify(test5Result)}\n`);
+
   // console.log('All tests completed!');
 };
\ No newline at end of file
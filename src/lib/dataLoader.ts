@@ -5,6 +5,9 @@
  * the synthetic contact center dataset generated by Python scripts.
  */
 
+import { compareRollupMonths } from './calculations';
+import { DayOfWeek, type HourlyVolume } from './types';
+
 // Types for synthetic data structures
 export interface SyntheticSummary {
   totalContacts: number;
@@ -31,6 +34,8 @@ export interface SyntheticSummary {
 export interface VolumeRecord {
   date: string;
   hour: number;
+  // Minute past the hour for 15/30-minute data (--interval-minutes); absent for hourly data
+  minute?: number;
   calls: number;
   chats: number;
   emails: number;
@@ -42,6 +47,13 @@ export interface VolumeRecord {
   };
 }
 
+// Volume forecast written by the generator's --forecast-days stage: expected
+// volumes in the historical schema, with lower/upper confidence bounds
+export interface ForecastRecord extends VolumeRecord {
+  lower: Pick<VolumeRecord, 'calls' | 'chats' | 'emails' | 'contactType'>;
+  upper: Pick<VolumeRecord, 'calls' | 'chats' | 'emails' | 'contactType'>;
+}
+
 export interface DeflectionRecord {
   month: string;
   overallRate: number;
@@ -62,6 +74,10 @@ export interface StaffingRecord {
   ptoCount: number;
   sickCount: number;
   trainingCount: number;
+  // Shift window for the day, present when the generator planned shifts
+  // (--scheduler greedy/milp); otherwise the shift runs its default hours
+  start?: number;
+  end?: number;
 }
 
 export interface SLARecord {
@@ -98,6 +114,152 @@ export interface CostData {
   };
 }
 
+// What-if table written by the generator's --sweep stage. Each measure is a
+// flat array in C order over the axes (deflectionRate, ahtMinutes, shrinkage,
+// slaTarget); see lookupSweep in calculations.ts.
+export interface DeflectionSweep {
+  historyStart: string;
+  historyEnd: string;
+  days: number;
+  intervals: number;
+  currentDeflectionRate: number;
+  assumptions: {
+    answerThresholdSeconds: number;
+    chatConcurrency: number;
+    hoursPerFte: number;
+    costPerFte: number;
+    aiCostPerContact: number;
+    nominal: { ahtMinutes: number; shrinkage: number; slaTarget: number };
+  };
+  axes: {
+    deflectionRate: number[];
+    ahtMinutes: number[];
+    shrinkage: number[];
+    slaTarget: number[];
+  };
+  shape: [number, number, number, number];
+  requiredFtes: number[];
+  peakAgents: number[];
+  annualCost: number[];
+  annualSavings: number[];
+  potentialSavings: Record<string, { agentReduction: number; annualSavings: number }>;
+}
+
+// Pre-aggregated rollups written by the generator to /data/rollups/
+export interface DailyRollup {
+  date: string;
+  totalVolume: number;
+  calls: number;
+  chats: number;
+  emails: number;
+  byType: { billing: number; technical: number; general: number; sales: number };
+  sla: number;
+  scheduled: number;
+  actual: number;
+}
+
+export interface PeriodRollup {
+  weekStart?: string;
+  month?: string;
+  days: number;
+  totalVolume: number;
+  calls: number;
+  chats: number;
+  emails: number;
+  byType: { billing: number; technical: number; general: number; sales: number };
+  avgDailyVolume: number;
+  avgSLA: number;
+  minSLA?: number;
+  daysBelowTarget?: number;
+  deflectionRate?: number;
+}
+
+export interface HourlyProfile {
+  hours: number[];
+  weekdays: string[];
+  days: number[];
+  totals: number[][];
+  average: number[][];
+  overall: number[];
+  peakHour: string | null;
+}
+
+export interface AnomalyRecord {
+  date: string;
+  type: 'outage' | 'viral' | 'campaign' | 'bot_failure';
+  label: string;
+  description: string;
+  impact: 'high' | 'medium' | 'low';
+  effects: string[];
+  firstDay: string;
+  lastDay: string;
+}
+
+// anomaly_index.json: every event occurrence with the window of each effect.
+// byDate and byType hold positions in events.
+export interface AnomalyWindow {
+  firstDay?: string;
+  lastDay?: string;
+  month?: string;
+  multiplier?: number;
+  hours?: [number, number];
+  actual?: number;
+  avgWaitTime?: number;
+  abandonment?: number;
+}
+
+export interface AnomalyIndexEvent extends AnomalyRecord {
+  windows: Partial<Record<'volume' | 'sla' | 'deflection', AnomalyWindow>>;
+}
+
+export interface AnomalyIndex {
+  startDate: string;
+  endDate: string;
+  events: AnomalyIndexEvent[];
+  byDate: Record<string, number[]>;
+  byType: Record<string, number[]>;
+}
+
+interface Rollups {
+  daily: DailyRollup[];
+  weekly: PeriodRollup[];
+  monthly: PeriodRollup[];
+  hourly_profile: HourlyProfile;
+}
+
+// Manifest of month-partitioned record files (generator --partition month).
+// offsets[i] is the [start, end) byte span of the records of firstDate + i days.
+interface DataPartition {
+  month: string;
+  path: string;
+  firstDate: string;
+  lastDate: string;
+  records: number;
+  bytes: number;
+  offsets: Array<[number, number]>;
+}
+
+// Volume per period from the local data service's /volume query endpoint
+export interface VolumeQueryRecord {
+  date?: string;
+  weekStart?: string;
+  month?: string;
+  days?: number;
+  totalVolume: number;
+  calls: number;
+  chats: number;
+  emails: number;
+  byType: { billing: number; technical: number; general: number; sales: number };
+}
+
+interface PartitionManifest {
+  partition: 'month';
+  jsonFormat: 'pretty' | 'compact' | 'ndjson';
+  datasets: Record<string, { partitions: DataPartition[] }>;
+}
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+
 // Cache for loaded data
 let dataCache: {
   summary?: SyntheticSummary;
@@ -106,16 +268,32 @@ let dataCache: {
   staffing?: StaffingRecord[];
   sla?: SLARecord[];
   costs?: CostData;
+  forecast?: ForecastRecord[];
+  rollups?: Partial<Rollups>;
+  // null once we know the generator ran without --sweep
+  sweep?: DeflectionSweep | null;
+  anomalyIndex?: AnomalyIndex | null;
+  // null once we know the data is not partitioned
+  manifest?: PartitionManifest | null;
   lastLoaded?: number;
 } = {};
 
 const CACHE_DURATION = 5 * 60 * 1000; // 5 minutes
 
+// Record datasets are plain JSON arrays by default; set VITE_DATA_FORMAT=ndjson
+// when the generator was run with --json-format ndjson
+const DATA_FORMAT: 'json' | 'ndjson' = import.meta.env.VITE_DATA_FORMAT === 'ndjson' ? 'ndjson' : 'json';
+
+// Origin of scripts/data_server.py (e.g. http://127.0.0.1:8787); data files
+// are fetched from it instead of the dev server's /data/ when set
+const DATA_SERVICE_URL: string = import.meta.env.VITE_DATA_SERVICE_URL || '';
+const DATA_BASE = `${DATA_SERVICE_URL}/data`;
+
 // Data loading functions
 export class SyntheticDataLoader {
   private static async fetchJson<T>(filename: string): Promise<T> {
     try {
-      const response = await fetch(`/data/${filename}`);
+      const response = await fetch(`${DATA_BASE}/${filename}`);
       if (!response.ok) {
         throw new Error(`Failed to load ${filename}: ${response.statusText}`);
       }
@@ -126,6 +304,172 @@ export class SyntheticDataLoader {
     }
   }
 
+  /**
+   * Incrementally parse an NDJSON file, yielding each record as soon as its
+   * line has arrived instead of buffering the whole response body
+   */
+  static async *streamNdjson<T>(filename: string): AsyncGenerator<T> {
+    const response = await fetch(`${DATA_BASE}/${filename}`);
+    if (!response.ok || !response.body) {
+      throw new Error(`Failed to load ${filename}: ${response.statusText}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffered = '';
+
+    for (;;) {
+      const { done, value } = await reader.read();
+      buffered += decoder.decode(value, { stream: !done });
+
+      const lines = buffered.split('\n');
+      buffered = lines.pop() ?? '';
+      for (const line of lines) {
+        if (line.trim()) {
+          yield JSON.parse(line) as T;
+        }
+      }
+
+      if (done) break;
+    }
+
+    if (buffered.trim()) {
+      yield JSON.parse(buffered) as T;
+    }
+  }
+
+  private static async fetchNdjson<T>(filename: string): Promise<T[]> {
+    const records: T[] = [];
+    try {
+      for await (const record of this.streamNdjson<T>(filename)) {
+        records.push(record);
+      }
+      return records;
+    } catch (error) {
+      console.warn(`Failed to load ${filename}, using fallback data:`, error);
+      return [];
+    }
+  }
+
+  /**
+   * Load a record dataset (e.g. 'historical_volume') in the configured format
+   */
+  private static async fetchRecords<T>(dataset: string): Promise<T[]> {
+    const manifest = await this.loadManifest();
+    if (manifest?.datasets[dataset]) {
+      try {
+        const parts = await Promise.all(manifest.datasets[dataset].partitions.map(
+          partition => this.fetchPartition<T>(partition, manifest.jsonFormat)));
+        return parts.flat();
+      } catch (error) {
+        console.warn(`Failed to load ${dataset} partitions, using fallback data:`, error);
+        return [];
+      }
+    }
+
+    return DATA_FORMAT === 'ndjson'
+      ? this.fetchNdjson<T>(`${dataset}.ndjson`)
+      : this.fetchJson<T[]>(`${dataset}.json`);
+  }
+
+  /**
+   * Load the partition manifest; null when the data is not partitioned
+   */
+  private static async loadManifest(): Promise<PartitionManifest | null> {
+    if (dataCache.manifest !== undefined) {
+      return dataCache.manifest;
+    }
+
+    try {
+      const response = await fetch(`${DATA_BASE}/partitions.json`);
+      dataCache.manifest = response.ok ? await response.json() as PartitionManifest : null;
+    } catch {
+      dataCache.manifest = null;
+    }
+    return dataCache.manifest;
+  }
+
+  /**
+   * Parse a whole partition file, or a run of whole records cut from one
+   */
+  private static parseRecords<T>(text: string, format: PartitionManifest['jsonFormat'], slice: boolean): T[] {
+    if (format === 'ndjson') {
+      return text.split('\n').filter(line => line.trim()).map(line => JSON.parse(line) as T);
+    }
+    return JSON.parse(slice ? `[${text}]` : text) as T[];
+  }
+
+  /**
+   * Fetch one partition, or only the bytes of the days between first and last
+   */
+  private static async fetchPartition<T>(
+    partition: DataPartition,
+    format: PartitionManifest['jsonFormat'],
+    first?: string,
+    last?: string
+  ): Promise<T[]> {
+    const firstIndex = first ? Math.round((Date.parse(first) - Date.parse(partition.firstDate)) / DAY_MS) : 0;
+    const lastIndex = last
+      ? Math.round((Date.parse(last) - Date.parse(partition.firstDate)) / DAY_MS)
+      : partition.offsets.length - 1;
+    const whole = firstIndex <= 0 && lastIndex >= partition.offsets.length - 1;
+
+    const headers: Record<string, string> = {};
+    if (!whole) {
+      const start = partition.offsets[firstIndex][0];
+      const end = partition.offsets[lastIndex][1];
+      headers.Range = `bytes=${start}-${end - 1}`;
+    }
+
+    const response = await fetch(`${DATA_BASE}/${partition.path}`, { headers });
+    if (!response.ok) {
+      throw new Error(`Failed to load ${partition.path}: ${response.statusText}`);
+    }
+    const text = await response.text();
+    if (whole || response.status === 206) {
+      return this.parseRecords<T>(text, format, !whole);
+    }
+
+    // The server ignored the Range header and sent the whole file
+    return this.parseRecords<T>(text, format, false).filter(record => {
+      const date = (record as { date: string }).date;
+      return (!first || date >= first) && (!last || date <= last);
+    });
+  }
+
+  /**
+   * Load only the records of a date range from a partitioned dataset.
+   * Resolves to null without a range or when the dataset is not partitioned.
+   */
+  private static async fetchRange<T>(
+    dataset: string,
+    dateRange?: { start?: string; end?: string }
+  ): Promise<T[] | null> {
+    if (!dateRange?.start && !dateRange?.end) {
+      return null;
+    }
+    const manifest = await this.loadManifest();
+    if (!manifest?.datasets[dataset]) {
+      return null;
+    }
+
+    try {
+      const covering = manifest.datasets[dataset].partitions.filter(partition =>
+        (!dateRange.start || partition.lastDate >= dateRange.start) &&
+        (!dateRange.end || partition.firstDate <= dateRange.end));
+      const parts = await Promise.all(covering.map(partition => this.fetchPartition<T>(
+        partition,
+        manifest.jsonFormat,
+        dateRange.start && dateRange.start > partition.firstDate ? dateRange.start : undefined,
+        dateRange.end && dateRange.end < partition.lastDate ? dateRange.end : undefined
+      )));
+      return parts.flat();
+    } catch (error) {
+      console.warn(`Failed to load ${dataset} partitions, using fallback data:`, error);
+      return [];
+    }
+  }
+
   private static isCacheValid(): boolean {
     return dataCache.lastLoaded &&
            (Date.now() - dataCache.lastLoaded) < CACHE_DURATION;
@@ -153,7 +497,12 @@ export class SyntheticDataLoader {
       return this.filterByDateRange(dataCache.volume, dateRange);
     }
 
-    const volume = await this.fetchJson<VolumeRecord[]>('historical_volume.json');
+    const ranged = await this.fetchRange<VolumeRecord>('historical_volume', dateRange);
+    if (ranged) {
+      return ranged;
+    }
+
+    const volume = await this.fetchRecords<VolumeRecord>('historical_volume');
     dataCache.volume = volume;
     dataCache.lastLoaded = Date.now();
     return this.filterByDateRange(volume, dateRange);
@@ -167,7 +516,7 @@ export class SyntheticDataLoader {
       return dataCache.deflection;
     }
 
-    const deflection = await this.fetchJson<DeflectionRecord[]>('deflection_history.json');
+    const deflection = await this.fetchRecords<DeflectionRecord>('deflection_history');
     dataCache.deflection = deflection;
     dataCache.lastLoaded = Date.now();
     return deflection;
@@ -181,7 +530,12 @@ export class SyntheticDataLoader {
       return this.filterByDateRange(dataCache.staffing, dateRange);
     }
 
-    const staffing = await this.fetchJson<StaffingRecord[]>('staffing_schedules.json');
+    const ranged = await this.fetchRange<StaffingRecord>('staffing_schedules', dateRange);
+    if (ranged) {
+      return ranged;
+    }
+
+    const staffing = await this.fetchRecords<StaffingRecord>('staffing_schedules');
     dataCache.staffing = staffing;
     dataCache.lastLoaded = Date.now();
     return this.filterByDateRange(staffing, dateRange);
@@ -195,12 +549,31 @@ export class SyntheticDataLoader {
       return this.filterByDateRange(dataCache.sla, dateRange);
     }
 
-    const sla = await this.fetchJson<SLARecord[]>('sla_performance.json');
+    const ranged = await this.fetchRange<SLARecord>('sla_performance', dateRange);
+    if (ranged) {
+      return ranged;
+    }
+
+    const sla = await this.fetchRecords<SLARecord>('sla_performance');
     dataCache.sla = sla;
     dataCache.lastLoaded = Date.now();
     return this.filterByDateRange(sla, dateRange);
   }
 
+  /**
+   * Load the volume forecast (empty when the generator ran without --forecast-days)
+   */
+  static async loadVolumeForecast(dateRange?: { start?: string; end?: string }): Promise<ForecastRecord[]> {
+    if (this.isCacheValid() && dataCache.forecast) {
+      return this.filterByDateRange(dataCache.forecast, dateRange);
+    }
+
+    const forecast = await this.fetchRecords<ForecastRecord>('volume_forecast');
+    dataCache.forecast = Array.isArray(forecast) ? forecast : [];
+    dataCache.lastLoaded = Date.now();
+    return this.filterByDateRange(dataCache.forecast, dateRange);
+  }
+
   /**
    * Load cost and benchmark data
    */
@@ -215,10 +588,97 @@ export class SyntheticDataLoader {
     return costs;
   }
 
+  /**
+   * Load the what-if deflection/cost table; null when generated without --sweep
+   */
+  static async loadDeflectionSweep(): Promise<DeflectionSweep | null> {
+    if (this.isCacheValid() && dataCache.sweep !== undefined) {
+      return dataCache.sweep;
+    }
+
+    try {
+      const response = await fetch(`${DATA_BASE}/deflection_sweep.json`);
+      dataCache.sweep = response.ok ? await response.json() as DeflectionSweep : null;
+    } catch {
+      dataCache.sweep = null;
+    }
+    dataCache.lastLoaded = Date.now();
+    return dataCache.sweep;
+  }
+
+  /**
+   * Load the anomaly index; null when the data predates it
+   */
+  static async loadAnomalyIndex(): Promise<AnomalyIndex | null> {
+    if (this.isCacheValid() && dataCache.anomalyIndex !== undefined) {
+      return dataCache.anomalyIndex;
+    }
+
+    try {
+      const response = await fetch(`${DATA_BASE}/anomaly_index.json`);
+      dataCache.anomalyIndex = response.ok ? await response.json() as AnomalyIndex : null;
+    } catch {
+      dataCache.anomalyIndex = null;
+    }
+    dataCache.lastLoaded = Date.now();
+    return dataCache.anomalyIndex;
+  }
+
+  /**
+   * Load one pre-aggregated rollup (a few KB instead of the raw records).
+   * Resolves to null when the data was generated without rollups.
+   */
+  static async loadRollup<K extends keyof Rollups>(name: K): Promise<Rollups[K] | null> {
+    if (this.isCacheValid() && dataCache.rollups?.[name]) {
+      return dataCache.rollups[name] as Rollups[K];
+    }
+
+    try {
+      const response = await fetch(`${DATA_BASE}/rollups/${name}.json`);
+      if (!response.ok) {
+        return null;
+      }
+      const rollup = await response.json() as Rollups[K];
+      dataCache.rollups = { ...dataCache.rollups, [name]: rollup };
+      dataCache.lastLoaded = Date.now();
+      return rollup;
+    } catch {
+      return null;
+    }
+  }
+
+  /**
+   * Query volume per day, week or month from the local data service.
+   * Resolves to null when no service is configured or it cannot answer,
+   * so callers fall back to the rollups or loadVolumeData.
+   */
+  static async queryVolume(
+    granularity: 'day' | 'week' | 'month',
+    dateRange?: { start?: string; end?: string }
+  ): Promise<VolumeQueryRecord[] | null> {
+    if (!DATA_SERVICE_URL) {
+      return null;
+    }
+
+    const params = new URLSearchParams({ granularity });
+    if (dateRange?.start) params.set('start', dateRange.start);
+    if (dateRange?.end) params.set('end', dateRange.end);
+    try {
+      const response = await fetch(`${DATA_SERVICE_URL}/volume?${params}`);
+      if (!response.ok) {
+        return null;
+      }
+      const result = await response.json() as { records: VolumeQueryRecord[] };
+      return result.records;
+    } catch {
+      return null;
+    }
+  }
+
   /**
    * Helper function to filter data by date range
    */
-  private static filterByDateRange<T extends { date: string }>(
+  static filterByDateRange<T extends { date: string }>(
     data: T[],
     dateRange?: { start?: string; end?: string }
   ): T[] {
@@ -256,6 +716,32 @@ export class DataExtractors {
     emails: number;
     byType: { billing: number; technical: number; general: number; sales: number };
   }>> {
+    const queried = await SyntheticDataLoader.queryVolume('day', dateRange);
+    if (queried) {
+      return queried.map(day => ({
+        date: day.date as string,
+        totalVolume: day.totalVolume,
+        calls: day.calls,
+        chats: day.chats,
+        emails: day.emails,
+        byType: day.byType
+      }));
+    }
+
+    // Without the data service, use the daily rollup
+    const daily = await SyntheticDataLoader.loadRollup('daily');
+    if (daily) {
+      return SyntheticDataLoader.filterByDateRange(daily, dateRange).map(day => ({
+        date: day.date,
+        totalVolume: day.totalVolume,
+        calls: day.calls,
+        chats: day.chats,
+        emails: day.emails,
+        byType: day.byType
+      }));
+    }
+
+    // Fall back to reducing the raw hourly records
     const volumeData = await SyntheticDataLoader.loadVolumeData(dateRange);
 
     const dailyTotals = volumeData.reduce((acc, record) => {
@@ -285,12 +771,73 @@ export class DataExtractors {
     return Object.values(dailyTotals).sort((a, b) => a.date.localeCompare(b.date));
   }
 
+  /**
+   * Get the average contacts per weekday and hour from the rollup
+   */
+  static async getHourlyProfile(): Promise<HourlyProfile | null> {
+    return SyntheticDataLoader.loadRollup('hourly_profile');
+  }
+
   /**
    * Get hourly patterns for a specific date
    */
   static async getHourlyPattern(date: string): Promise<VolumeRecord[]> {
     const volumeData = await SyntheticDataLoader.loadVolumeData({ start: date, end: date });
-    return volumeData.sort((a, b) => a.hour - b.hour);
+    return this.foldHours(volumeData);
+  }
+
+  /**
+   * Get the first forecast week as hourly volumes per weekday, in forecast
+   * order; empty when the generator ran without --forecast-days
+   */
+  static async getForecastWeek(): Promise<HourlyVolume[]> {
+    const forecast = await SyntheticDataLoader.loadVolumeForecast();
+    const dates = Array.from(new Set(forecast.map(record => record.date))).slice(0, 7);
+    const weekdays = [
+      DayOfWeek.SUNDAY, DayOfWeek.MONDAY, DayOfWeek.TUESDAY, DayOfWeek.WEDNESDAY,
+      DayOfWeek.THURSDAY, DayOfWeek.FRIDAY, DayOfWeek.SATURDAY
+    ];
+
+    return dates.flatMap(date => {
+      const dayOfWeek = weekdays[new Date(`${date}T00:00:00Z`).getUTCDay()];
+      return this.foldHours(forecast.filter(record => record.date === date)).map(record => ({
+        hour: record.hour,
+        dayOfWeek,
+        calls: record.calls,
+        chats: record.chats,
+        emails: record.emails
+      }));
+    });
+  }
+
+  /**
+   * Fold sub-hourly intervals of one day into their hour
+   */
+  private static foldHours(volumeData: VolumeRecord[]): VolumeRecord[] {
+    const byHour = new Map<number, VolumeRecord>();
+    for (const record of volumeData) {
+      const hourly = byHour.get(record.hour);
+      if (!hourly) {
+        byHour.set(record.hour, {
+          date: record.date,
+          hour: record.hour,
+          calls: record.calls,
+          chats: record.chats,
+          emails: record.emails,
+          contactType: { ...record.contactType }
+        });
+        continue;
+      }
+      hourly.calls += record.calls;
+      hourly.chats += record.chats;
+      hourly.emails += record.emails;
+      hourly.contactType.billing += record.contactType.billing;
+      hourly.contactType.technical += record.contactType.technical;
+      hourly.contactType.general += record.contactType.general;
+      hourly.contactType.sales += record.contactType.sales;
+    }
+
+    return Array.from(byHour.values()).sort((a, b) => a.hour - b.hour);
   }
 
   /**
@@ -308,7 +855,7 @@ export class DataExtractors {
       SyntheticDataLoader.loadStaffingData({ start: date, end: date })
     ]);
 
-    // Group staffing by shift times
+    // Default shift times, used when records carry no planned window
     const shiftMap = {
       morning: { start: 8, end: 12 },
       midday: { start: 12, end: 17 },
@@ -318,15 +865,15 @@ export class DataExtractors {
     const staffingByHour = volumeData.map(volume => {
       const hour = volume.hour;
 
-      // Find which shift this hour belongs to
-      let shiftStaffing = { scheduled: 0, actual: 0 };
-      for (const [shift, times] of Object.entries(shiftMap)) {
-        if (hour >= times.start && hour < times.end) {
-          const shiftData = staffingData.find(s => s.shift === shift);
-          if (shiftData) {
-            shiftStaffing = { scheduled: shiftData.scheduled, actual: shiftData.actual };
-          }
-          break;
+      // Sum the shifts covering this hour (planned shifts may overlap)
+      const shiftStaffing = { scheduled: 0, actual: 0 };
+      for (const shiftData of staffingData) {
+        const times = shiftData.start !== undefined && shiftData.end !== undefined
+          ? { start: shiftData.start, end: shiftData.end }
+          : shiftMap[shiftData.shift];
+        if (times && hour >= times.start && hour < times.end) {
+          shiftStaffing.scheduled += shiftData.scheduled;
+          shiftStaffing.actual += shiftData.actual;
         }
       }
 
@@ -354,6 +901,11 @@ export class DataExtractors {
     description: string;
     impact: 'high' | 'medium' | 'low';
   }>> {
+    const anomalies = (await SyntheticDataLoader.loadAnomalyIndex())?.events;
+    if (anomalies) {
+      return anomalies.map(({ date, type, description, impact }) => ({ date, type, description, impact }));
+    }
+
     return [
       {
         date: '2024-03-15',
@@ -382,6 +934,17 @@ export class DataExtractors {
     ];
   }
 
+  /**
+   * Get the anomaly events affecting a day (YYYY-MM-DD), with their effect windows
+   */
+  static async getAnomaliesOn(date: string): Promise<AnomalyIndexEvent[]> {
+    const index = await SyntheticDataLoader.loadAnomalyIndex();
+    if (!index) {
+      return [];
+    }
+    return (index.byDate[date] ?? []).map(position => index.events[position]);
+  }
+
   /**
    * Get trend analysis for deflection improvements
    */
@@ -425,36 +988,48 @@ export class StatisticsGenerator {
       slaTrend: 'improving' | 'declining' | 'stable';
     };
   }> {
-    const [summary, deflection, sla] = await Promise.all([
+    const [summary, deflection, monthly, profile] = await Promise.all([
       SyntheticDataLoader.loadSummary(),
       SyntheticDataLoader.loadDeflectionHistory(),
-      SyntheticDataLoader.loadSLAData()
+      SyntheticDataLoader.loadRollup('monthly'),
+      SyntheticDataLoader.loadRollup('hourly_profile')
     ]);
 
-    // Calculate recent trends (last 3 months vs previous 3 months)
-    const recentDeflection = deflection.slice(-3);
-    const previousDeflection = deflection.slice(-6, -3);
-
-    const recentSLA = sla.slice(-90); // Last 90 days
-    const previousSLA = sla.slice(-180, -90);
+    // Calculate recent trends (last 3 months vs previous 3 months); a trend is
+    // stable when the history is too short to have a previous period
+    const average = (values: number[]) =>
+      values.length ? values.reduce((sum, value) => sum + value, 0) / values.length : null;
+    const trend = (recent: number | null, previous: number | null): 'improving' | 'declining' | 'stable' =>
+      recent === null || previous === null ? 'stable' : recent > previous ? 'improving' : 'declining';
 
-    const avgRecentDeflection = recentDeflection.reduce((sum, d) => sum + d.overallRate, 0) / recentDeflection.length;
-    const avgPreviousDeflection = previousDeflection.reduce((sum, d) => sum + d.overallRate, 0) / previousDeflection.length;
+    const avgRecentDeflection = average(deflection.slice(-3).map(d => d.overallRate));
+    const avgPreviousDeflection = average(deflection.slice(-6, -3).map(d => d.overallRate));
 
-    const avgRecentSLA = recentSLA.reduce((sum, s) => sum + s.actual, 0) / recentSLA.length;
-    const avgPreviousSLA = previousSLA.reduce((sum, s) => sum + s.actual, 0) / previousSLA.length;
+    let avgRecentSLA: number | null;
+    let avgPreviousSLA: number | null;
+    let volumeTrend: 'up' | 'down' | 'stable' = 'stable';
+    if (monthly?.length) {
+      const monthlyTrends = compareRollupMonths(monthly);
+      avgRecentSLA = monthlyTrends.recentSLA;
+      avgPreviousSLA = monthlyTrends.previousSLA;
+      volumeTrend = monthlyTrends.volumeTrend;
+    } else {
+      const sla = await SyntheticDataLoader.loadSLAData();
+      avgRecentSLA = average(sla.slice(-90).map(s => s.actual)); // Last 90 days
+      avgPreviousSLA = average(sla.slice(-180, -90).map(s => s.actual));
+    }
 
     return {
       totalContacts: summary.totalContacts || 0,
       avgDailyVolume: Math.round((summary.avgWeeklyVolume || 0) / 7),
-      deflectionRate: avgRecentDeflection,
-      slaPerformance: avgRecentSLA,
+      deflectionRate: avgRecentDeflection ?? 0,
+      slaPerformance: avgRecentSLA ?? 0,
       costSavings: summary.keyMetrics?.deflectionSavings || 0,
-      peakHour: '10:00', // Based on known patterns
+      peakHour: profile?.peakHour ?? '10:00',
       trends: {
-        volumeTrend: 'stable', // Could be calculated from recent volume data
-        deflectionTrend: avgRecentDeflection > avgPreviousDeflection ? 'improving' : 'declining',
-        slaTrend: avgRecentSLA > avgPreviousSLA ? 'improving' : 'declining'
+        volumeTrend,
+        deflectionTrend: trend(avgRecentDeflection, avgPreviousDeflection),
+        slaTrend: trend(avgRecentSLA, avgPreviousSLA)
       }
     };
   }
@@ -11,9 +11,13 @@ import {
   calculateStaffingNeeds,
   findCoverageGaps,
   compareForecasts,
+  calculateDeflectionImpact,
+  calculateDeflectionImpactFromSweep,
   type CoverageGap,
+  type DeflectionImpact,
   type ForecastComparison
 } from '../lib/calculations';
+import { DataExtractors, SyntheticDataLoader, type DeflectionSweep } from '../lib/dataLoader';
 import {
   weeklyVolumeData,
   defaultDeflectionParams,
@@ -30,6 +34,7 @@ interface ForecastStore {
   isLoading: boolean;
   simulationMode: 'current' | 'scenario';
   scenarioParams: Partial<DeflectionParams> | null;
+  deflectionSweep: DeflectionSweep | null;
 
   // Actions
   setDeflectionRate: (rate: number) => void;
@@ -40,12 +45,15 @@ interface ForecastStore {
   runScenario: (newDeflection: number) => void;
   resetToBaseline: () => void;
   updateChartsFromChat: (chartUpdate: string) => void;
+  loadDeflectionSweep: () => Promise<void>;
+  loadVolumeForecast: () => Promise<void>;
 
   // Computed selectors
   getCurrentDayVolume: () => HourlyVolume[];
   getTotalWeeklyContacts: () => number;
   getCurrentStaffingGaps: () => CoverageGap[];
   getTraditionalVsAiComparison: () => ForecastComparison;
+  getDeflectionImpact: () => DeflectionImpact;
 }
 
 // Helper function to recalculate staffing data
@@ -53,8 +61,13 @@ const recalculateStaffingData = (
   weeklyVolume: HourlyVolume[],
   deflectionParams: DeflectionParams
 ): StaffingRequirements[] => {
-  // Get current staffing levels from the original schedule
-  const currentStaffingLevels = currentStaffingSchedule.map(s => s.currentStaffed);
+  // Get current staffing levels from the original schedule, matched by day and hour
+  const currentStaffingLevels = weeklyVolume.map(volume => {
+    const index = weeklyVolumeData.findIndex(
+      v => v.dayOfWeek === volume.dayOfWeek && v.hour === volume.hour
+    );
+    return index >= 0 ? currentStaffingSchedule[index].currentStaffed : 0;
+  });
 
   return calculateHourlyCoverage(
     weeklyVolume,
@@ -73,6 +86,7 @@ export const useForecastStore = create<ForecastStore>((set, get) => ({
   isLoading: false,
   simulationMode: 'current',
   scenarioParams: null,
+  deflectionSweep: null,
 
   // Actions
   setDeflectionRate: (rate: number) => {
@@ -168,13 +182,15 @@ export const useForecastStore = create<ForecastStore>((set, get) => ({
   },
 
   resetToBaseline: () => {
-    set({
+    set(state => ({
       deflectionParams: { ...defaultDeflectionParams },
-      staffingData: [...currentStaffingSchedule],
+      staffingData: state.weeklyVolume === weeklyVolumeData
+        ? [...currentStaffingSchedule]
+        : recalculateStaffingData(state.weeklyVolume, defaultDeflectionParams),
       simulationMode: 'current',
       scenarioParams: null,
       isLoading: false
-    });
+    }));
   },
 
   updateChartsFromChat: (chartUpdate: string) => {
@@ -209,6 +225,23 @@ export const useForecastStore = create<ForecastStore>((set, get) => ({
     get().addChatMessage(updateMessage);
   },
 
+  loadDeflectionSweep: async () => {
+    const sweep = await SyntheticDataLoader.loadDeflectionSweep();
+    set({ deflectionSweep: sweep });
+  },
+
+  loadVolumeForecast: async () => {
+    const forecastWeek = await DataExtractors.getForecastWeek();
+    if (forecastWeek.length === 0) {
+      return; // No --forecast-days output; keep the mock week
+    }
+
+    set(state => ({
+      weeklyVolume: forecastWeek,
+      staffingData: recalculateStaffingData(forecastWeek, state.deflectionParams)
+    }));
+  },
+
   // Computed selectors
   getCurrentDayVolume: () => {
     const state = get();
@@ -243,6 +276,24 @@ export const useForecastStore = create<ForecastStore>((set, get) => ({
       currentDayVolume,
       state.deflectionParams.currentRate
     );
+  },
+
+  getDeflectionImpact: () => {
+    const state = get();
+    if (state.deflectionSweep) {
+      // Erlang staffing and loaded costs from the generator's what-if table
+      return calculateDeflectionImpactFromSweep(
+        state.deflectionSweep,
+        0,
+        state.deflectionParams.currentRate
+      );
+    }
+
+    // Linear estimate when the data was generated without --sweep
+    const totalTraditionalFTE = state.staffingData.reduce(
+      (sum, req) => sum + req.traditionalFTE, 0
+    );
+    return calculateDeflectionImpact(0, state.deflectionParams.currentRate, totalTraditionalFTE);
   }
 }));
 
@@ -296,7 +347,7 @@ export const useSummaryMetrics = () => {
     (sum, req) => sum + req.aiAwareFTE, 0
   );
   const fteSavings = totalTraditionalFTE - totalAiAwareFTE;
-  const costSavings = fteSavings * 50000; // $50k per agent per year
+  const costSavings = state.getDeflectionImpact().costSavings;
 
   return {
     totalContacts,